@@ -0,0 +1,56 @@
+"""Building geohash
+
+Revision ID: 003_building_geohash
+Revises: 002_seed_data
+Create Date: 2025-02-03
+
+Добавляет колонку buildings.geohash с индексом:
+- заполнение geohash для существующих зданий
+- индекс idx_building_geohash для поиска по диапазонам ячеек
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from app.core.geo import geohash_encode
+
+# revision identifiers
+revision: str = '003_building_geohash'
+down_revision: Union[str, None] = '002_seed_data'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('buildings', sa.Column('geohash', sa.String(length=12), nullable=True))
+
+    # Заполняем geohash для существующих зданий
+    buildings = sa.table(
+        'buildings',
+        sa.column('id', sa.Integer()),
+        sa.column('latitude', sa.Float()),
+        sa.column('longitude', sa.Float()),
+        sa.column('geohash', sa.String()),
+    )
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(buildings.c.id, buildings.c.latitude, buildings.c.longitude)
+    ).all()
+    if rows:
+        conn.execute(
+            buildings.update()
+            .where(buildings.c.id == sa.bindparam('building_id'))
+            .values(geohash=sa.bindparam('building_geohash')),
+            [
+                {'building_id': row.id, 'building_geohash': geohash_encode(row.latitude, row.longitude)}
+                for row in rows
+            ],
+        )
+
+    with op.batch_alter_table('buildings') as batch_op:
+        batch_op.alter_column('geohash', existing_type=sa.String(length=12), nullable=False)
+    op.create_index('idx_building_geohash', 'buildings', ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_building_geohash', table_name='buildings')
+    op.drop_column('buildings', 'geohash')
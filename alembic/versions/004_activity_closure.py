@@ -0,0 +1,54 @@
+"""Activity closure table
+
+Revision ID: 004_activity_closure
+Revises: 003_building_geohash
+Create Date: 2025-02-10
+
+Добавляет closure table иерархии деятельностей:
+- activity_closure: все пары (предок, потомок) с глубиной
+- заполнение по существующему дереву рекурсивным CTE
+- индекс organization_activities(activity_id) для поиска по деятельности
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = '004_activity_closure'
+down_revision: Union[str, None] = '003_building_geohash'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activity_closure',
+        sa.Column('ancestor_id', sa.Integer(), nullable=False),
+        sa.Column('descendant_id', sa.Integer(), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['activities.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['activities.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('idx_activity_closure_descendant', 'activity_closure', ['descendant_id'], unique=False)
+    op.create_index(
+        'idx_organization_activities_activity', 'organization_activities', ['activity_id'], unique=False
+    )
+
+    # Заполняем closure table по существующему дереву
+    op.execute("""
+        INSERT INTO activity_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM activities
+            UNION ALL
+            SELECT tree.ancestor_id, activities.id, tree.depth + 1
+            FROM tree JOIN activities ON activities.parent_id = tree.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_organization_activities_activity', table_name='organization_activities')
+    op.drop_index('idx_activity_closure_descendant', table_name='activity_closure')
+    op.drop_table('activity_closure')
@@ -0,0 +1,38 @@
+"""Data version counters
+
+Revision ID: 005_data_versions
+Revises: 004_activity_closure
+Create Date: 2025-02-17
+
+Добавляет таблицу data_versions со счетчиками версий данных.
+Счетчики увеличиваются репозиториями при записи и позволяют
+воркерам определять устаревание кэшей в памяти.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = '005_data_versions'
+down_revision: Union[str, None] = '004_activity_closure'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("""
+        INSERT INTO data_versions (name, version) VALUES
+        ('activities', 1),
+        ('buildings', 1),
+        ('organizations', 1);
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
@@ -0,0 +1,64 @@
+"""Organization name search index
+
+Revision ID: 006_organization_name_search
+Revises: 005_data_versions
+Create Date: 2025-02-24
+
+Добавляет индекс подстрочного поиска по названию организаций:
+- PostgreSQL: расширение pg_trgm и GIN-индекс по lower(name)
+- SQLite: FTS5-таблица organization_name_fts с триграммным токенизатором,
+  триггеры синхронизации и заполнение по существующим организациям
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers
+revision: str = '006_organization_name_search'
+down_revision: Union[str, None] = '005_data_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE organization_name_fts USING fts5(
+                name, content='organizations', content_rowid='id', tokenize='trigram'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER organization_name_fts_insert AFTER INSERT ON organizations BEGIN
+                INSERT INTO organization_name_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER organization_name_fts_delete AFTER DELETE ON organizations BEGIN
+                INSERT INTO organization_name_fts (organization_name_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER organization_name_fts_update AFTER UPDATE OF name ON organizations BEGIN
+                INSERT INTO organization_name_fts (organization_name_fts, rowid, name)
+                VALUES ('delete', old.id, old.name);
+                INSERT INTO organization_name_fts (rowid, name) VALUES (new.id, new.name);
+            END
+        """)
+        # Заполняем индекс по существующим организациям
+        op.execute("INSERT INTO organization_name_fts (organization_name_fts) VALUES ('rebuild')")
+    else:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("""
+            CREATE INDEX idx_organization_name_trgm
+            ON organizations USING gin (lower(name) gin_trgm_ops)
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS organization_name_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS organization_name_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS organization_name_fts_insert")
+        op.execute("DROP TABLE IF EXISTS organization_name_fts")
+    else:
+        op.drop_index('idx_organization_name_trgm', table_name='organizations')
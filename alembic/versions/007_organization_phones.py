@@ -0,0 +1,84 @@
+"""Organization phones lookup table
+
+Revision ID: 007_organization_phones
+Revises: 006_organization_name_search
+Create Date: 2025-03-03
+
+Добавляет таблицу organization_phones с нормализованными телефонами
+организаций (только цифры, с кодом страны) и индексом по номеру
+для поиска организации по телефону.
+"""
+import json
+import re
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = '007_organization_phones'
+down_revision: Union[str, None] = '006_organization_name_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Нормализация телефонов на момент этой ревизии (копия app.core.phones):
+# последующие изменения приложения не должны менять результат миграции
+_NON_DIGITS = re.compile(r'[^0-9]')
+DEFAULT_COUNTRY_CODE = '7'
+TRUNK_PREFIX = '8'
+NATIONAL_NUMBER_LENGTH = 10
+PHONE_COLUMN_LENGTH = 20
+
+
+def normalize_phone(phone: str) -> str:
+    """Только цифры, с кодом страны; пустая строка для строки без цифр."""
+    digits = _NON_DIGITS.sub('', phone)
+    if len(digits) == NATIONAL_NUMBER_LENGTH:
+        return DEFAULT_COUNTRY_CODE + digits
+    if len(digits) == NATIONAL_NUMBER_LENGTH + 1 and digits.startswith(TRUNK_PREFIX):
+        return DEFAULT_COUNTRY_CODE + digits[1:]
+    return digits
+
+
+def decode_phone_numbers(value) -> list[str]:
+    """Телефоны из organizations.phone_numbers: JSON-строка или массив."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
+
+
+def upgrade() -> None:
+    organization_phones = op.create_table(
+        'organization_phones',
+        sa.Column('organization_id', sa.Integer(), nullable=False),
+        sa.Column('phone', sa.String(length=PHONE_COLUMN_LENGTH), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('organization_id', 'phone')
+    )
+    op.create_index('idx_organization_phones_phone', 'organization_phones', ['phone'], unique=False)
+
+    # Заполняем по существующим организациям: phone_numbers - массив
+    # (PostgreSQL, исходная схема) или JSON-строка (SQLite)
+    organizations = sa.table(
+        'organizations',
+        sa.column('id', sa.Integer()),
+        sa.column('phone_numbers'),
+    )
+    conn = op.get_bind()
+    rows = []
+    for org_id, value in conn.execute(sa.select(organizations.c.id, organizations.c.phone_numbers)):
+        phones = {normalize_phone(phone) for phone in decode_phone_numbers(value)}
+        # Номер, не помещающийся в колонку (с добавочным), не индексируется
+        rows.extend(
+            {'organization_id': org_id, 'phone': phone}
+            for phone in sorted(phones - {''})
+            if len(phone) <= PHONE_COLUMN_LENGTH
+        )
+    if rows:
+        op.bulk_insert(organization_phones, rows)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_organization_phones_phone', table_name='organization_phones')
+    op.drop_table('organization_phones')
@@ -0,0 +1,48 @@
+"""Organization phone length limit
+
+Revision ID: 008_organization_phone_length
+Revises: 007_organization_phones
+Create Date: 2025-03-10
+
+Ограничивает нормализованный телефон в organization_phones длиной
+номера E.164 (15 цифр). Более длинные номера (с добавочным и т.п.)
+больше не индексируются, поэтому их строки удаляются.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision: str = '008_organization_phone_length'
+down_revision: Union[str, None] = '007_organization_phones'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Максимум цифр в номере по E.164 (app.core.phones.MAX_PHONE_DIGITS на момент ревизии)
+MAX_PHONE_DIGITS = 15
+
+
+def upgrade() -> None:
+    organization_phones = sa.table('organization_phones', sa.column('phone', sa.String()))
+    op.execute(
+        organization_phones.delete().where(
+            sa.func.length(organization_phones.c.phone) > MAX_PHONE_DIGITS
+        )
+    )
+    with op.batch_alter_table('organization_phones') as batch_op:
+        batch_op.alter_column(
+            'phone',
+            existing_type=sa.String(length=20),
+            type_=sa.String(length=MAX_PHONE_DIGITS),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('organization_phones') as batch_op:
+        batch_op.alter_column(
+            'phone',
+            existing_type=sa.String(length=MAX_PHONE_DIGITS),
+            type_=sa.String(length=20),
+            existing_nullable=False,
+        )
@@ -0,0 +1,35 @@
+"""
+Кэш ответов API.
+"""
+from app.cache.backends import CacheBackend, MemoryCacheBackend
+from app.cache.etag import data_etag, etag_matches, not_modified
+from app.cache.fragments import FragmentLookup, OrganizationFragmentCache, organization_fragments
+from app.cache.response_cache import (
+    BUILDINGS_TAG,
+    ORGANIZATIONS_TAG,
+    ResponseCache,
+    activity_tag,
+    building_tag,
+    organization_tag,
+    response_cache,
+    serialize,
+)
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "data_etag",
+    "etag_matches",
+    "not_modified",
+    "FragmentLookup",
+    "OrganizationFragmentCache",
+    "organization_fragments",
+    "BUILDINGS_TAG",
+    "ORGANIZATIONS_TAG",
+    "ResponseCache",
+    "activity_tag",
+    "building_tag",
+    "organization_tag",
+    "response_cache",
+    "serialize",
+]
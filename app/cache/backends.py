@@ -0,0 +1,119 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable
+
+
+class CacheBackend(ABC):
+    """
+    Хранилище кэша ответов: байты по ключу с тегами для инвалидации.
+
+    Реализация по умолчанию - MemoryCacheBackend в памяти процесса.
+    Общее для воркеров хранилище (например, Redis) подключается подклассом,
+    путь к которому задается в RESPONSE_CACHE_BACKEND ("модуль:Класс").
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Значение по ключу или None, если его нет или оно устарело."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, tags: Iterable[str], ttl: float) -> None:
+        """Сохранить значение на ttl секунд с тегами."""
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Удалить все значения с любым из тегов, вернуть их число."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Удалить все значения."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Счетчики хранилища: entries, size_bytes, evictions."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    LRU-кэш в памяти процесса с TTL и ограничением суммарного размера.
+
+    Размер записи - длина ключа и значения в байтах. При превышении
+    max_bytes вытесняются давно не читанные записи. Для каждого тега
+    хранится множество ключей, поэтому инвалидация не просматривает весь кэш.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # Ключ -> (значение, теги, момент устаревания); порядок - LRU
+        self._entries: OrderedDict[str, tuple[bytes, frozenset[str], float]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._size = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_size(key: str, value: bytes) -> int:
+        return len(key) + len(value)
+
+    def _remove_locked(self, key: str) -> None:
+        """Удалить запись и ее ключ из индекса тегов (под блокировкой)."""
+        value, tags, _ = self._entries.pop(key)
+        self._size -= self._entry_size(key, value)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                self._remove_locked(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: bytes, tags: Iterable[str], ttl: float) -> None:
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = (value, tags, time.monotonic() + ttl)
+            self._size += size
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while self._size > self.max_bytes:
+                self._remove_locked(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove_locked(key)
+                    removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "evictions": self._evictions,
+            }
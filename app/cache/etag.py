@@ -0,0 +1,31 @@
+from fastapi import Request, Response, status
+
+
+def data_etag(versions: dict[str, int]) -> str:
+    """
+    Слабый ETag по версиям данных, например W/"organizations.12".
+    Слабый - потому что тело ответа не сравнивается побайтно, меняется
+    только вместе с версиями счетчиков.
+    """
+    parts = "-".join(f"{name}.{version}" for name, version in sorted(versions.items()))
+    return f'W/"{parts}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Совпадает ли ETag с заголовком If-None-Match (слабое сравнение)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """Ответ 304, если у клиента актуальная версия, иначе None."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
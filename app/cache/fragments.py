@@ -0,0 +1,71 @@
+from typing import Iterable, NamedTuple
+from app.cache.backends import CacheBackend, MemoryCacheBackend
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class FragmentLookup(NamedTuple):
+    """Результат поиска фрагментов: найденные и версия данных для сохранения недостающих."""
+    found: dict[int, bytes]
+    version: int
+
+
+class OrganizationFragmentCache:
+    """
+    Кэш готовых JSON-фрагментов организаций (OrganizationResponse).
+
+    Ключ - ID организации и версия данных организаций (счетчик
+    data_versions, по которому строится ETag). Запись организации
+    увеличивает счетчик в своей транзакции, поэтому после commit фрагменты,
+    собранные по прежним данным, недостижимы во всех процессах, а ответ
+    с новым ETag собирается только из фрагментов не старше этой версии.
+    Недостижимые записи вытесняются по LRU и TTL. Цена - любая запись
+    организации обновляет фрагменты всех организаций.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        """Кэш включен (FRAGMENT_CACHE_ENABLED)."""
+        return self.backend is not None
+
+    @staticmethod
+    def _key(org_id: int, version: int) -> str:
+        return f"{org_id}:{version}"
+
+    def get_many(self, org_ids: Iterable[int], version: int) -> FragmentLookup:
+        """
+        Фрагменты организаций, которые есть в кэше для версии данных version.
+        version нужно прочитать до выборки недостающих организаций.
+        """
+        found = {}
+        for org_id in org_ids:
+            fragment = self.backend.get(self._key(org_id, version))
+            if fragment is not None:
+                found[org_id] = fragment
+        return FragmentLookup(found, version)
+
+    def put(self, lookup: FragmentLookup, org_id: int, fragment: bytes) -> None:
+        """Сохранить фрагмент под версией данных из lookup."""
+        self.backend.set(self._key(org_id, lookup.version), fragment, [], self.ttl)
+
+    def clear(self) -> None:
+        """Удалить все фрагменты."""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> dict:
+        """Состояние хранилища."""
+        return self.backend.stats() if self.backend is not None else {}
+
+
+# Кэш процесса
+organization_fragments = OrganizationFragmentCache(
+    MemoryCacheBackend(settings.FRAGMENT_CACHE_MAX_BYTES)
+    if settings.FRAGMENT_CACHE_ENABLED else None,
+    settings.FRAGMENT_CACHE_TTL,
+)
@@ -0,0 +1,203 @@
+import importlib
+import threading
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterable
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.cache.backends import CacheBackend, MemoryCacheBackend
+from app.cache.etag import not_modified
+from app.core.config import get_settings
+from app.core.serialization import contains_fragments, dumps_with_fragments, fast_json_dumps
+
+settings = get_settings()
+
+# Теги записей кэша. Ответы, состав которых может изменить любая запись
+# организации (общий список, поиск), помечаются ORGANIZATIONS_TAG; ответы
+# по зданию или деятельности - тегом этого здания или деятельности.
+ORGANIZATIONS_TAG = "organizations"
+BUILDINGS_TAG = "buildings"
+
+
+def organization_tag(org_id: int) -> str:
+    return f"organization:{org_id}"
+
+
+def building_tag(building_id: int) -> str:
+    return f"building:{building_id}"
+
+
+def activity_tag(activity_id: int) -> str:
+    return f"activity:{activity_id}"
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    """TypeAdapter схемы ответа (строится один раз на тип)."""
+    return TypeAdapter(response_type)
+
+
+def serialize(response_type: Any, value: Any, fast_json: bool | None = None) -> bytes:
+    """
+    JSON-тело ответа. В режиме FAST_JSON (или fast_json=True) данные,
+    уже собранные по схеме, сериализуются orjson без валидации; остальные
+    (ORM-объекты) приводятся к response_type TypeAdapter'ом. Ответ из
+    готовых фрагментов организаций склеивается без валидации в любом режиме.
+    """
+    if contains_fragments(value):
+        return dumps_with_fragments(value)
+    if settings.FAST_JSON if fast_json is None else fast_json:
+        body = fast_json_dumps(value)
+        if body is not None:
+            return body
+    adapter = _adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+class ResponseCache:
+    """
+    Кэш сериализованных JSON-ответов GET-эндпоинтов.
+
+    Ключ - путь и отсортированные query-параметры запроса. Запись хранится
+    с тегами зданий, деятельностей и организаций, от которых зависит ответ;
+    репозитории после записи в БД инвалидируют затронутые теги. Ответ,
+    вычисленный параллельно с инвалидацией, в кэш не попадает.
+
+    Если передан ETag версий данных, запрос с совпадающим If-None-Match
+    получает 304 без вычисления ответа. ETag хранится вместе с телом записи:
+    версии меняет любая запись организации, а запись удаляется только
+    инвалидацией ее тегов, поэтому попадание отдается с ETag, при котором
+    тело было вычислено, и If-None-Match сравнивается и с ним.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        # Растет при каждой инвалидации
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Кэш включен (RESPONSE_CACHE_ENABLED)."""
+        return self.backend is not None
+
+    @staticmethod
+    def key(request: Request) -> str:
+        """Ключ записи: путь и query-параметры в каноническом порядке."""
+        return f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+
+    @staticmethod
+    def _pack(etag: str | None, body: bytes) -> bytes:
+        """Значение записи: ETag (может быть пустым), перевод строки, тело."""
+        return (etag or "").encode() + b"\n" + body
+
+    @staticmethod
+    def _unpack(value: bytes) -> tuple[str | None, bytes]:
+        """ETag и тело из значения записи."""
+        etag, _, body = value.partition(b"\n")
+        return etag.decode() or None, body
+
+    async def respond(
+        self,
+        request: Request,
+        response_type: Any,
+        compute: Callable[[], Awaitable[Any]],
+        tags: Iterable[str],
+        etag: str | None = None,
+    ) -> Response:
+        """
+        JSON-ответ из кэша или вычисленный compute(), приведенный
+        к response_type и сохраненный в кэш с тегами tags.
+        С etag - 304 для клиента с актуальной версией и заголовок ETag.
+        """
+        if etag is not None:
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+        headers = {"ETag": etag} if etag is not None else None
+        if self.backend is None:
+            body = serialize(response_type, await compute())
+            return Response(body, media_type="application/json", headers=headers)
+
+        key = self.key(request)
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+            generation = self._generation
+        if value is not None:
+            cached_etag, body = self._unpack(value)
+            if cached_etag is not None:
+                response = not_modified(request, cached_etag)
+                if response is not None:
+                    return response
+                headers = {"ETag": cached_etag}
+            return Response(body, media_type="application/json", headers=headers)
+
+        body = serialize(response_type, await compute())
+        with self._lock:
+            unchanged = generation == self._generation
+        if unchanged:
+            self.backend.set(key, self._pack(etag, body), tags, self.ttl)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Удалить записи с любым из тегов."""
+        if self.backend is None:
+            return
+        with self._lock:
+            self._generation += 1
+        removed = self.backend.invalidate(tags)
+        with self._lock:
+            self._invalidations += removed
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+        if self.backend is None:
+            return
+        with self._lock:
+            self._generation += 1
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        """Счетчики попаданий и промахов и состояние хранилища."""
+        with self._lock:
+            stats = {
+                "enabled": self.enabled,
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+            }
+        requests = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / requests if requests else 0.0
+        if self.backend is not None:
+            stats.update(self.backend.stats())
+        return stats
+
+
+def create_backend() -> CacheBackend | None:
+    """
+    Хранилище по настройкам: None, если кэш выключен; класс из
+    RESPONSE_CACHE_BACKEND ("модуль:Класс"), если задан; иначе память процесса.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    if settings.RESPONSE_CACHE_BACKEND:
+        module_name, _, class_name = settings.RESPONSE_CACHE_BACKEND.partition(":")
+        backend = getattr(importlib.import_module(module_name), class_name)()
+        if not isinstance(backend, CacheBackend):
+            raise TypeError(
+                f"RESPONSE_CACHE_BACKEND {settings.RESPONSE_CACHE_BACKEND} is not a CacheBackend"
+            )
+        return backend
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_BYTES)
+
+
+# Кэш процесса
+response_cache = ResponseCache(create_backend(), settings.RESPONSE_CACHE_TTL)
@@ -1,5 +1,7 @@
 from app.core.config import get_settings, Settings
-from app.core.database import Base, get_db, engine, SessionLocal
+from app.core.database import (
+    Base, get_db, get_async_db, engine, SessionLocal, AsyncSessionLocal
+)
 from app.core.security import verify_api_key
 
 __all__ = [
@@ -7,7 +9,9 @@ __all__ = [
     "Settings",
     "Base",
     "get_db",
+    "get_async_db",
     "engine",
     "SessionLocal",
+    "AsyncSessionLocal",
     "verify_api_key",
 ]
@@ -1,25 +1,92 @@
+from typing import Literal
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
 
 class Settings(BaseSettings):
     """Настройки приложения."""
-    
+
     # Основные настройки
     APP_NAME: str = "Organization Directory API"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
-    
+
     # База данных (SQLite по умолчанию для локальной разработки)
     DATABASE_URL: str = "sqlite:///./directory.db"
-    
+    # Асинхронный доступ к БД (aiosqlite/asyncpg): запросы роутов не занимают
+    # потоки пула, пока ждут БД. Код сервисов между запросами к БД выполняется
+    # в потоке цикла событий, вычисления без БД - в пуле (@cpu_bound)
+    ASYNC_DB: bool = False
+
     # Безопасность
     API_KEY: str = "secret-api-key-change-in-production"
     API_KEY_HEADER: str = "X-API-KEY"
-    
+
     # Логирование
     LOG_LEVEL: str = "INFO"
-    
+
+    # Пагинация списков
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 1000
+
+    # Загрузка деятельностей организаций: joined, selectin, subquery, batched
+    ORGANIZATION_LOAD_STRATEGY: Literal["joined", "selectin", "subquery", "batched"] = "batched"
+    # Чтение организаций: orm (ORM-объекты) или core (Core select -> словари)
+    ORGANIZATION_READ_PATH: Literal["orm", "core"] = "core"
+    # Сериализация ответов через orjson без повторной валидации данных,
+    # уже собранных по схеме ответа (extra fast; без orjson - обычный путь)
+    FAST_JSON: bool = False
+
+    # Геоиндекс зданий в памяти процесса
+    SPATIAL_INDEX_ENABLED: bool = True
+    SPATIAL_INDEX_CELL_SIZE: float = 0.01  # Размер ячейки сетки в градусах
+    # Если индекс нашел больше зданий, поиск выполняется одним SQL-запросом
+    SPATIAL_INDEX_MAX_IDS: int = 1000
+    # Начальный радиус поиска ближайших организаций
+    NEAREST_INITIAL_RADIUS_KM: float = 1.0
+
+    # Кэш дерева деятельностей в памяти процесса
+    ACTIVITY_CACHE_ENABLED: bool = True
+    # Как часто (сек) сверять версию кэша с БД
+    ACTIVITY_CACHE_CHECK_INTERVAL: float = 5.0
+
+    # Индекс названий организаций для автодополнения
+    NAME_INDEX_ENABLED: bool = True
+    SUGGEST_MAX_LIMIT: int = 50
+
+    # Bitmap-индекс организаций по деятельностям и зданиям в памяти процесса.
+    # Выключен по умолчанию: держит в памяти все связи организаций, а записи
+    # других воркеров видит только после перестроения
+    BITMAP_INDEX_ENABLED: bool = False
+
+    # Оценки числа организаций для комбинированного поиска
+    CARDINALITY_CELL_SIZE: float = 0.05  # Размер ячейки геосетки в градусах
+    CARDINALITY_STATS_TTL: float = 300.0  # Период пересчета оценок, сек
+    # Если самое селективное условие дает не больше стольких организаций,
+    # их ID выбираются отдельным запросом и остальные условия проверяются по ним
+    QUERY_MATERIALIZE_MAX_IDS: int = 1000
+
+    # Кэш ответов GET-эндпоинтов. Выключен по умолчанию: записи других
+    # воркеров инвалидируют только их собственный кэш в памяти
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_TTL: float = 60.0  # Время жизни записи, сек
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Лимит памяти кэша
+    # Общее хранилище вместо памяти процесса: "модуль:Класс" подкласса CacheBackend
+    RESPONSE_CACHE_BACKEND: str = ""
+
+    # Кэш готовых JSON-фрагментов организаций: списки читают из БД только ID
+    # и склеивают фрагменты. Изменения других воркеров видны через TTL
+    FRAGMENT_CACHE_ENABLED: bool = False
+    FRAGMENT_CACHE_TTL: float = 300.0  # Время жизни фрагмента, сек
+    FRAGMENT_CACHE_MAX_BYTES: int = 128 * 1024 * 1024  # Лимит памяти кэша
+
+    # Организаций в одной пачке потоковой выгрузки
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Массовый импорт организаций
+    BULK_IMPORT_CHUNK_SIZE: int = 1000  # Строк в одной транзакции
+    BULK_IMPORT_MAX_ERRORS: int = 1000  # Сколько ошибок строк вернуть в ответе
+
     class Config:
         env_file = ".env"
         case_sensitive = True
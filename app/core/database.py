@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+import math
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import get_settings
+from app.core.geo import haversine_distance
 
 settings = get_settings()
 
@@ -18,8 +21,53 @@ else:
         max_overflow=20,
     )
 
+
+def register_sqlite_functions(dbapi_connection, connection_record=None) -> None:
+    """
+    Регистрация пользовательских SQL-функций в соединении SQLite.
+    haversine(lat1, lon1, lat2, lon2) - расстояние между точками в км;
+    floor(x) - в сборках SQLite без математических функций ее нет.
+    """
+    dbapi_connection.create_function("haversine", 4, haversine_distance, deterministic=True)
+    dbapi_connection.create_function("floor", 1, math.floor, deterministic=True)
+
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", register_sqlite_functions)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронные драйверы для ASYNC_DB
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_database_url(database_url: str):
+    """URL той же БД с асинхронным драйвером (aiosqlite или asyncpg)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"ASYNC_DB is not supported for {backend}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+# Асинхронный движок создается, только если включен ASYNC_DB:
+# драйверы aiosqlite/asyncpg - опциональные зависимости
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    if engine.dialect.name == "sqlite":
+        async_engine = create_async_engine(async_database_url(settings.DATABASE_URL))
+        event.listen(async_engine.sync_engine, "connect", register_sqlite_functions)
+    else:
+        async_engine = create_async_engine(
+            async_database_url(settings.DATABASE_URL),
+            pool_pre_ping=True,
+            pool_size=10,
+            max_overflow=20,
+        )
+    # Без expire_on_commit: после commit атрибуты не перечитываются неявно
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -33,3 +81,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Асинхронная сессия БД для dependency injection (при ASYNC_DB)."""
+    async with AsyncSessionLocal() as db:
+        yield db
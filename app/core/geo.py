@@ -0,0 +1,230 @@
+"""
+Геометрические утилиты для геопоиска.
+"""
+import math
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy - опциональная зависимость
+    np = None
+
+# Радиус Земли в км
+EARTH_RADIUS_KM = 6371.0
+
+# 1 градус широты ≈ 111 км
+KM_PER_DEGREE = 111.0
+
+# Максимальное расстояние между точками на поверхности Земли (половина окружности)
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+# Алфавит geohash (base32 без a, i, l, o) - отсортирован по возрастанию
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Точность хранимого geohash: 9 символов ≈ 5 м
+GEOHASH_PRECISION = 9
+# Максимум ячеек при покрытии области диапазонами geohash
+GEOHASH_MAX_CELLS = 16
+
+# Ниже этого числа точек накладные расходы NumPy не окупаются
+VECTORIZE_MIN_POINTS = 64
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Расчет расстояния между двумя точками по формуле Хаверсина.
+    Возвращает расстояние в километрах.
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = (
+        math.sin(delta_lat / 2) ** 2 +
+        math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    )
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def bounding_box(
+    lat: float, lon: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    """
+    Границы (min_lat, max_lat, min_lon, max_lon) круга без учета
+    антимеридиана: долготы могут выходить за [-180, 180].
+    1 градус широты ≈ 111 км; полуширина по долготе - касательная к кругу
+    на широте центра. Если круг накрывает полюс, диапазон долгот -
+    вся окружность.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    if lat + lat_delta >= 90.0 or lat - lat_delta <= -90.0:
+        lon_delta = 180.0
+    else:
+        ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))
+        lon_delta = math.degrees(math.asin(min(ratio, 1.0)))
+    return lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta
+
+
+def bounding_boxes(
+    lat: float, lon: float, radius_km: float
+) -> list[tuple[float, float, float, float]]:
+    """
+    Прямоугольники с долготами в [-180, 180], покрывающие круг.
+    Круг через антимеридиан дает два прямоугольника по разные его стороны.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    if max_lon - min_lon >= 360.0:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+    if min_lon < -180.0:
+        return [(min_lat, max_lat, min_lon + 360.0, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360.0)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+
+def haversine_distances(lat: float, lon: float, lats, lons):
+    """
+    Векторизованная формула Хаверсина (требует NumPy).
+    Принимает массивы координат, возвращает массив расстояний в км.
+    """
+    lats_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    lons_rad = np.radians(np.asarray(lons, dtype=np.float64))
+    lat_rad = math.radians(lat)
+
+    a = (
+        np.sin((lats_rad - lat_rad) / 2) ** 2 +
+        math.cos(lat_rad) * np.cos(lats_rad) * np.sin((lons_rad - math.radians(lon)) / 2) ** 2
+    )
+    np.clip(a, 0.0, 1.0, out=a)
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def indices_within_radius(
+    lat: float,
+    lon: float,
+    radius_km: float,
+    lats: Sequence[float],
+    lons: Sequence[float],
+) -> list[int]:
+    """
+    Индексы точек, лежащих не дальше radius_km от (lat, lon).
+    При наличии NumPy фильтрация выполняется одним векторным проходом,
+    иначе - поэлементно через haversine_distance.
+    """
+    if np is None or len(lats) < VECTORIZE_MIN_POINTS:
+        return [
+            i for i, (p_lat, p_lon) in enumerate(zip(lats, lons))
+            if haversine_distance(lat, lon, p_lat, p_lon) <= radius_km
+        ]
+    distances = haversine_distances(lat, lon, lats, lons)
+    return np.flatnonzero(distances <= radius_km).tolist()
+
+
+def _geohash_bits(precision: int) -> tuple[int, int]:
+    """Число бит долготы и широты в geohash заданной точности."""
+    bits = precision * 5
+    return (bits + 1) // 2, bits // 2
+
+
+def _geohash_cell(value: float, low: float, span: float, bits: int) -> int:
+    """Номер ячейки по одной оси (с ограничением на краях диапазона)."""
+    cells = 1 << bits
+    index = int((value - low) / span * cells)
+    return min(max(index, 0), cells - 1)
+
+
+def _geohash_code(lon_index: int, lat_index: int, precision: int) -> int:
+    """Перемежение бит долготы и широты (долгота - старший бит)."""
+    lon_bits, lat_bits = _geohash_bits(precision)
+    code = 0
+    for position in range(precision * 5):
+        if position % 2 == 0:
+            lon_bits -= 1
+            bit = (lon_index >> lon_bits) & 1
+        else:
+            lat_bits -= 1
+            bit = (lat_index >> lat_bits) & 1
+        code = (code << 1) | bit
+    return code
+
+
+def _geohash_string(code: int, precision: int) -> str:
+    chars = []
+    for _ in range(precision):
+        chars.append(GEOHASH_ALPHABET[code & 31])
+        code >>= 5
+    return "".join(reversed(chars))
+
+
+def geohash_encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Geohash точки заданной точности."""
+    lon_bits, lat_bits = _geohash_bits(precision)
+    code = _geohash_code(
+        _geohash_cell(lon, -180.0, 360.0, lon_bits),
+        _geohash_cell(lat, -90.0, 180.0, lat_bits),
+        precision,
+    )
+    return _geohash_string(code, precision)
+
+
+def geohash_ranges(
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+    max_cells: int = GEOHASH_MAX_CELLS,
+) -> list[tuple[str, str | None]]:
+    """
+    Покрытие прямоугольника диапазонами префиксов geohash.
+    
+    Выбирается максимальная точность, при которой область покрывают
+    не более max_cells ячеек; соседние по порядку ячейки склеиваются.
+    Возвращает пары (start, stop): start <= geohash < stop (stop=None - без
+    верхней границы). Пустой список - область слишком велика для покрытия.
+    """
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    min_lon, max_lon = max(min_lon, -180.0), min(max_lon, 180.0)
+    
+    best = None
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        lon_bits, lat_bits = _geohash_bits(precision)
+        cols = (
+            _geohash_cell(min_lon, -180.0, 360.0, lon_bits),
+            _geohash_cell(max_lon, -180.0, 360.0, lon_bits),
+        )
+        rows = (
+            _geohash_cell(min_lat, -90.0, 180.0, lat_bits),
+            _geohash_cell(max_lat, -90.0, 180.0, lat_bits),
+        )
+        if (cols[1] - cols[0] + 1) * (rows[1] - rows[0] + 1) > max_cells:
+            break
+        best = precision, cols, rows
+    if best is None:
+        return []
+    
+    precision, cols, rows = best
+    codes = sorted(
+        _geohash_code(col, row, precision)
+        for col in range(cols[0], cols[1] + 1)
+        for row in range(rows[0], rows[1] + 1)
+    )
+    
+    # Склеиваем подряд идущие коды в диапазоны
+    runs = []
+    for code in codes:
+        if runs and runs[-1][1] == code - 1:
+            runs[-1][1] = code
+        else:
+            runs.append([code, code])
+    
+    last_code = (1 << (precision * 5)) - 1
+    return [
+        (
+            _geohash_string(start, precision),
+            _geohash_string(end + 1, precision) if end < last_code else None,
+        )
+        for start, end in runs
+    ]
@@ -0,0 +1,44 @@
+"""
+Нормализация телефонных номеров для поиска.
+"""
+import json
+import re
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+# Код страны, который подставляется к номерам без него (10 цифр)
+DEFAULT_COUNTRY_CODE = "7"
+# Внутрироссийский префикс, заменяемый на код страны: 8-495-... -> 7495...
+TRUNK_PREFIX = "8"
+NATIONAL_NUMBER_LENGTH = 10
+# Максимум цифр в номере по E.164 (с кодом страны)
+MAX_PHONE_DIGITS = 15
+
+
+def normalize_phone(phone: str) -> str:
+    """
+    Привести номер к виду "только цифры, с кодом страны":
+    "+7 (495) 111-11-11", "8-495-111-1111" и "495 111 1111" дают "74951111111".
+    Для строки без цифр или длиннее MAX_PHONE_DIGITS цифр возвращает
+    пустую строку: такой номер не индексируется и не ищется.
+    """
+    digits = _NON_DIGITS.sub("", phone)
+    if len(digits) > MAX_PHONE_DIGITS:
+        return ""
+    if len(digits) == NATIONAL_NUMBER_LENGTH:
+        return DEFAULT_COUNTRY_CODE + digits
+    if len(digits) == NATIONAL_NUMBER_LENGTH + 1 and digits.startswith(TRUNK_PREFIX):
+        return DEFAULT_COUNTRY_CODE + digits[1:]
+    return digits
+
+
+def decode_phone_numbers(value) -> list[str]:
+    """
+    Телефоны из колонки organizations.phone_numbers:
+    JSON-строка (SQLite) или массив (PostgreSQL).
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        return json.loads(value)
+    return list(value)
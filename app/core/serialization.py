@@ -0,0 +1,76 @@
+import json
+from typing import Any, NamedTuple
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson - опциональная зависимость
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Сериализация pydantic-моделей, вложенных в словари и списки."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError
+
+
+def fast_json_dumps(value: Any) -> bytes | None:
+    """
+    JSON через orjson без валидации по схеме ответа. Подходит только для
+    данных, уже собранных по схеме (словари Core-пути чтения, модели).
+    None, если orjson не установлен или в данных есть объекты, которые
+    orjson не сериализует (ORM-модели) - их нужно привести к схеме.
+    """
+    if orjson is None:
+        return None
+    try:
+        return orjson.dumps(value, default=_default)
+    except TypeError:
+        return None
+
+
+class JSONFragment(NamedTuple):
+    """Готовый JSON объекта и его ID: вставляется в ответ без сериализации."""
+    id: int
+    json: bytes
+
+
+def _dumps(value: Any) -> bytes:
+    """Компактный JSON значения без фрагментов."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def with_fields(fragment: JSONFragment, **fields: Any) -> JSONFragment:
+    """Фрагмент JSON-объекта с дополнительными полями в конце."""
+    extra = b"".join(b"," + _dumps(name) + b":" + _dumps(value) for name, value in fields.items())
+    return fragment._replace(json=fragment.json[:-1] + extra + b"}")
+
+
+def contains_fragments(value: Any) -> bool:
+    """
+    Есть ли в ответе JSON-фрагменты. Списки в ответах однородны,
+    поэтому проверяется только первый элемент.
+    """
+    if isinstance(value, JSONFragment):
+        return True
+    if isinstance(value, dict):
+        return any(contains_fragments(item) for item in value.values())
+    if isinstance(value, list):
+        return bool(value) and contains_fragments(value[0])
+    return False
+
+
+def dumps_with_fragments(value: Any) -> bytes:
+    """JSON из словарей, списков и готовых фрагментов: фрагменты склеиваются как есть."""
+    if isinstance(value, JSONFragment):
+        return value.json
+    if isinstance(value, dict):
+        return b"{" + b",".join(
+            _dumps(str(key)) + b":" + dumps_with_fragments(item) for key, item in value.items()
+        ) + b"}"
+    if isinstance(value, list):
+        return b"[" + b",".join(map(dumps_with_fragments, value)) + b"]"
+    return _dumps(value)
@@ -0,0 +1,29 @@
+"""
+In-process индексы для ускорения чтения.
+"""
+from app.indexes.spatial import BuildingSpatialIndex, building_index
+from app.indexes.activity_tree import (
+    ActivityNode, ActivityTreeCache, activity_tree, build_activity_tree
+)
+from app.indexes.bitmap import OrganizationBitmapIndex, organization_bitmaps
+from app.indexes.cardinality import CardinalityStats, cardinality_stats
+from app.indexes.name_index import (
+    OrganizationNameIndex, normalize_name, organization_name_index, suggest_by_scan
+)
+
+__all__ = [
+    "BuildingSpatialIndex",
+    "building_index",
+    "ActivityNode",
+    "ActivityTreeCache",
+    "activity_tree",
+    "build_activity_tree",
+    "OrganizationBitmapIndex",
+    "organization_bitmaps",
+    "CardinalityStats",
+    "cardinality_stats",
+    "OrganizationNameIndex",
+    "normalize_name",
+    "organization_name_index",
+    "suggest_by_scan",
+]
@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable
+from app.core.config import get_settings
+
+
+@dataclass(frozen=True)
+class ActivityNode:
+    """Снимок деятельности в кэше дерева."""
+    id: int
+    name: str
+    parent_id: int | None
+    level: int
+
+
+def build_activity_tree(activities: Iterable) -> list[dict]:
+    """
+    Собрать вложенное дерево из плоского списка деятельностей за O(n).
+    Узлы - словари в формате ActivityWithChildren, отсортированные по ID.
+    """
+    nodes = {
+        activity.id: {
+            "id": activity.id,
+            "name": activity.name,
+            "parent_id": activity.parent_id,
+            "level": activity.level,
+            "children": [],
+        }
+        for activity in activities
+    }
+    roots = []
+    for activity_id in sorted(nodes):
+        node = nodes[activity_id]
+        parent = nodes.get(node["parent_id"]) if node["parent_id"] is not None else None
+        if parent is not None:
+            parent["children"].append(node)
+        else:
+            roots.append(node)
+    return roots
+
+
+class ActivityTreeCache:
+    """
+    Кэш дерева деятельностей в памяти процесса.
+
+    Хранит узлы, списки дочерних и заранее посчитанные множества ID поддеревьев.
+    Кэш помечен версией данных из таблицы data_versions: воркер периодически
+    сверяет ее с БД и перечитывает дерево, если другой процесс его изменил.
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self._nodes: dict[int, ActivityNode] = {}
+        self._children: dict[int | None, list[int]] = {}
+        self._subtrees: dict[int, frozenset[int]] = {}
+        self._version: int | None = None
+        self._nested_json: bytes | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        """Кэш загружен."""
+        return self._version is not None
+
+    @property
+    def version(self) -> int | None:
+        """Версия данных, по которой построен кэш."""
+        return self._version
+
+    def load(self, activities: Iterable, version: int) -> None:
+        """Полностью перестроить кэш по списку деятельностей."""
+        nodes = {
+            activity.id: ActivityNode(
+                id=activity.id,
+                name=activity.name,
+                parent_id=activity.parent_id,
+                level=activity.level,
+            )
+            for activity in activities
+        }
+        children: dict[int | None, list[int]] = {}
+        for node in sorted(nodes.values(), key=lambda n: n.id):
+            children.setdefault(node.parent_id, []).append(node.id)
+
+        subtrees: dict[int, frozenset[int]] = {}
+
+        def collect(node_id: int) -> frozenset[int]:
+            ids = {node_id}
+            for child_id in children.get(node_id, ()):
+                ids |= collect(child_id)
+            subtrees[node_id] = frozenset(ids)
+            return subtrees[node_id]
+
+        for root_id in children.get(None, ()):
+            collect(root_id)
+
+        with self._lock:
+            self._nodes = nodes
+            self._children = children
+            self._subtrees = subtrees
+            self._version = version
+            self._nested_json = None
+            self._checked_at = time.monotonic()
+
+    def add(self, activity, version: int) -> None:
+        """
+        Добавить новую деятельность на месте.
+        Если кэш отстал больше чем на одну версию, он сбрасывается
+        и будет перечитан при следующем обращении.
+        """
+        with self._lock:
+            if self._version is None or version != self._version + 1:
+                self._version = None
+                return
+            node = ActivityNode(
+                id=activity.id,
+                name=activity.name,
+                parent_id=activity.parent_id,
+                level=activity.level,
+            )
+            self._nodes[node.id] = node
+            self._children.setdefault(node.parent_id, []).append(node.id)
+            self._subtrees[node.id] = frozenset((node.id,))
+            parent_id = node.parent_id
+            while parent_id is not None:
+                self._subtrees[parent_id] = self._subtrees.get(
+                    parent_id, frozenset((parent_id,))
+                ) | {node.id}
+                parent = self._nodes.get(parent_id)
+                parent_id = parent.parent_id if parent else None
+            self._version = version
+            self._nested_json = None
+
+    def invalidate(self) -> None:
+        """Сбросить кэш."""
+        with self._lock:
+            self._version = None
+
+    def needs_check(self) -> bool:
+        """Пора сверить версию кэша с БД."""
+        return time.monotonic() - self._checked_at >= self.check_interval
+
+    def mark_checked(self) -> None:
+        self._checked_at = time.monotonic()
+
+    def get(self, activity_id: int) -> ActivityNode | None:
+        return self._nodes.get(activity_id)
+
+    def get_all(self) -> list[ActivityNode]:
+        nodes = self._nodes
+        return [nodes[activity_id] for activity_id in sorted(nodes)]
+
+    def get_roots(self) -> list[ActivityNode]:
+        return [self._nodes[activity_id] for activity_id in self._children.get(None, ())]
+
+    def get_children(self, activity_id: int) -> list[ActivityNode]:
+        return [self._nodes[child_id] for child_id in self._children.get(activity_id, ())]
+
+    def nested_json(self) -> bytes:
+        """
+        Полное дерево в виде готового JSON (список ActivityWithChildren).
+        Сериализуется один раз на версию кэша.
+        """
+        with self._lock:
+            if self._nested_json is None:
+                self._nested_json = json.dumps(
+                    build_activity_tree(self._nodes.values()), ensure_ascii=False
+                ).encode("utf-8")
+            return self._nested_json
+
+    def subtree_ids(self, activity_id: int) -> list[int]:
+        """ID деятельностей поддерева (включая корневую)."""
+        return sorted(self._subtrees.get(activity_id, ()))
+
+
+# Кэш процесса; загружается при старте приложения
+activity_tree = ActivityTreeCache(
+    check_interval=get_settings().ACTIVITY_CACHE_CHECK_INTERVAL
+)
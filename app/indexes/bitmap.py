@@ -0,0 +1,159 @@
+import heapq
+import threading
+from typing import Iterable
+
+try:
+    from pyroaring import BitMap
+except ImportError:  # pyroaring - опциональная зависимость
+    BitMap = None
+
+
+def _empty():
+    """Пустое множество ID: сжатый bitmap или обычное множество."""
+    return BitMap() if BitMap is not None else set()
+
+
+def union(bitmaps: Iterable):
+    """Объединение множеств ID."""
+    bitmaps = list(bitmaps)
+    if not bitmaps:
+        return _empty()
+    if BitMap is not None:
+        return BitMap.union(*bitmaps)
+    return set().union(*bitmaps)
+
+
+def intersection(bitmaps: Iterable):
+    """Пересечение множеств ID, начиная с самого маленького."""
+    bitmaps = sorted(bitmaps, key=len)
+    if not bitmaps:
+        return _empty()
+    result = bitmaps[0]
+    for bitmap in bitmaps[1:]:
+        if not result:
+            break
+        result = result & bitmap
+    return result
+
+
+def page(bitmap, limit: int, after_id: int | None = None) -> list[int]:
+    """Не более limit ID из множества, больших after_id, по возрастанию."""
+    if BitMap is not None:
+        start = bitmap.rank(after_id) if after_id is not None else 0
+        return list(bitmap[start:start + limit])
+    candidates = bitmap if after_id is None else (i for i in bitmap if i > after_id)
+    return heapq.nsmallest(limit, candidates)
+
+
+class OrganizationBitmapIndex:
+    """
+    In-process индекс принадлежности организаций деятельностям и зданиям.
+
+    Для каждой деятельности и каждого здания хранится множество ID
+    организаций: сжатый bitmap (pyroaring), если библиотека установлена,
+    иначе обычное множество. Фильтры отвечают на вопрос "какие организации
+    подходят" объединениями и пересечениями в памяти, а в БД уходит только
+    выборка итоговой страницы. Индекс локален для процесса: изменения,
+    сделанные другими воркерами, появятся в нем только после перестроения.
+    """
+
+    def __init__(self):
+        self._by_activity: dict[int, object] = {}
+        self._by_building: dict[int, object] = {}
+        # Текущие связи организаций - для обновления и удаления
+        self._org_building: dict[int, int] = {}
+        self._org_activities: dict[int, list[int]] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        """Индекс построен и может обслуживать запросы."""
+        return self._ready
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._org_building)
+
+    def build(
+        self,
+        organizations: Iterable[tuple[int, int]],
+        activity_links: Iterable[tuple[int, int]],
+    ) -> None:
+        """
+        Полностью перестроить индекс по парам (ID организации, ID здания)
+        и (ID организации, ID деятельности).
+        """
+        by_building: dict[int, list[int]] = {}
+        org_building = {}
+        for org_id, building_id in organizations:
+            org_building[org_id] = building_id
+            by_building.setdefault(building_id, []).append(org_id)
+        by_activity: dict[int, list[int]] = {}
+        org_activities: dict[int, list[int]] = {}
+        for org_id, activity_id in activity_links:
+            by_activity.setdefault(activity_id, []).append(org_id)
+            org_activities.setdefault(org_id, []).append(activity_id)
+        factory = BitMap if BitMap is not None else set
+        with self._lock:
+            self._by_building = {key: factory(ids) for key, ids in by_building.items()}
+            self._by_activity = {key: factory(ids) for key, ids in by_activity.items()}
+            self._org_building = org_building
+            self._org_activities = org_activities
+            self._ready = True
+
+    def _remove_locked(self, org_id: int) -> None:
+        """Удалить организацию из всех множеств (вызывается под блокировкой)."""
+        building_id = self._org_building.pop(org_id, None)
+        if building_id is not None:
+            self._by_building[building_id].discard(org_id)
+        for activity_id in self._org_activities.pop(org_id, ()):
+            self._by_activity[activity_id].discard(org_id)
+
+    def add(self, org_id: int, building_id: int, activity_ids: Iterable[int]) -> None:
+        """Добавить организацию или обновить ее здание и деятельности."""
+        activity_ids = list(activity_ids)
+        with self._lock:
+            self._remove_locked(org_id)
+            self._org_building[org_id] = building_id
+            self._by_building.setdefault(building_id, _empty()).add(org_id)
+            if activity_ids:
+                self._org_activities[org_id] = activity_ids
+            for activity_id in activity_ids:
+                self._by_activity.setdefault(activity_id, _empty()).add(org_id)
+
+    def remove(self, org_id: int) -> None:
+        """Удалить организацию из индекса."""
+        with self._lock:
+            self._remove_locked(org_id)
+
+    def clear(self) -> None:
+        """Очистить индекс и пометить его как непостроенный."""
+        with self._lock:
+            self._by_activity = {}
+            self._by_building = {}
+            self._org_building = {}
+            self._org_activities = {}
+            self._ready = False
+
+    def by_activities(self, activity_ids: Iterable[int]):
+        """Организации, у которых есть хотя бы одна из деятельностей."""
+        with self._lock:
+            return union(
+                self._by_activity[activity_id]
+                for activity_id in activity_ids
+                if activity_id in self._by_activity
+            )
+
+    def by_buildings(self, building_ids: Iterable[int]):
+        """Организации, расположенные в любом из зданий."""
+        with self._lock:
+            return union(
+                self._by_building[building_id]
+                for building_id in building_ids
+                if building_id in self._by_building
+            )
+
+
+# Индекс процесса; заполняется при старте приложения, если включен
+organization_bitmaps = OrganizationBitmapIndex()
@@ -0,0 +1,120 @@
+import math
+import threading
+import time
+from typing import Callable
+from app.core.config import get_settings
+from app.core.geo import bounding_boxes
+
+# Ячейка сетки: (строка, столбец) = floor(широта / размер), floor(долгота / размер)
+Cell = tuple[int, int]
+
+
+class CardinalityStats:
+    """
+    Кэш оценок числа организаций для планирования комбинированного поиска.
+
+    Хранит число организаций по каждой деятельности (напрямую и с учетом
+    поддерева) и по ячейкам равномерной геосетки. Счетчики пересчитываются
+    целиком раз в ttl секунд, поэтому это оценки, а не точные значения:
+    по ним выбирается порядок условий, но не делается вывод о пустом результате.
+
+    Записи организаций (create, update, delete, импорт) счетчики не сбрасывают:
+    единственный источник обновления - истечение ttl. Так импорт не вызывает
+    полный пересчет на каждую пачку, а все пути записи ведут себя одинаково.
+    Пересчет после истечения ttl выполняет один запрос (см. refresh).
+    """
+
+    def __init__(self, cell_size: float = 0.05, ttl: float = 300.0):
+        self.cell_size = cell_size
+        self.ttl = ttl
+        self._activity_counts: dict[int, int] = {}
+        self._subtree_counts: dict[int, int] = {}
+        self._cell_counts: dict[Cell, int] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+        # Занят на время пересчета
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        """Счетчики не загружены или устарели."""
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def refresh(self, loader: Callable[[], None]) -> None:
+        """
+        Пересчитать устаревшие счетчики вызовом loader (он вызывает load).
+        Пересчет выполняет только один вызывающий: остальные, пока он идет,
+        не ждут и пользуются прежними оценками. Ожидание заблокировало бы
+        цикл событий в режиме ASYNC_DB, где запросы выполняются в одном потоке.
+        """
+        if not self.is_stale or not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            if self.is_stale:
+                loader()
+        finally:
+            self._refresh_lock.release()
+
+    def load(
+        self,
+        activity_counts: dict[int, int],
+        subtree_counts: dict[int, int],
+        cell_counts: dict[Cell, int],
+    ) -> None:
+        """Заменить все счетчики."""
+        with self._lock:
+            self._activity_counts = activity_counts
+            self._subtree_counts = subtree_counts
+            self._cell_counts = cell_counts
+            self._loaded_at = time.monotonic()
+
+    def activity_estimate(self, activity_id: int, include_children: bool) -> int:
+        """Оценка числа организаций с деятельностью (или ее поддеревом)."""
+        counts = self._subtree_counts if include_children else self._activity_counts
+        return counts.get(activity_id, 0)
+
+    def area_estimate(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> float:
+        """
+        Оценка числа организаций в прямоугольнике: сумма по пересекающимся
+        ячейкам с весом доли площади ячейки, попавшей в прямоугольник.
+        """
+        size = self.cell_size
+        min_row, max_row = math.floor(min_lat / size), math.floor(max_lat / size)
+        min_col, max_col = math.floor(min_lon / size), math.floor(max_lon / size)
+        with self._lock:
+            cells = self._cell_counts
+        area_cells = (max_row - min_row + 1) * (max_col - min_col + 1)
+        if area_cells <= len(cells):
+            candidates = (
+                ((row, col), cells.get((row, col), 0))
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+            )
+        else:
+            candidates = (
+                ((row, col), count) for (row, col), count in cells.items()
+                if min_row <= row <= max_row and min_col <= col <= max_col
+            )
+        estimate = 0.0
+        for (row, col), count in candidates:
+            if not count:
+                continue
+            lat_overlap = min(max_lat, (row + 1) * size) - max(min_lat, row * size)
+            lon_overlap = min(max_lon, (col + 1) * size) - max(min_lon, col * size)
+            estimate += count * max(lat_overlap, 0.0) * max(lon_overlap, 0.0) / (size * size)
+        return estimate
+
+    def radius_estimate(self, lat: float, lon: float, radius_km: float) -> float:
+        """Оценка числа организаций в круге: вписанная доля описанного квадрата."""
+        return sum(
+            self.area_estimate(*box) for box in bounding_boxes(lat, lon, radius_km)
+        ) * math.pi / 4
+
+
+# Кэш процесса; загружается при первом комбинированном поиске
+cardinality_stats = CardinalityStats(
+    cell_size=get_settings().CARDINALITY_CELL_SIZE,
+    ttl=get_settings().CARDINALITY_STATS_TTL,
+)
@@ -0,0 +1,182 @@
+import bisect
+import heapq
+import re
+import threading
+from typing import Iterable
+
+# Все, что не буква и не цифра, разделяет слова названия
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Ключ индекса: нормализованный хвост названия, разделитель и id организации.
+# Строки сортируются в разы быстрее кортежей, а "\0" меньше любого символа
+# нормализованного названия, поэтому порядок ключей совпадает с порядком хвостов.
+_ID_SEPARATOR = "\0"
+
+
+def normalize_name(name: str) -> str:
+    """
+    Нормализация названия для префиксного поиска: регистр, ё -> е,
+    знаки препинания и кавычки заменяются одним пробелом.
+    """
+    return _SEPARATORS.sub(" ", name.casefold().replace("ё", "е")).strip()
+
+
+def _match_key(org_id: int, name: str, normalized: str) -> str | None:
+    """
+    Наименьший ключ индекса организации, начинающийся с normalized,
+    или None, если ни одно слово названия не подходит.
+    """
+    return min(
+        (
+            key for key in OrganizationNameIndex._keys_of(org_id, name)
+            if key.startswith(normalized)
+        ),
+        default=None,
+    )
+
+
+def suggest_by_scan(
+    organizations: Iterable[tuple[int, str]], prefix: str, limit: int
+) -> list[tuple[int, str]]:
+    """
+    Тот же подбор, что OrganizationNameIndex.suggest, одним проходом по парам
+    (id, название) без построения индекса: совпадения и порядок одинаковые.
+    Память - O(limit), время - O(число организаций).
+    """
+    normalized = normalize_name(prefix)
+    if not normalized:
+        return []
+    matches = (
+        (key, org_id, name)
+        for org_id, name in organizations
+        if (key := _match_key(org_id, name, normalized)) is not None
+    )
+    return [(org_id, name) for _, org_id, name in heapq.nsmallest(limit, matches)]
+
+
+class OrganizationNameIndex:
+    """
+    In-process индекс названий организаций для автодополнения.
+
+    Отсортированный массив ключей: для каждого слова названия хранится
+    нормализованный хвост названия, начиная с этого слова. Поэтому
+    'ООО "Мясной Дом"' находится и по "ооо м", и по "мяс", и по "дом".
+    Поиск префикса - двоичный поиск и просмотр следующих ключей.
+    Индекс локален для процесса: организации, созданные другими воркерами,
+    появятся в нем только после перестроения.
+    """
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._names: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        """Индекс построен и может обслуживать запросы."""
+        return self._ready
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._names)
+
+    @staticmethod
+    def _keys_of(org_id: int, name: str) -> list[str]:
+        """Ключи индекса для названия: по одному на каждое слово."""
+        words = normalize_name(name).split(" ")
+        suffix = f"{_ID_SEPARATOR}{org_id}"
+        return [
+            " ".join(words[i:]) + suffix
+            for i in range(len(words))
+            if words[i]
+        ]
+
+    def build(self, organizations: Iterable[tuple[int, str]]) -> None:
+        """Полностью перестроить индекс по парам (id, название)."""
+        names = {}
+        keys = []
+        for org_id, name in organizations:
+            names[org_id] = name
+            keys.extend(self._keys_of(org_id, name))
+        keys.sort()
+        with self._lock:
+            self._keys = keys
+            self._names = names
+            self._ready = True
+
+    def _remove_locked(self, org_id: int) -> None:
+        """Удалить ключи организации (вызывается под блокировкой)."""
+        name = self._names.pop(org_id, None)
+        if name is None:
+            return
+        for key in self._keys_of(org_id, name):
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+    def add(self, org_id: int, name: str) -> None:
+        """Добавить организацию или обновить ее название."""
+        with self._lock:
+            self._remove_locked(org_id)
+            self._names[org_id] = name
+            for key in self._keys_of(org_id, name):
+                bisect.insort(self._keys, key)
+
+    def add_many(self, organizations: Iterable[tuple[int, str]]) -> None:
+        """
+        Добавить пачку организаций: новые ключи сортируются отдельно и
+        сливаются с массивом одной сортировкой, а не вставкой по одному.
+        """
+        organizations = list(organizations)
+        keys = []
+        for org_id, name in organizations:
+            keys.extend(self._keys_of(org_id, name))
+        keys.sort()
+        with self._lock:
+            for org_id, name in organizations:
+                self._remove_locked(org_id)
+                self._names[org_id] = name
+            # Timsort сливает два отсортированных участка за линейное время
+            self._keys.extend(keys)
+            self._keys.sort()
+
+    def remove(self, org_id: int) -> None:
+        """Удалить организацию из индекса."""
+        with self._lock:
+            self._remove_locked(org_id)
+
+    def clear(self) -> None:
+        """Очистить индекс и пометить его как непостроенный."""
+        with self._lock:
+            self._keys = []
+            self._names = {}
+            self._ready = False
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[int, str]]:
+        """
+        До limit пар (id, название), у которых одно из слов названия
+        (вместе с продолжением) начинается с prefix. Порядок - по алфавиту
+        совпавшего хвоста названия.
+        """
+        normalized = normalize_name(prefix)
+        if not normalized:
+            return []
+        result = []
+        seen = set()
+        with self._lock:
+            position = bisect.bisect_left(self._keys, normalized)
+            while position < len(self._keys) and len(result) < limit:
+                key = self._keys[position]
+                if not key.startswith(normalized):
+                    break
+                org_id = int(key.rpartition(_ID_SEPARATOR)[2])
+                if org_id not in seen:
+                    seen.add(org_id)
+                    result.append((org_id, self._names[org_id]))
+                position += 1
+        return result
+
+
+# Индекс процесса; заполняется при старте приложения
+organization_name_index = OrganizationNameIndex()
@@ -0,0 +1,117 @@
+import math
+import threading
+from typing import Iterable
+from app.core.config import get_settings
+from app.core.geo import bounding_boxes, indices_within_radius
+
+# Точка индекса: (id здания, широта, долгота)
+IndexedPoint = tuple[int, float, float]
+
+
+class BuildingSpatialIndex:
+    """
+    In-process индекс зданий на равномерной сетке.
+
+    Координаты раскладываются по ячейкам размером cell_size градусов,
+    поэтому запрос по области просматривает только пересекающиеся ячейки.
+    Индекс локален для процесса: здания, созданные другими воркерами,
+    появятся в нем только после перестроения.
+    """
+
+    def __init__(self, cell_size: float = 0.01):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], list[IndexedPoint]] = {}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @property
+    def is_ready(self) -> bool:
+        """Индекс построен и может обслуживать запросы."""
+        return self._ready
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(points) for points in self._cells.values())
+
+    def _cell_of(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def build(self, points: Iterable[IndexedPoint]) -> None:
+        """Полностью перестроить индекс по набору точек."""
+        cells: dict[tuple[int, int], list[IndexedPoint]] = {}
+        for building_id, lat, lon in points:
+            cells.setdefault(self._cell_of(lat, lon), []).append((building_id, lat, lon))
+        with self._lock:
+            self._cells = cells
+            self._ready = True
+
+    def add(self, building_id: int, lat: float, lon: float) -> None:
+        """Добавить здание в индекс."""
+        with self._lock:
+            self._cells.setdefault(self._cell_of(lat, lon), []).append(
+                (building_id, lat, lon)
+            )
+
+    def clear(self) -> None:
+        """Очистить индекс и пометить его как непостроенный."""
+        with self._lock:
+            self._cells = {}
+            self._ready = False
+
+    def _candidates(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> list[IndexedPoint]:
+        """Точки, попадающие в прямоугольник."""
+        min_row, min_col = self._cell_of(min_lat, min_lon)
+        max_row, max_col = self._cell_of(max_lat, max_lon)
+        result = []
+        with self._lock:
+            # Для больших областей дешевле перебрать непустые ячейки,
+            # чем все ячейки прямоугольника
+            area_cells = (max_row - min_row + 1) * (max_col - min_col + 1)
+            if area_cells <= len(self._cells):
+                buckets = (
+                    self._cells.get((row, col), ())
+                    for row in range(min_row, max_row + 1)
+                    for col in range(min_col, max_col + 1)
+                )
+            else:
+                buckets = (
+                    points for (row, col), points in self._cells.items()
+                    if min_row <= row <= max_row and min_col <= col <= max_col
+                )
+            for points in buckets:
+                for point in points:
+                    _, lat, lon = point
+                    if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                        result.append(point)
+        return result
+
+    def query_box(
+        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+    ) -> list[int]:
+        """ID зданий в прямоугольной области."""
+        return [
+            building_id
+            for building_id, _, _ in self._candidates(min_lat, max_lat, min_lon, max_lon)
+        ]
+
+    def query_radius(self, lat: float, lon: float, radius_km: float) -> list[int]:
+        """ID зданий в радиусе radius_km от точки."""
+        candidates = [
+            point
+            for box in bounding_boxes(lat, lon, radius_km)
+            for point in self._candidates(*box)
+        ]
+        matched = indices_within_radius(
+            lat,
+            lon,
+            radius_km,
+            [point[1] for point in candidates],
+            [point[2] for point in candidates],
+        )
+        return [candidates[i][0] for i in matched]
+
+
+# Индекс процесса; заполняется при старте приложения
+building_index = BuildingSpatialIndex(cell_size=get_settings().SPATIAL_INDEX_CELL_SIZE)
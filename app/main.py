@@ -2,10 +2,14 @@ import logging
 import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from app.core.config import get_settings
-from app.routers import buildings_router, activities_router, organizations_router
+from app.core.database import SessionLocal
+from app.core.serialization import orjson
+from app.repositories import ActivityRepository, BuildingRepository, OrganizationRepository
+from app.routers import buildings_router, activities_router, organizations_router, cache_router
 
 settings = get_settings()
 logging.basicConfig(
@@ -19,6 +23,38 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Lifecycle менеджер приложения."""
     logger.info("Starting Organization Directory API...")
+    if settings.SPATIAL_INDEX_ENABLED:
+        try:
+            with SessionLocal() as db:
+                BuildingRepository(db).rebuild_spatial_index()
+            logger.info("Building spatial index is ready")
+        except Exception as exc:
+            # Без индекса геопоиск работает напрямую через БД
+            logger.warning(f"Failed to build spatial index: {exc}")
+    if settings.ACTIVITY_CACHE_ENABLED:
+        try:
+            with SessionLocal() as db:
+                ActivityRepository(db).load_tree_cache()
+            logger.info("Activity tree cache is ready")
+        except Exception as exc:
+            # Кэш будет загружен при первом обращении
+            logger.warning(f"Failed to load activity tree cache: {exc}")
+    if settings.BITMAP_INDEX_ENABLED:
+        try:
+            with SessionLocal() as db:
+                OrganizationRepository(db).rebuild_bitmap_index()
+            logger.info("Organization bitmap index is ready")
+        except Exception as exc:
+            # Без индекса фильтры выполняются в БД
+            logger.warning(f"Failed to build organization bitmap index: {exc}")
+    if settings.NAME_INDEX_ENABLED:
+        try:
+            with SessionLocal() as db:
+                OrganizationRepository(db).rebuild_name_index()
+            logger.info("Organization name index is ready")
+        except Exception as exc:
+            # Без индекса автодополнение работает через БД
+            logger.warning(f"Failed to build organization name index: {exc}")
     yield
     logger.info("Shutting down Organization Directory API...")
 
@@ -46,8 +82,14 @@ REST API сервис-справочник для управления:
         {"name": "Buildings", "description": "Операции со зданиями"},
         {"name": "Activities", "description": "Операции с видами деятельности"},
         {"name": "Organizations", "description": "Операции с организациями"},
+        {"name": "Cache", "description": "Состояние кэша ответов"},
     ],
     lifespan=lifespan,
+    # GET-эндпоинты сериализуют ответ сами (см. app.cache.serialize),
+    # остальные с FAST_JSON отдаются через orjson
+    default_response_class=(
+        ORJSONResponse if settings.FAST_JSON and orjson is not None else JSONResponse
+    ),
 )
 
 
@@ -77,7 +119,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     logger.warning(f"Validation error: {exc.errors()}")
     return JSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={"detail": exc.errors()},
+        content={"detail": jsonable_encoder(exc.errors())},
     )
 
 
@@ -94,6 +136,7 @@ async def global_exception_handler(request: Request, exc: Exception):
 app.include_router(buildings_router, prefix="/api/v1")
 app.include_router(activities_router, prefix="/api/v1")
 app.include_router(organizations_router, prefix="/api/v1")
+app.include_router(cache_router, prefix="/api/v1")
 
 
 @app.get(
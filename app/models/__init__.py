@@ -1,3 +1,21 @@
-from app.models.models import Building, Activity, Organization, organization_activities
+from app.models.models import (
+    Building,
+    Activity,
+    Organization,
+    DataVersion,
+    organization_activities,
+    activity_closure,
+    organization_phones,
+    organization_name_fts,
+)
 
-__all__ = ["Building", "Activity", "Organization", "organization_activities"]
+__all__ = [
+    "Building",
+    "Activity",
+    "Organization",
+    "DataVersion",
+    "organization_activities",
+    "activity_closure",
+    "organization_phones",
+    "organization_name_fts",
+]
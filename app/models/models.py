@@ -1,6 +1,7 @@
 import json
 from sqlalchemy import (
-    Column, Integer, String, Float, ForeignKey, Table, CheckConstraint, Index, Text
+    DDL, Column, Integer, String, Float, ForeignKey, Table, CheckConstraint, Index, Text,
+    column, event, table,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -23,6 +24,46 @@ organization_activities = Table(
         ForeignKey("activities.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # Для поиска организаций по деятельности (PK начинается с organization_id)
+    Index("idx_organization_activities_activity", "activity_id"),
+)
+
+
+# Closure table иерархии деятельностей: все пары (предок, потомок),
+# включая саму деятельность с depth=0
+activity_closure = Table(
+    "activity_closure",
+    Base.metadata,
+    Column(
+        "ancestor_id",
+        Integer,
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "descendant_id",
+        Integer,
+        ForeignKey("activities.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("depth", Integer, nullable=False),
+    Index("idx_activity_closure_descendant", "descendant_id"),
+)
+
+
+# Нормализованные телефоны организаций (см. app.core.phones) для
+# поиска организации по номеру точным поиском по индексу
+organization_phones = Table(
+    "organization_phones",
+    Base.metadata,
+    Column(
+        "organization_id",
+        Integer,
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("phone", String(15), primary_key=True),
+    Index("idx_organization_phones_phone", "phone"),
 )
 
 
@@ -37,6 +78,8 @@ class Building(Base):
     address = Column(String(500), nullable=False, index=True)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
+    # Geohash координат: позволяет сузить индексом обе оси сразу
+    geohash = Column(String(12), nullable=False)
 
     # Связь с организациями (одно здание - много организаций)
     organizations = relationship("Organization", back_populates="building")
@@ -44,6 +87,7 @@ class Building(Base):
     # Индекс для геопоиска
     __table_args__ = (
         Index("idx_building_coordinates", "latitude", "longitude"),
+        Index("idx_building_geohash", "geohash"),
     )
 
 
@@ -106,17 +150,95 @@ class Organization(Base):
         """Установить список телефонов."""
         self._phone_numbers = json.dumps(value)
 
+    @phone_numbers.expression
+    def phone_numbers(cls):
+        """Колонка телефонов на уровне класса (в запросах - JSON-строка)."""
+        return cls._phone_numbers
+
     # Связь с зданием
     building = relationship("Building", back_populates="organizations")
 
-    # Связь с деятельностями (M2M)
+    # Связь с деятельностями (M2M); порядок - как у Core-пути чтения
     activities = relationship(
         "Activity",
         secondary=organization_activities,
         back_populates="organizations",
+        order_by="Activity.id",
     )
 
     __table_args__ = (
         Index("idx_organization_building", "building_id"),
         Index("idx_organization_name_lower", "name"),  # Для поиска по названию
     )
+
+
+# Индекс подстрочного поиска по названию организаций.
+# SQLite: FTS5-таблица с триграммным токенизатором поверх organizations
+# (external content), синхронизируется триггерами.
+# PostgreSQL: GIN-индекс pg_trgm по lower(name), его использует LIKE '%...%'.
+organization_name_fts = table(
+    "organization_name_fts",
+    column("rowid", Integer),
+    column("name", Text),
+    column("rank", Float),
+)
+
+ORGANIZATION_NAME_SEARCH_DDL = {
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE organization_name_fts USING fts5(
+            name, content='organizations', content_rowid='id', tokenize='trigram'
+        )
+        """,
+        """
+        CREATE TRIGGER organization_name_fts_insert AFTER INSERT ON organizations BEGIN
+            INSERT INTO organization_name_fts (rowid, name) VALUES (new.id, new.name);
+        END
+        """,
+        """
+        CREATE TRIGGER organization_name_fts_delete AFTER DELETE ON organizations BEGIN
+            INSERT INTO organization_name_fts (organization_name_fts, rowid, name)
+            VALUES ('delete', old.id, old.name);
+        END
+        """,
+        """
+        CREATE TRIGGER organization_name_fts_update AFTER UPDATE OF name ON organizations BEGIN
+            INSERT INTO organization_name_fts (organization_name_fts, rowid, name)
+            VALUES ('delete', old.id, old.name);
+            INSERT INTO organization_name_fts (rowid, name) VALUES (new.id, new.name);
+        END
+        """,
+    ],
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        """
+        CREATE INDEX idx_organization_name_trgm
+        ON organizations USING gin (lower(name) gin_trgm_ops)
+        """,
+    ],
+}
+
+for _dialect, _statements in ORGANIZATION_NAME_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Organization.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+event.listen(
+    Organization.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS organization_name_fts").execute_if(dialect="sqlite"),
+)
+
+
+class DataVersion(Base):
+    """
+    Счетчик версии данных таблицы.
+    Увеличивается при каждой записи, позволяет процессам понять,
+    что их кэш устарел.
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
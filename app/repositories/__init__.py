@@ -1,5 +1,15 @@
 from app.repositories.building_repository import BuildingRepository
 from app.repositories.activity_repository import ActivityRepository
 from app.repositories.organization_repository import OrganizationRepository
+from app.repositories.organization_read_repository import OrganizationReadRepository
+from app.repositories.organization_fragment_repository import OrganizationFragmentRepository
+from app.repositories.version_repository import VersionRepository
 
-__all__ = ["BuildingRepository", "ActivityRepository", "OrganizationRepository"]
+__all__ = [
+    "BuildingRepository",
+    "ActivityRepository",
+    "OrganizationRepository",
+    "OrganizationReadRepository",
+    "OrganizationFragmentRepository",
+    "VersionRepository",
+]
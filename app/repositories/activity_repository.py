@@ -1,5 +1,8 @@
-from sqlalchemy.orm import Session
-from app.models import Activity
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+from app.indexes import activity_tree
+from app.models import Activity, activity_closure
+from app.repositories.version_repository import ACTIVITIES, VersionRepository
 from app.schemas import ActivityCreate
 
 
@@ -38,26 +41,68 @@ class ActivityRepository:
             level=level,
         )
         self.db.add(activity)
+        self.db.flush()
+        self._add_to_closure(activity)
+        version = VersionRepository(self.db).bump(ACTIVITIES)
         self.db.commit()
         self.db.refresh(activity)
+        activity_tree.add(activity, version)
         return activity
 
+    def load_tree_cache(self) -> None:
+        """Загрузить кэш дерева деятельностей из БД."""
+        # Версию читаем до данных, чтобы кэш не оказался новее своей метки
+        version = VersionRepository(self.db).get(ACTIVITIES)
+        activity_tree.load(self.get_all(), version)
+
     def get_subtree_ids(self, activity_id: int) -> list[int]:
         """
         Получить все ID деятельностей в поддереве (включая корневую).
         Используется для поиска организаций по деятельности с учетом дочерних.
+        Поддерево читается из closure table одним запросом.
         """
-        result = [activity_id]
-        
-        # Рекурсивно собираем все дочерние деятельности
-        children = self.db.query(Activity).filter(
-            Activity.parent_id == activity_id
-        ).all()
-        
-        for child in children:
-            result.extend(self.get_subtree_ids(child.id))
-        
-        return result
+        return list(self.db.scalars(
+            select(activity_closure.c.descendant_id).where(
+                activity_closure.c.ancestor_id == activity_id
+            )
+        ))
+
+    def _add_to_closure(self, activity: Activity) -> None:
+        """Добавить в closure table связи новой деятельности с предками."""
+        rows = [{"ancestor_id": activity.id, "descendant_id": activity.id, "depth": 0}]
+        if activity.parent_id:
+            ancestors = self.db.execute(
+                select(activity_closure.c.ancestor_id, activity_closure.c.depth).where(
+                    activity_closure.c.descendant_id == activity.parent_id
+                )
+            ).all()
+            rows.extend(
+                {"ancestor_id": ancestor_id, "descendant_id": activity.id, "depth": depth + 1}
+                for ancestor_id, depth in ancestors
+            )
+        self.db.execute(insert(activity_closure), rows)
+
+    def rebuild_closure(self) -> None:
+        """Полностью пересчитать closure table по parent_id."""
+        tree = select(
+            Activity.id.label("ancestor_id"),
+            Activity.id.label("descendant_id"),
+            literal(0).label("depth"),
+        ).cte("tree", recursive=True)
+        child = aliased(Activity)
+        tree = tree.union_all(
+            select(tree.c.ancestor_id, child.id, tree.c.depth + 1).join(
+                child, child.parent_id == tree.c.descendant_id
+            )
+        )
+        self.db.execute(delete(activity_closure))
+        self.db.execute(
+            insert(activity_closure).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(tree.c.ancestor_id, tree.c.descendant_id, tree.c.depth),
+            )
+        )
+        self.db.commit()
 
     def get_by_ids(self, activity_ids: list[int]) -> list[Activity]:
         """Получить деятельности по списку ID."""
@@ -66,3 +111,11 @@ class ActivityRepository:
         return self.db.query(Activity).filter(
             Activity.id.in_(activity_ids)
         ).all()
+
+    def get_existing_ids(self, activity_ids: set[int]) -> set[int]:
+        """Какие из переданных ID деятельностей существуют (один запрос)."""
+        if not activity_ids:
+            return set()
+        return set(self.db.scalars(
+            select(Activity.id).where(Activity.id.in_(activity_ids))
+        ))
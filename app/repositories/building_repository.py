@@ -1,6 +1,17 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, or_, select
+from app.core.geo import (
+    EARTH_RADIUS_KM,
+    bounding_boxes,
+    geohash_encode,
+    geohash_ranges,
+    haversine_distance,
+    indices_within_radius,
+)
+from app.cache import BUILDINGS_TAG, response_cache
+from app.indexes import building_index
 from app.models import Building
+from app.repositories.version_repository import BUILDINGS, VersionRepository
 from app.schemas import BuildingCreate
 
 
@@ -18,77 +29,110 @@ class BuildingRepository:
         """Получить здание по ID."""
         return self.db.query(Building).filter(Building.id == building_id).first()
 
+    def get_existing_ids(self, building_ids: set[int]) -> set[int]:
+        """Какие из переданных ID зданий существуют (один запрос)."""
+        if not building_ids:
+            return set()
+        return set(self.db.scalars(select(Building.id).where(Building.id.in_(building_ids))))
+
     def create(self, building_data: BuildingCreate) -> Building:
         """Создать новое здание."""
         building = Building(**building_data.model_dump())
+        building.geohash = geohash_encode(building.latitude, building.longitude)
         self.db.add(building)
+        VersionRepository(self.db).bump(BUILDINGS)
         self.db.commit()
         self.db.refresh(building)
+        if building_index.is_ready:
+            building_index.add(building.id, building.latitude, building.longitude)
+        response_cache.invalidate([BUILDINGS_TAG])
         return building
 
-    def get_in_radius(
-        self, lat: float, lon: float, radius_km: float
-    ) -> list[Building]:
+    def rebuild_spatial_index(self) -> None:
+        """Перестроить геоиндекс зданий по данным БД."""
+        building_index.build(self.db.query(Building.id, Building.latitude, Building.longitude))
+
+    def get_in_radius(self, lat: float, lon: float, radius_km: float) -> list[Building]:
         """
         Получить здания в заданном радиусе от точки.
         Используем упрощенную формулу Хаверсина для небольших расстояний.
         1 градус широты ≈ 111 км, 1 градус долготы ≈ 111 * cos(lat) км
         """
-        # Приблизительный расчет границ для предварительной фильтрации
-        import math
-        lat_delta = radius_km / 111.0
-        lon_delta = radius_km / (111.0 * math.cos(math.radians(lat)))
-        
-        buildings = self.db.query(Building).filter(
-            and_(
-                Building.latitude >= lat - lat_delta,
-                Building.latitude <= lat + lat_delta,
-                Building.longitude >= lon - lon_delta,
-                Building.longitude <= lon + lon_delta,
-            )
-        ).all()
-        
+        # Предварительная фильтрация по описанным прямоугольникам
+        buildings = self.db.query(Building).filter(self.radius_condition(lat, lon, radius_km)).all()
+
         # Точная фильтрация по расстоянию
-        result = []
-        for building in buildings:
-            distance = self._haversine_distance(
-                lat, lon, building.latitude, building.longitude
-            )
-            if distance <= radius_km:
-                result.append(building)
-        return result
+        matched = indices_within_radius(
+            lat,
+            lon,
+            radius_km,
+            [building.latitude for building in buildings],
+            [building.longitude for building in buildings],
+        )
+        return [buildings[i] for i in matched]
 
     def get_in_bounding_box(
         self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
     ) -> list[Building]:
         """Получить здания в прямоугольной области."""
-        return self.db.query(Building).filter(
-            and_(
-                Building.latitude >= min_lat,
-                Building.latitude <= max_lat,
-                Building.longitude >= min_lon,
-                Building.longitude <= max_lon,
-            )
-        ).all()
+        return (
+            self.db.query(Building)
+            .filter(self.area_condition(min_lat, max_lat, min_lon, max_lon))
+            .all()
+        )
 
     @staticmethod
-    def _haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    def area_condition(min_lat: float, max_lat: float, min_lon: float, max_lon: float):
         """
-        Расчет расстояния между двумя точками по формуле Хаверсина.
-        Возвращает расстояние в километрах.
+        SQL-условие попадания здания в прямоугольную область.
+        Область покрывается несколькими диапазонами geohash, чтобы индекс
+        сужал выборку сразу по широте и долготе; точная проверка координат
+        отсекает края ячеек.
         """
-        import math
-        R = 6371  # Радиус Земли в км
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-        
-        a = (
-            math.sin(delta_lat / 2) ** 2 +
-            math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+        condition = and_(
+            Building.latitude >= min_lat,
+            Building.latitude <= max_lat,
+            Building.longitude >= min_lon,
+            Building.longitude <= max_lon,
         )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        
-        return R * c
+        ranges = geohash_ranges(min_lat, max_lat, min_lon, max_lon)
+        if not ranges:
+            return condition
+
+        cells = []
+        for start, stop in ranges:
+            if stop is None:
+                cells.append(Building.geohash >= start)
+            else:
+                cells.append(and_(Building.geohash >= start, Building.geohash < stop))
+        return and_(or_(*cells), condition)
+
+    @classmethod
+    def radius_condition(cls, lat: float, lon: float, radius_km: float):
+        """
+        SQL-условие попадания здания в прямоугольники, описанные вокруг круга
+        (два прямоугольника, если круг пересекает антимеридиан).
+        """
+        return or_(*(cls.area_condition(*box) for box in bounding_boxes(lat, lon, radius_km)))
+
+    @staticmethod
+    def distance_expression(dialect_name: str, lat: float, lon: float):
+        """
+        SQL-выражение расстояния (км) от точки до здания.
+        В SQLite используется зарегистрированная функция haversine,
+        в остальных СУБД - формула Хаверсина из встроенных функций.
+        """
+        if dialect_name == "sqlite":
+            return func.haversine(lat, lon, Building.latitude, Building.longitude)
+
+        lat_rad = func.radians(Building.latitude)
+        a = func.power(func.sin((lat_rad - func.radians(lat)) / 2.0), 2) + func.cos(
+            func.radians(lat)
+        ) * func.cos(lat_rad) * func.power(
+            func.sin((func.radians(Building.longitude) - func.radians(lon)) / 2.0), 2
+        )
+        # least() защищает asin от погрешности округления за пределами [0, 1]
+        return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
+
+    # Расчет расстояния по формуле Хаверсина (км)
+    _haversine_distance = staticmethod(haversine_distance)
@@ -0,0 +1,97 @@
+from operator import attrgetter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.cache import organization_fragments, serialize
+from app.core.serialization import JSONFragment
+from app.models import Building, Organization
+from app.repositories.organization_queries import OrganizationQueries, nearest_conditions
+from app.repositories.organization_read_repository import OrganizationReadRepository
+from app.repositories.version_repository import ORGANIZATIONS, VersionRepository
+from app.schemas import OrganizationResponse
+
+organizations = Organization.__table__
+buildings = Building.__table__
+
+
+class OrganizationFragmentRepository(OrganizationQueries):
+    """
+    Read-only выборки организаций готовыми JSON-фрагментами.
+
+    Из БД выбираются только ID организаций; для каждой берется фрагмент
+    OrganizationResponse из кэша процесса, а недостающие собираются
+    Core-запросом одной пачкой и сохраняются. Одна и та же организация
+    не сериализуется заново для каждого списка, в который попадает.
+    """
+
+    _item_id = staticmethod(attrgetter("id"))
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.rows = OrganizationReadRepository(db)
+
+    def get_page(
+        self, condition=None, limit: int | None = None, after_id: int | None = None
+    ) -> list[JSONFragment]:
+        """
+        Keyset-пагинация по ID: организации, удовлетворяющие condition,
+        с ID больше after_id, отсортированные по ID, не более limit штук.
+        """
+        statement = select(organizations.c.id)
+        if condition is not None:
+            statement = statement.where(condition)
+        if after_id is not None:
+            statement = statement.where(organizations.c.id > after_id)
+        statement = statement.order_by(organizations.c.id)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return self._fragments(self.db.execute(statement).scalars().all())
+
+    def get_nearest(
+        self,
+        lat: float,
+        lon: float,
+        limit: int,
+        radius_km: float,
+        activity_ids: list[int] | None = None,
+        after: tuple[float, int] | None = None,
+        building_ids: list[int] | None = None,
+    ) -> list[tuple[JSONFragment, float]]:
+        """
+        Получить до limit ближайших организаций в пределах radius_km.
+        Возвращает пары (фрагмент, расстояние в км), отсортированные по
+        расстоянию и ID; after - курсор (расстояние, ID) предыдущей страницы.
+        building_ids - здания в радиусе из геоиндекса (см. nearest_conditions).
+        """
+        distance, conditions = nearest_conditions(
+            self._dialect_name(), lat, lon, radius_km, activity_ids, after, building_ids
+        )
+        rows = self.db.execute(
+            select(organizations.c.id, distance.label("distance_km"))
+            .join_from(organizations, buildings, organizations.c.building_id == buildings.c.id)
+            .where(*conditions)
+            .order_by(distance, organizations.c.id)
+            .limit(limit)
+        ).all()
+        fragments = {
+            fragment.id: fragment for fragment in self._fragments([row.id for row in rows])
+        }
+        return [
+            (fragments[row.id], row.distance_km) for row in rows if row.id in fragments
+        ]
+
+    def _fragments(self, org_ids: list[int]) -> list[JSONFragment]:
+        """Фрагменты организаций в порядке org_ids; недостающие собираются из БД."""
+        if not org_ids:
+            return []
+        # Версия читается до выборки организаций: фрагмент не бывает старше ключа
+        version = VersionRepository(self.db).get(ORGANIZATIONS)
+        lookup = organization_fragments.get_many(org_ids, version)
+        found = dict(lookup.found)
+        missing = [org_id for org_id in org_ids if org_id not in found]
+        for organization in self.rows.get_by_ids(missing):
+            fragment = serialize(OrganizationResponse, organization)
+            organization_fragments.put(lookup, organization["id"], fragment)
+            found[organization["id"]] = fragment
+        return [
+            JSONFragment(org_id, found[org_id]) for org_id in org_ids if org_id in found
+        ]
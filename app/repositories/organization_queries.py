@@ -0,0 +1,386 @@
+"""
+Условия отбора организаций и общие методы выборок.
+Условия строятся на колонках таблиц и подходят как для ORM-запросов,
+так и для Core select().
+"""
+from abc import ABC, abstractmethod
+from sqlalchemy import and_, func, or_, select
+from app.core.geo import MAX_DISTANCE_KM
+from app.core.phones import normalize_phone
+from app.models import (
+    Organization,
+    Building,
+    organization_activities,
+    organization_phones,
+    activity_closure,
+    organization_name_fts,
+)
+from app.repositories.building_repository import BuildingRepository
+
+
+def by_building(building_id: int):
+    """Организации конкретного здания."""
+    return Organization.building_id == building_id
+
+
+def by_building_ids(building_ids: list[int]):
+    """Организации зданий из списка."""
+    return Organization.building_id.in_(building_ids)
+
+
+def by_phone(phone: str):
+    """Организации, у которых есть телефон (в нормализованном виде)."""
+    return Organization.id.in_(
+        select(organization_phones.c.organization_id).where(
+            organization_phones.c.phone == phone
+        )
+    )
+
+
+def by_activity_ids(activity_ids: list[int]):
+    """Организации, у которых есть хотя бы одна деятельность из списка."""
+    return Organization.id.in_(
+        select(organization_activities.c.organization_id).where(
+            organization_activities.c.activity_id.in_(activity_ids)
+        )
+    )
+
+
+def by_activity_subtree(activity_id: int):
+    """Организации с деятельностью из поддерева (через closure table)."""
+    return Organization.id.in_(
+        select(organization_activities.c.organization_id).join(
+            activity_closure,
+            activity_closure.c.descendant_id == organization_activities.c.activity_id,
+        ).where(activity_closure.c.ancestor_id == activity_id)
+    )
+
+
+# Минимальная длина строки, для которой работает триграммный индекс
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _like_escape(value: str) -> str:
+    """Экранирование спецсимволов LIKE (escape-символ - обратная косая черта)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_pattern(name: str) -> str:
+    """Шаблон LIKE для подстроки."""
+    return f"%{_like_escape(name)}%"
+
+
+def _fts_phrase(name: str) -> str:
+    """Строка как одна фраза FTS5: триграммы должны идти подряд."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _uses_fts(dialect_name: str, name: str) -> bool:
+    """Подходит ли запрос для FTS5-индекса SQLite."""
+    return dialect_name == "sqlite" and len(name) >= TRIGRAM_MIN_LENGTH
+
+
+def name_contains(dialect_name: str, name: str):
+    """
+    Частичное совпадение названия без учета регистра.
+    В SQLite строки от 3 символов ищутся по FTS5-индексу, в PostgreSQL
+    LIKE по lower(name) использует GIN-индекс pg_trgm.
+    """
+    if _uses_fts(dialect_name, name):
+        return Organization.id.in_(
+            select(organization_name_fts.c.rowid).where(
+                organization_name_fts.c.name.match(_fts_phrase(name))
+            )
+        )
+    return func.lower(Organization.name).like(
+        func.lower(_like_pattern(name)), escape="\\"
+    )
+
+
+def ranked_name_matches(dialect_name: str, name: str, limit: int):
+    """
+    Запрос ID организаций, подходящих по названию, в порядке убывания
+    релевантности: bm25 в SQLite, similarity() в PostgreSQL. Для коротких
+    строк в SQLite выше названия, в которых подстрока занимает большую долю.
+    """
+    if _uses_fts(dialect_name, name):
+        return select(organization_name_fts.c.rowid).where(
+            organization_name_fts.c.name.match(_fts_phrase(name))
+        ).order_by(
+            organization_name_fts.c.rank, organization_name_fts.c.rowid
+        ).limit(limit)
+    if dialect_name == "postgresql":
+        relevance = func.similarity(func.lower(Organization.name), func.lower(name)).desc()
+    else:
+        relevance = func.length(Organization.name)
+    return select(Organization.id).where(
+        name_contains(dialect_name, name)
+    ).order_by(relevance, Organization.id).limit(limit)
+
+
+def in_area(min_lat: float, max_lat: float, min_lon: float, max_lon: float):
+    """Организации, здания которых лежат в прямоугольной области."""
+    return Organization.building_id.in_(
+        select(Building.id).where(
+            BuildingRepository.area_condition(min_lat, max_lat, min_lon, max_lon)
+        )
+    )
+
+
+def in_radius(dialect_name: str, lat: float, lon: float, radius_km: float):
+    """Организации, здания которых лежат в радиусе от точки."""
+    distance = BuildingRepository.distance_expression(dialect_name, lat, lon)
+    return Organization.building_id.in_(
+        select(Building.id).where(
+            BuildingRepository.radius_condition(lat, lon, radius_km),
+            distance <= radius_km,
+        )
+    )
+
+
+def building_matches(condition):
+    """
+    Проверка условия на здании организации коррелированным EXISTS.
+    В отличие от in_area/in_radius не задает порядок выборки, а только
+    отсеивает строки, найденные по другому условию. Коррелируется только
+    с organizations: внешний запрос может сам соединять buildings.
+    """
+    return select(Building.id).where(
+        Building.id == Organization.building_id, condition
+    ).correlate(Organization).exists()
+
+
+def area_matches(min_lat: float, max_lat: float, min_lon: float, max_lon: float):
+    """Проверка, что здание организации лежит в прямоугольной области."""
+    return building_matches(
+        BuildingRepository.area_condition(min_lat, max_lat, min_lon, max_lon)
+    )
+
+
+def radius_matches(dialect_name: str, lat: float, lon: float, radius_km: float):
+    """Проверка, что здание организации лежит в радиусе от точки."""
+    distance = BuildingRepository.distance_expression(dialect_name, lat, lon)
+    return building_matches(
+        and_(
+            BuildingRepository.radius_condition(lat, lon, radius_km),
+            distance <= radius_km,
+        )
+    )
+
+
+def activity_matches(activity_id: int, include_children: bool):
+    """Проверка, что у организации есть деятельность (или деятельность из поддерева)."""
+    statement = select(organization_activities.c.activity_id).where(
+        organization_activities.c.organization_id == Organization.id
+    )
+    if include_children:
+        statement = statement.join(
+            activity_closure,
+            activity_closure.c.descendant_id == organization_activities.c.activity_id,
+        ).where(activity_closure.c.ancestor_id == activity_id)
+    else:
+        statement = statement.where(organization_activities.c.activity_id == activity_id)
+    return statement.correlate(Organization).exists()
+
+
+def nearest_conditions(
+    dialect_name: str,
+    lat: float,
+    lon: float,
+    radius_km: float,
+    activity_ids: list[int] | None = None,
+    after: tuple[float, int] | None = None,
+    building_ids: list[int] | None = None,
+):
+    """
+    Выражение расстояния до здания и условия поиска ближайших организаций.
+    Запрос должен соединять organizations с buildings.
+    after - курсор (расстояние, ID): выдача строго после него в порядке
+    (расстояние, ID). Радиус от MAX_DISTANCE_KM покрывает весь шар, и
+    условий на координаты нет. building_ids - здания в радиусе, найденные
+    геоиндексом: расстояние считается только для них, а не для всех зданий
+    описанного прямоугольника.
+    """
+    distance = BuildingRepository.distance_expression(dialect_name, lat, lon)
+    conditions = []
+    if building_ids is not None:
+        conditions += [Building.id.in_(building_ids), distance <= radius_km]
+    elif radius_km < MAX_DISTANCE_KM:
+        conditions += [
+            BuildingRepository.radius_condition(lat, lon, radius_km),
+            distance <= radius_km,
+        ]
+    if activity_ids:
+        conditions.append(by_activity_ids(activity_ids))
+    if after is not None:
+        after_distance, after_id = after
+        conditions.append(
+            or_(
+                distance > after_distance,
+                and_(distance == after_distance, Organization.id > after_id),
+            )
+        )
+    return distance, conditions
+
+
+class OrganizationQueries(ABC):
+    """
+    Выборки организаций поверх get_page.
+    Наследники реализуют get_page (ORM или Core) и _item_id и получают
+    одинаковый набор методов чтения.
+    """
+
+    @abstractmethod
+    def get_page(self, condition=None, limit: int | None = None, after_id: int | None = None):
+        """
+        Keyset-пагинация по ID: организации, удовлетворяющие condition,
+        с ID больше after_id, отсортированные по ID, не более limit штук.
+        """
+
+    @staticmethod
+    @abstractmethod
+    def _item_id(item) -> int:
+        """ID организации из элемента, который возвращает get_page."""
+
+    def _dialect_name(self) -> str:
+        """Диалект БД текущей сессии."""
+        return self.db.get_bind().dialect.name
+
+    def radius_conditions(self, lat: float, lon: float, radius_km: float):
+        """
+        Условия радиуса в диалекте текущей сессии: для выборки организаций
+        по зданиям и для проверки здания уже выбранных (см. building_matches).
+        """
+        dialect_name = self._dialect_name()
+        return (
+            in_radius(dialect_name, lat, lon, radius_km),
+            radius_matches(dialect_name, lat, lon, radius_km),
+        )
+
+    def name_condition(self, name: str):
+        """Условие подстрочного поиска по названию в диалекте текущей сессии."""
+        return name_contains(self._dialect_name(), name)
+
+    def get_by_ids(self, org_ids: list[int]):
+        """Получить организации по списку ID в порядке списка."""
+        if not org_ids:
+            return []
+        by_id = {
+            self._item_id(item): item
+            for item in self.get_page(Organization.id.in_(org_ids))
+        }
+        return [by_id[org_id] for org_id in org_ids if org_id in by_id]
+
+    def get_ids(self, condition, limit: int, after_id: int | None = None) -> list[int]:
+        """ID организаций, удовлетворяющих condition, по возрастанию, не более limit."""
+        statement = select(Organization.id).where(condition)
+        if after_id is not None:
+            statement = statement.where(Organization.id > after_id)
+        return self.db.execute(
+            statement.order_by(Organization.id).limit(limit)
+        ).scalars().all()
+
+    def count(self, condition) -> int:
+        """Число организаций, удовлетворяющих condition."""
+        return self.db.execute(
+            select(func.count()).select_from(Organization).where(condition)
+        ).scalar_one()
+
+    def get_all(self, limit: int | None = None, after_id: int | None = None):
+        """Получить все организации."""
+        return self.get_page(None, limit, after_id)
+
+    def get_by_id(self, org_id: int):
+        """Получить организацию по ID."""
+        organizations = self.get_page(Organization.id == org_id, 1)
+        return organizations[0] if organizations else None
+
+    def get_by_building_id(
+        self, building_id: int, limit: int | None = None, after_id: int | None = None
+    ):
+        """Получить все организации в конкретном здании."""
+        return self.get_page(by_building(building_id), limit, after_id)
+
+    def get_by_activity_id(
+        self, activity_id: int, limit: int | None = None, after_id: int | None = None
+    ):
+        """Получить организации по конкретному виду деятельности."""
+        return self.get_page(by_activity_ids([activity_id]), limit, after_id)
+
+    def get_by_activity_ids(
+        self,
+        activity_ids: list[int],
+        limit: int | None = None,
+        after_id: int | None = None,
+    ):
+        """
+        Получить организации по списку ID деятельностей.
+        Используется для поиска с учетом поддерева деятельностей.
+        """
+        if not activity_ids:
+            return []
+        return self.get_page(by_activity_ids(activity_ids), limit, after_id)
+
+    def get_by_activity_subtree(
+        self, activity_id: int, limit: int | None = None, after_id: int | None = None
+    ):
+        """
+        Получить организации по деятельности с учетом всех дочерних.
+        Поддерево раскрывается через closure table в том же запросе.
+        """
+        return self.get_page(by_activity_subtree(activity_id), limit, after_id)
+
+    def get_by_building_ids(
+        self,
+        building_ids: list[int],
+        limit: int | None = None,
+        after_id: int | None = None,
+    ):
+        """Получить организации по списку ID зданий."""
+        if not building_ids:
+            return []
+        return self.get_page(by_building_ids(building_ids), limit, after_id)
+
+    def get_by_phone(self, phone: str):
+        """Получить организации по номеру телефона в любом формате."""
+        return self.get_page(by_phone(normalize_phone(phone)))
+
+    def get_in_radius(self, lat: float, lon: float, radius_km: float):
+        """
+        Получить организации в радиусе от точки одним SQL-запросом.
+        Предфильтр по прямоугольнику, точная дистанция и выборка организаций
+        выполняются в БД без загрузки зданий в память.
+        """
+        return self.get_page(in_radius(self._dialect_name(), lat, lon, radius_km))
+
+    def get_in_bounding_box(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        limit: int | None = None,
+        after_id: int | None = None,
+    ):
+        """Получить организации в прямоугольной области одним SQL-запросом."""
+        return self.get_page(
+            in_area(min_lat, max_lat, min_lon, max_lon), limit, after_id
+        )
+
+    def search_by_name(
+        self, name: str, limit: int | None = None, after_id: int | None = None
+    ):
+        """
+        Поиск организаций по названию (частичное совпадение, case-insensitive).
+        """
+        return self.get_page(name_contains(self._dialect_name(), name), limit, after_id)
+
+    def search_ranked(self, name: str, limit: int):
+        """
+        Поиск организаций по названию: limit самых релевантных совпадений.
+        Сначала одним запросом по индексу выбираются ID, затем организации.
+        """
+        org_ids = self.db.execute(
+            ranked_name_matches(self._dialect_name(), name, limit)
+        ).scalars().all()
+        return self.get_by_ids(org_ids)
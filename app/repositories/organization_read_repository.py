@@ -0,0 +1,146 @@
+from collections import defaultdict
+from operator import itemgetter
+from typing import Iterator
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.phones import decode_phone_numbers
+from app.models import Activity, Building, Organization, organization_activities
+from app.repositories.organization_queries import OrganizationQueries, nearest_conditions
+
+organizations = Organization.__table__
+buildings = Building.__table__
+activities = Activity.__table__
+
+
+class OrganizationReadRepository(OrganizationQueries):
+    """
+    Read-only выборки организаций без ORM.
+
+    Выбирает только нужные колонки через Core select() и сразу собирает
+    словари в формате OrganizationResponse: объекты не попадают в identity
+    map сессии, а телефоны декодируются один раз на строку.
+    """
+
+    _item_id = staticmethod(itemgetter("id"))
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def _select():
+        """Колонки организации и ее здания."""
+        return select(
+            organizations.c.id,
+            organizations.c.name,
+            organizations.c.phone_numbers,
+            buildings.c.id.label("building_id"),
+            buildings.c.address,
+            buildings.c.latitude,
+            buildings.c.longitude,
+        ).join_from(organizations, buildings, organizations.c.building_id == buildings.c.id)
+
+    def get_page(
+        self, condition=None, limit: int | None = None, after_id: int | None = None
+    ) -> list[dict]:
+        """
+        Keyset-пагинация по ID: организации, удовлетворяющие condition,
+        с ID больше after_id, отсортированные по ID, не более limit штук.
+        """
+        statement = self._select()
+        if condition is not None:
+            statement = statement.where(condition)
+        if after_id is not None:
+            statement = statement.where(organizations.c.id > after_id)
+        statement = statement.order_by(organizations.c.id)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return self._to_dicts(self.db.execute(statement).all())
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[list[dict]]:
+        """
+        Все организации по возрастанию ID пачками по chunk_size.
+        Строки читаются курсором на стороне сервера (stream_results), а
+        деятельности догружаются одним запросом на пачку, поэтому память
+        не зависит от размера таблицы.
+        """
+        result = self.db.execute(
+            self._select()
+            .order_by(organizations.c.id)
+            .execution_options(stream_results=True, yield_per=chunk_size)
+        )
+        for rows in result.partitions():
+            yield self._to_dicts(rows)
+
+    def get_nearest(
+        self,
+        lat: float,
+        lon: float,
+        limit: int,
+        radius_km: float,
+        activity_ids: list[int] | None = None,
+        after: tuple[float, int] | None = None,
+        building_ids: list[int] | None = None,
+    ) -> list[tuple[dict, float]]:
+        """
+        Получить до limit ближайших организаций в пределах radius_km.
+        Возвращает пары (организация, расстояние в км), отсортированные по
+        расстоянию и ID; after - курсор (расстояние, ID) предыдущей страницы.
+        building_ids - здания в радиусе из геоиндекса (см. nearest_conditions).
+        """
+        distance, conditions = nearest_conditions(
+            self._dialect_name(), lat, lon, radius_km, activity_ids, after, building_ids
+        )
+        rows = self.db.execute(
+            self._select()
+            .add_columns(distance.label("distance_km"))
+            .where(*conditions)
+            .order_by(distance, organizations.c.id)
+            .limit(limit)
+        ).all()
+        return list(zip(self._to_dicts(rows), (row.distance_km for row in rows)))
+
+    def _activities_by_organization(self, org_ids: list[int]) -> dict[int, list[dict]]:
+        """Деятельности организаций одним запросом по связующей таблице."""
+        rows = self.db.execute(
+            select(
+                organization_activities.c.organization_id,
+                activities.c.id,
+                activities.c.name,
+                activities.c.parent_id,
+                activities.c.level,
+            )
+            .join_from(
+                organization_activities,
+                activities,
+                organization_activities.c.activity_id == activities.c.id,
+            )
+            .where(organization_activities.c.organization_id.in_(org_ids))
+            .order_by(organization_activities.c.organization_id, activities.c.id)
+        ).all()
+        result = defaultdict(list)
+        for organization_id, activity_id, name, parent_id, level in rows:
+            result[organization_id].append(
+                {"id": activity_id, "name": name, "parent_id": parent_id, "level": level}
+            )
+        return result
+
+    def _to_dicts(self, rows) -> list[dict]:
+        """Собрать словари ответа из строк организаций."""
+        if not rows:
+            return []
+        activities_by_org = self._activities_by_organization([row.id for row in rows])
+        return [
+            {
+                "id": row.id,
+                "name": row.name,
+                "phone_numbers": decode_phone_numbers(row.phone_numbers),
+                "building": {
+                    "id": row.building_id,
+                    "address": row.address,
+                    "latitude": row.latitude,
+                    "longitude": row.longitude,
+                },
+                "activities": activities_by_org.get(row.id, []),
+            }
+            for row in rows
+        ]
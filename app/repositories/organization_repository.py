@@ -1,73 +1,353 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from app.models import Organization, Activity
+import json
+from collections import defaultdict
+from operator import attrgetter
+from typing import Iterable
+from sqlalchemy.orm import Session, joinedload, selectinload, subqueryload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import delete, distinct, func, insert, select
+from app.cache import (
+    ORGANIZATIONS_TAG,
+    activity_tag,
+    building_tag,
+    organization_tag,
+    response_cache,
+)
+from app.core.config import get_settings
+from app.core.phones import decode_phone_numbers, normalize_phone
+from app.indexes import (
+    cardinality_stats,
+    organization_bitmaps,
+    organization_name_index,
+    suggest_by_scan,
+)
+from app.models import (
+    Organization,
+    Activity,
+    Building,
+    activity_closure,
+    organization_activities,
+    organization_phones,
+)
+from app.repositories.building_repository import BuildingRepository
+from app.repositories.version_repository import ORGANIZATIONS, VersionRepository
+from app.repositories.organization_queries import (
+    OrganizationQueries,
+    nearest_conditions,
+)
 from app.schemas import OrganizationCreate, OrganizationUpdate
 
+settings = get_settings()
 
-class OrganizationRepository:
+# Стратегии загрузки деятельностей организаций
+LOAD_STRATEGIES = {
+    # JOIN: одна строка результата на каждую деятельность организации
+    "joined": joinedload,
+    # Второй запрос с WHERE organization_id IN (...)
+    "selectin": selectinload,
+    # Второй запрос с повтором исходного запроса в подзапросе
+    "subquery": subqueryload,
+}
+
+
+class OrganizationRepository(OrganizationQueries):
     """Репозиторий для CRUD операций с организациями."""
 
-    def __init__(self, db: Session):
+    _item_id = staticmethod(attrgetter("id"))
+
+    def __init__(self, db: Session, load_strategy: str | None = None):
         self.db = db
+        # joined, selectin, subquery или batched (ручная пакетная загрузка)
+        self.load_strategy = load_strategy or settings.ORGANIZATION_LOAD_STRATEGY
 
     def _base_query(self):
-        """Базовый запрос с подгрузкой связанных сущностей."""
-        return self.db.query(Organization).options(
-            joinedload(Organization.building),
-            joinedload(Organization.activities),
+        """
+        Базовый запрос с подгрузкой связанных сущностей.
+        Здание (многие-к-одному) всегда подгружается JOIN-ом, деятельности -
+        согласно load_strategy. Для batched они загружаются в _all.
+        """
+        query = self.db.query(Organization).options(joinedload(Organization.building))
+        loader = LOAD_STRATEGIES.get(self.load_strategy)
+        if loader is not None:
+            query = query.options(loader(Organization.activities))
+        return query
+
+    def _all(self, query) -> list[Organization]:
+        """Выполнить запрос организаций и догрузить деятельности."""
+        organizations = query.all()
+        self._load_activities(organizations)
+        return organizations
+
+    def _load_activities(self, organizations: list[Organization]) -> None:
+        """
+        Пакетная загрузка деятельностей для стратегии batched:
+        один запрос по связующей таблице на всю выборку организаций.
+        """
+        if self.load_strategy != "batched" or not organizations:
+            return
+        rows = (
+            self.db.query(organization_activities.c.organization_id, Activity)
+            .join(Activity, Activity.id == organization_activities.c.activity_id)
+            .filter(
+                organization_activities.c.organization_id.in_(
+                    [organization.id for organization in organizations]
+                )
+            )
+            .all()
         )
+        activities_by_org = defaultdict(list)
+        for organization_id, activity in rows:
+            activities_by_org[organization_id].append(activity)
+        for organization in organizations:
+            set_committed_value(
+                organization, "activities", activities_by_org.get(organization.id, [])
+            )
 
-    def get_all(self) -> list[Organization]:
-        """Получить все организации."""
-        return self._base_query().all()
+    def rebuild_name_index(self) -> None:
+        """Перестроить индекс названий организаций по данным БД."""
+        organization_name_index.build(self.db.query(Organization.id, Organization.name))
 
-    def get_by_id(self, org_id: int) -> Organization | None:
-        """Получить организацию по ID."""
-        return self._base_query().filter(Organization.id == org_id).first()
+    @staticmethod
+    def _phone_rows(org_id: int, phone_numbers: Iterable[str]) -> list[dict]:
+        """Строки organization_phones организации: уникальные нормализованные номера."""
+        phones = {normalize_phone(phone) for phone in phone_numbers} - {""}
+        return [{"organization_id": org_id, "phone": phone} for phone in sorted(phones)]
 
-    def get_by_building_id(self, building_id: int) -> list[Organization]:
-        """Получить все организации в конкретном здании."""
-        return self._base_query().filter(
-            Organization.building_id == building_id
-        ).all()
+    def _insert_phones(self, rows: list[dict]) -> None:
+        """Вставить строки organization_phones одним запросом (без commit)."""
+        if rows:
+            self.db.execute(insert(organization_phones), rows)
 
-    def get_by_activity_id(self, activity_id: int) -> list[Organization]:
-        """Получить организации по конкретному виду деятельности."""
-        return self._base_query().filter(
-            Organization.activities.any(Activity.id == activity_id)
-        ).all()
+    def _set_phones(self, org_id: int, phone_numbers: list[str]) -> None:
+        """Записать нормализованные телефоны организации (без commit)."""
+        self.db.execute(
+            delete(organization_phones).where(organization_phones.c.organization_id == org_id)
+        )
+        self._insert_phones(self._phone_rows(org_id, phone_numbers))
 
-    def get_by_activity_ids(self, activity_ids: list[int]) -> list[Organization]:
+    def _invalidate_responses(
+        self,
+        building_ids: Iterable[int],
+        activity_ids: Iterable[int],
+        org_ids: Iterable[int] = (),
+    ) -> None:
         """
-        Получить организации по списку ID деятельностей.
-        Используется для поиска с учетом поддерева деятельностей.
+        Инвалидировать кэш ответов после записи организаций: общие списки,
+        ответы по их зданиям и деятельностям (включая предков - ответы
+        с дочерними деятельностями) и ответы по самим организациям.
         """
-        if not activity_ids:
-            return []
-        return self._base_query().filter(
-            Organization.activities.any(Activity.id.in_(activity_ids))
-        ).all()
+        if not response_cache.enabled:
+            return
+        activity_ids = set(activity_ids)
+        if activity_ids:
+            activity_ids.update(
+                self.db.scalars(
+                    select(activity_closure.c.ancestor_id).where(
+                        activity_closure.c.descendant_id.in_(activity_ids)
+                    )
+                )
+            )
+        response_cache.invalidate(
+            [
+                ORGANIZATIONS_TAG,
+                *map(building_tag, set(building_ids)),
+                *map(activity_tag, activity_ids),
+                *map(organization_tag, org_ids),
+            ]
+        )
 
-    def get_by_building_ids(self, building_ids: list[int]) -> list[Organization]:
-        """Получить организации по списку ID зданий."""
-        if not building_ids:
-            return []
-        return self._base_query().filter(
-            Organization.building_id.in_(building_ids)
-        ).all()
+    def rebuild_phone_index(self) -> None:
+        """Полностью пересчитать organization_phones по телефонам организаций."""
+        self.db.execute(delete(organization_phones))
+        rows = []
+        for org_id, value in self.db.query(Organization.id, Organization.phone_numbers):
+            rows.extend(self._phone_rows(org_id, decode_phone_numbers(value)))
+        self._insert_phones(rows)
+        self.db.commit()
 
-    def search_by_name(self, name: str) -> list[Organization]:
+    def suggest_by_prefix(self, prefix: str, limit: int) -> list[tuple[int, str]]:
         """
-        Поиск организаций по названию (частичное совпадение, case-insensitive).
+        Пары (id, название) организаций, у которых слово названия начинается
+        с prefix. Запасной путь автодополнения, когда индекс в памяти
+        не построен: названия читаются пачками и сравниваются так же, как
+        в индексе (casefold, ё -> е, начала слов), потому что lower() SQLite
+        не меняет регистр кириллицы.
         """
-        search_pattern = f"%{name}%"
-        return self._base_query().filter(
-            func.lower(Organization.name).like(func.lower(search_pattern))
-        ).all()
+        return suggest_by_scan(
+            self.db.query(Organization.id, Organization.name).yield_per(10000), prefix, limit
+        )
+
+    def rebuild_bitmap_index(self) -> None:
+        """Перестроить bitmap-индекс организаций по данным БД."""
+        organization_bitmaps.build(
+            self.db.query(Organization.id, Organization.building_id).yield_per(10000),
+            self.db.query(
+                organization_activities.c.organization_id,
+                organization_activities.c.activity_id,
+            ).yield_per(10000),
+        )
+
+    def load_cardinality_stats(self) -> None:
+        """
+        Пересчитать оценки числа организаций: по деятельностям (напрямую
+        и по поддеревьям через closure table) и по ячейкам геосетки.
+        """
+        activity_counts = dict(
+            self.db.query(organization_activities.c.activity_id, func.count())
+            .group_by(organization_activities.c.activity_id)
+            .all()
+        )
+        subtree_counts = dict(
+            self.db.query(
+                activity_closure.c.ancestor_id,
+                func.count(distinct(organization_activities.c.organization_id)),
+            )
+            .join(
+                organization_activities,
+                organization_activities.c.activity_id == activity_closure.c.descendant_id,
+            )
+            .group_by(activity_closure.c.ancestor_id)
+            .all()
+        )
+        row, col = self._cluster_cell(0.0, 0.0, cardinality_stats.cell_size)
+        cell_counts = {
+            (int(cell_row), int(cell_col)): count
+            for cell_row, cell_col, count in self.db.query(row, col, func.count(Organization.id))
+            .select_from(Organization)
+            .join(Building, Organization.building_id == Building.id)
+            .group_by(row, col)
+        }
+        cardinality_stats.load(activity_counts, subtree_counts, cell_counts)
+
+    def get_page(
+        self, condition=None, limit: int | None = None, after_id: int | None = None
+    ) -> list[Organization]:
+        """
+        Keyset-пагинация по ID: организации, удовлетворяющие condition,
+        с ID больше after_id, отсортированные по ID, не более limit штук.
+        """
+        query = self._base_query()
+        if condition is not None:
+            query = query.filter(condition)
+        if after_id is not None:
+            query = query.filter(Organization.id > after_id)
+        query = query.order_by(Organization.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return self._all(query)
+
+    def get_nearest(
+        self,
+        lat: float,
+        lon: float,
+        limit: int,
+        radius_km: float,
+        activity_ids: list[int] | None = None,
+        after: tuple[float, int] | None = None,
+        building_ids: list[int] | None = None,
+    ) -> list[tuple[Organization, float]]:
+        """
+        Получить до limit ближайших организаций в пределах radius_km.
+        Возвращает пары (организация, расстояние в км), отсортированные по
+        расстоянию и ID. after - курсор (расстояние, ID) последней организации
+        предыдущей страницы: выдача продолжается строго после него.
+        building_ids - здания в радиусе из геоиндекса (см. nearest_conditions).
+        """
+        distance, conditions = nearest_conditions(
+            self._dialect_name(), lat, lon, radius_km, activity_ids, after, building_ids
+        )
+        query = (
+            self._base_query()
+            .join(Building, Organization.building_id == Building.id)
+            .add_columns(distance.label("distance_km"))
+            .filter(*conditions)
+        )
+        rows = query.order_by(distance, Organization.id).limit(limit).all()
+        self._load_activities([organization for organization, _ in rows])
+        return [(organization, distance_km) for organization, distance_km in rows]
+
+    def get_clusters_in_box(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        cell_size: float,
+    ) -> list[dict]:
+        """
+        Агрегировать организации области по ячейкам сетки размером cell_size градусов.
+        Для каждой ячейки возвращает номер строки/столбца, число организаций
+        и центроид их зданий. Агрегация выполняется в БД.
+        """
+        row, col = self._cluster_cell(min_lat, min_lon, cell_size)
+        rows = (
+            self.db.query(
+                row,
+                col,
+                func.count(Organization.id),
+                func.avg(Building.latitude),
+                func.avg(Building.longitude),
+            )
+            .select_from(Organization)
+            .join(Building, Organization.building_id == Building.id)
+            .filter(BuildingRepository.area_condition(min_lat, max_lat, min_lon, max_lon))
+            .group_by(row, col)
+            .all()
+        )
+        return [
+            {
+                "row": int(cell_row),
+                "col": int(cell_col),
+                "count": count,
+                "latitude": latitude,
+                "longitude": longitude,
+            }
+            for cell_row, cell_col, count, latitude, longitude in rows
+        ]
+
+    def get_cluster_activity_counts(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        cell_size: float,
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Число организаций по каждой деятельности в ячейках сетки.
+        Возвращает кортежи (строка, столбец, ID деятельности, количество).
+        """
+        row, col = self._cluster_cell(min_lat, min_lon, cell_size)
+        rows = (
+            self.db.query(
+                row,
+                col,
+                organization_activities.c.activity_id,
+                func.count(),
+            )
+            .select_from(Organization)
+            .join(Building, Organization.building_id == Building.id)
+            .join(
+                organization_activities,
+                organization_activities.c.organization_id == Organization.id,
+            )
+            .filter(BuildingRepository.area_condition(min_lat, max_lat, min_lon, max_lon))
+            .group_by(row, col, organization_activities.c.activity_id)
+            .all()
+        )
+        return [
+            (int(cell_row), int(cell_col), activity_id, count)
+            for cell_row, cell_col, activity_id, count in rows
+        ]
+
+    @staticmethod
+    def _cluster_cell(min_lat: float, min_lon: float, cell_size: float):
+        """SQL-выражения строки и столбца ячейки сетки для здания."""
+        return (
+            func.floor((Building.latitude - min_lat) / cell_size),
+            func.floor((Building.longitude - min_lon) / cell_size),
+        )
 
-    def create(
-        self, org_data: OrganizationCreate, activities: list[Activity]
-    ) -> Organization:
+    def create(self, org_data: OrganizationCreate, activities: list[Activity]) -> Organization:
         """Создать новую организацию."""
         organization = Organization(
             name=org_data.name,
@@ -75,12 +355,79 @@ class OrganizationRepository:
             building_id=org_data.building_id,
         )
         organization.activities = activities
-        
+
         self.db.add(organization)
+        self.db.flush()
+        self._set_phones(organization.id, org_data.phone_numbers)
+        VersionRepository(self.db).bump(ORGANIZATIONS)
         self.db.commit()
-        self.db.refresh(organization)
+        # Перечитываем со зданием и деятельностями: ответ не должен
+        # догружать связи лениво (в режиме ASYNC_DB это невозможно), а
+        # сессия без expire_on_commit иначе оставила бы прежнее здание
+        self.db.expire(organization)
+        organization = self.get_by_id(organization.id)
+        if organization_name_index.is_ready:
+            organization_name_index.add(organization.id, organization.name)
+        if organization_bitmaps.is_ready:
+            organization_bitmaps.add(
+                organization.id,
+                organization.building_id,
+                [activity.id for activity in activities],
+            )
+        self._invalidate_responses(
+            [organization.building_id],
+            [activity.id for activity in activities],
+            [organization.id],
+        )
         return organization
 
+    def bulk_create(self, items: list[OrganizationCreate]) -> list[int]:
+        """
+        Создать пачку организаций многострочными INSERT и закоммитить ее.
+        Здания и деятельности должны быть проверены заранее.
+        Возвращает ID созданных организаций в порядке items.
+        """
+        if not items:
+            return []
+        table = Organization.__table__
+        org_ids = self.db.scalars(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": item.name,
+                    "phone_numbers": json.dumps(item.phone_numbers),
+                    "building_id": item.building_id,
+                }
+                for item in items
+            ],
+        ).all()
+        activity_rows = []
+        phone_rows = []
+        for org_id, item in zip(org_ids, items):
+            activity_rows.extend(
+                {"organization_id": org_id, "activity_id": activity_id}
+                for activity_id in dict.fromkeys(item.activity_ids)
+            )
+            phone_rows.extend(self._phone_rows(org_id, item.phone_numbers))
+        if activity_rows:
+            self.db.execute(insert(organization_activities), activity_rows)
+        self._insert_phones(phone_rows)
+        VersionRepository(self.db).bump(ORGANIZATIONS)
+        self.db.commit()
+
+        if organization_name_index.is_ready:
+            organization_name_index.add_many(
+                (org_id, item.name) for org_id, item in zip(org_ids, items)
+            )
+        if organization_bitmaps.is_ready:
+            for org_id, item in zip(org_ids, items):
+                organization_bitmaps.add(org_id, item.building_id, set(item.activity_ids))
+        self._invalidate_responses(
+            (item.building_id for item in items),
+            (activity_id for item in items for activity_id in item.activity_ids),
+        )
+        return org_ids
+
     def update(
         self,
         org_id: int,
@@ -88,37 +435,73 @@ class OrganizationRepository:
         activities: list[Activity] | None = None,
     ) -> Organization | None:
         """Обновить организацию."""
-        organization = self.db.query(Organization).filter(
-            Organization.id == org_id
-        ).first()
-        
+        organization = self.db.query(Organization).filter(Organization.id == org_id).first()
+
         if not organization:
             return None
-        
+
         update_data = org_data.model_dump(exclude_unset=True)
-        
+        # Прежние здание и деятельности - для инвалидации кэша ответов
+        old_building_id = organization.building_id
+        old_activity_ids = []
+        if response_cache.enabled:
+            old_activity_ids = [activity.id for activity in organization.activities]
+
         # Убираем activity_ids из данных, т.к. это отдельная связь
         update_data.pop("activity_ids", None)
-        
+
         for field, value in update_data.items():
             setattr(organization, field, value)
-        
+
         if activities is not None:
             organization.activities = activities
-        
+
+        if "phone_numbers" in update_data:
+            self._set_phones(org_id, update_data["phone_numbers"])
+
+        VersionRepository(self.db).bump(ORGANIZATIONS)
         self.db.commit()
-        self.db.refresh(organization)
+        # Перечитываем со зданием и деятельностями: ответ не должен
+        # догружать связи лениво (в режиме ASYNC_DB это невозможно), а
+        # сессия без expire_on_commit иначе оставила бы прежнее здание
+        self.db.expire(organization)
+        organization = self.get_by_id(organization.id)
+        if organization_name_index.is_ready and "name" in update_data:
+            organization_name_index.add(organization.id, organization.name)
+        if organization_bitmaps.is_ready and (
+            "building_id" in update_data or activities is not None
+        ):
+            organization_bitmaps.add(
+                organization.id,
+                organization.building_id,
+                [activity.id for activity in organization.activities],
+            )
+        self._invalidate_responses(
+            [old_building_id, organization.building_id],
+            old_activity_ids + [activity.id for activity in organization.activities],
+            [org_id],
+        )
         return organization
 
     def delete(self, org_id: int) -> bool:
         """Удалить организацию."""
-        organization = self.db.query(Organization).filter(
-            Organization.id == org_id
-        ).first()
-        
+        organization = self.db.query(Organization).filter(Organization.id == org_id).first()
+
         if not organization:
             return False
-        
+
+        building_id = organization.building_id
+        activity_ids = []
+        if response_cache.enabled:
+            activity_ids = [activity.id for activity in organization.activities]
+        # Каскад внешнего ключа в SQLite без PRAGMA foreign_keys не срабатывает
+        self.db.execute(
+            delete(organization_phones).where(organization_phones.c.organization_id == org_id)
+        )
         self.db.delete(organization)
+        VersionRepository(self.db).bump(ORGANIZATIONS)
         self.db.commit()
+        organization_name_index.remove(org_id)
+        organization_bitmaps.remove(org_id)
+        self._invalidate_responses([building_id], activity_ids, [org_id])
         return True
@@ -0,0 +1,48 @@
+from typing import Iterable
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.models import DataVersion
+
+# Имена счетчиков версий
+ACTIVITIES = "activities"
+BUILDINGS = "buildings"
+ORGANIZATIONS = "organizations"
+
+
+class VersionRepository:
+    """Репозиторий счетчиков версий данных."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, name: str) -> int:
+        """Текущая версия (0, если счетчик еще не создан)."""
+        version = self.db.scalar(
+            select(DataVersion.version).where(DataVersion.name == name)
+        )
+        return version or 0
+
+    def get_many(self, names: Iterable[str]) -> dict[str, int]:
+        """Текущие версии нескольких счетчиков одним запросом."""
+        names = list(names)
+        versions = dict(self.db.execute(
+            select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names))
+        ).all())
+        return {name: versions.get(name, 0) for name in names}
+
+    def bump(self, name: str) -> int:
+        """
+        Увеличить версию и вернуть новое значение.
+        Выполняется в текущей транзакции, фиксируется вместе с изменением данных.
+        Строка счетчика общая для всех записей таблицы: ее блокировка держится
+        до commit, и параллельные транзакции записи ждут друг друга на ней.
+        """
+        result = self.db.execute(
+            update(DataVersion)
+            .where(DataVersion.name == name)
+            .values(version=DataVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            self.db.add(DataVersion(name=name, version=1))
+            self.db.flush()
+        return self.get(name)
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core import get_db, verify_api_key
-from app.repositories import ActivityRepository
-from app.schemas import ActivityResponse, ActivityCreate, ErrorResponse
+from fastapi import APIRouter, Depends, Request, Response, status
+from app.cache import not_modified
+from app.core import verify_api_key
+from app.repositories.version_repository import ACTIVITIES
+from app.services import ActivityService, AsyncService, get_async_service, get_data_etag
+from app.schemas import (
+    ActivityResponse, ActivityCreate, ActivityWithChildren, ErrorResponse
+)
+
+# Сервис деятельностей с сессией запроса (синхронной или асинхронной, см. ASYNC_DB)
+activity_service = get_async_service(ActivityService)
+# ETag ответов по деятельностям - версия счетчика деятельностей
+activities_etag = get_data_etag(ACTIVITIES)
 
 router = APIRouter(
     prefix="/activities",
@@ -20,10 +28,18 @@ router = APIRouter(
     summary="Получить список всех деятельностей",
     description="Возвращает плоский список всех видов деятельности.",
 )
-def get_all_activities(db: Session = Depends(get_db)) -> list[ActivityResponse]:
+async def get_all_activities(
+    request: Request,
+    response: Response,
+    etag: str = Depends(activities_etag),
+    service: AsyncService = Depends(activity_service),
+) -> list[ActivityResponse] | Response:
     """Получить список всех деятельностей."""
-    repo = ActivityRepository(db)
-    return repo.get_all()
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+    response.headers["ETag"] = etag
+    return await service.get_all()
 
 
 @router.get(
@@ -32,10 +48,40 @@ def get_all_activities(db: Session = Depends(get_db)) -> list[ActivityResponse]:
     summary="Получить корневые деятельности",
     description="Возвращает только корневые деятельности (level=1).",
 )
-def get_root_activities(db: Session = Depends(get_db)) -> list[ActivityResponse]:
+async def get_root_activities(
+    request: Request,
+    response: Response,
+    etag: str = Depends(activities_etag),
+    service: AsyncService = Depends(activity_service),
+) -> list[ActivityResponse] | Response:
     """Получить корневые деятельности (верхний уровень дерева)."""
-    repo = ActivityRepository(db)
-    return repo.get_root_activities()
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+    response.headers["ETag"] = etag
+    return await service.get_root_activities()
+
+
+@router.get(
+    "/tree/full",
+    response_model=list[ActivityWithChildren],
+    summary="Получить полное дерево деятельностей",
+    description="Возвращает корневые деятельности с вложенными дочерними на всю глубину.",
+)
+async def get_activity_tree(
+    request: Request,
+    etag: str = Depends(activities_etag),
+    service: AsyncService = Depends(activity_service),
+) -> Response:
+    """Получить полное вложенное дерево деятельностей."""
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+    return Response(
+        content=await service.get_tree_json(),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
 
 
 @router.get(
@@ -46,16 +92,19 @@ def get_root_activities(db: Session = Depends(get_db)) -> list[ActivityResponse]
         404: {"model": ErrorResponse, "description": "Activity not found"},
     },
 )
-def get_activity(activity_id: int, db: Session = Depends(get_db)) -> ActivityResponse:
+async def get_activity(
+    request: Request,
+    response: Response,
+    activity_id: int,
+    etag: str = Depends(activities_etag),
+    service: AsyncService = Depends(activity_service),
+) -> ActivityResponse | Response:
     """Получить информацию о деятельности по её ID."""
-    repo = ActivityRepository(db)
-    activity = repo.get_by_id(activity_id)
-    if not activity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Activity with id {activity_id} not found",
-        )
-    return activity
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+    response.headers["ETag"] = etag
+    return await service.get_activity(activity_id)
 
 
 @router.post(
@@ -68,29 +117,12 @@ def get_activity(activity_id: int, db: Session = Depends(get_db)) -> ActivityRes
         400: {"model": ErrorResponse, "description": "Bad request"},
     },
 )
-def create_activity(
+async def create_activity(
     activity_data: ActivityCreate,
-    db: Session = Depends(get_db),
+    service: AsyncService = Depends(activity_service),
 ) -> ActivityResponse:
     """
     Создать новую деятельность.
     Уровень вычисляется автоматически на основе родителя.
     """
-    repo = ActivityRepository(db)
-    
-    # Проверяем родителя и уровень
-    if activity_data.parent_id:
-        parent = repo.get_by_id(activity_data.parent_id)
-        if not parent:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Parent activity with id {activity_data.parent_id} not found",
-            )
-        # Проверка максимальной глубины (3 уровня)
-        if parent.level >= 3:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Maximum nesting level (3) exceeded. Cannot create 4th level activity.",
-            )
-    
-    return repo.create(activity_data)
+    return await service.create_activity(activity_data)
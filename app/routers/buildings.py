@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from app.core import get_db, verify_api_key
+from fastapi import APIRouter, Depends, Request, Response, status
+from app.cache import BUILDINGS_TAG, building_tag, response_cache
+from app.core import verify_api_key
 from app.repositories import BuildingRepository
+from app.repositories.version_repository import BUILDINGS
 from app.schemas import BuildingResponse, BuildingCreate, ErrorResponse
+from app.services import AsyncService, get_async_service, get_data_etag
+
+# Репозиторий зданий с сессией запроса (синхронной или асинхронной, см. ASYNC_DB)
+building_repository = get_async_service(BuildingRepository)
+# ETag ответов по зданиям - версия счетчика зданий
+buildings_etag = get_data_etag(BUILDINGS)
 
 router = APIRouter(
     prefix="/buildings",
@@ -20,10 +27,15 @@ router = APIRouter(
     summary="Получить список всех зданий",
     description="Возвращает список всех зданий с их адресами и координатами.",
 )
-def get_all_buildings(db: Session = Depends(get_db)) -> list[BuildingResponse]:
+async def get_all_buildings(
+    request: Request,
+    etag: str = Depends(buildings_etag),
+    repo: AsyncService = Depends(building_repository),
+) -> Response:
     """Получить список всех зданий."""
-    repo = BuildingRepository(db)
-    return repo.get_all()
+    return await response_cache.respond(
+        request, list[BuildingResponse], repo.get_all, [BUILDINGS_TAG], etag=etag
+    )
 
 
 @router.get(
@@ -34,17 +46,26 @@ def get_all_buildings(db: Session = Depends(get_db)) -> list[BuildingResponse]:
         404: {"model": ErrorResponse, "description": "Building not found"},
     },
 )
-def get_building(building_id: int, db: Session = Depends(get_db)) -> BuildingResponse:
+async def get_building(
+    request: Request,
+    building_id: int,
+    etag: str = Depends(buildings_etag),
+    repo: AsyncService = Depends(building_repository),
+) -> Response:
     """Получить информацию о здании по его ID."""
-    repo = BuildingRepository(db)
-    building = repo.get_by_id(building_id)
-    if not building:
-        from fastapi import HTTPException
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Building with id {building_id} not found",
-        )
-    return building
+    async def compute() -> BuildingResponse:
+        building = await repo.get_by_id(building_id)
+        if not building:
+            from fastapi import HTTPException
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Building with id {building_id} not found",
+            )
+        return building
+
+    return await response_cache.respond(
+        request, BuildingResponse, compute, [building_tag(building_id)], etag=etag
+    )
 
 
 @router.post(
@@ -53,10 +74,9 @@ def get_building(building_id: int, db: Session = Depends(get_db)) -> BuildingRes
     status_code=status.HTTP_201_CREATED,
     summary="Создать новое здание",
 )
-def create_building(
+async def create_building(
     building_data: BuildingCreate,
-    db: Session = Depends(get_db),
+    repo: AsyncService = Depends(building_repository),
 ) -> BuildingResponse:
     """Создать новое здание."""
-    repo = BuildingRepository(db)
-    return repo.create(building_data)
+    return await repo.create(building_data)
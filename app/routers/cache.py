@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from app.cache import response_cache
+from app.core import verify_api_key
+from app.schemas import CacheStatsResponse, ErrorResponse
+
+router = APIRouter(
+    prefix="/cache",
+    tags=["Cache"],
+    dependencies=[Depends(verify_api_key)],
+    responses={
+        401: {"model": ErrorResponse, "description": "Unauthorized"},
+    },
+)
+
+
+@router.get(
+    "/stats",
+    response_model=CacheStatsResponse,
+    summary="Статистика кэша ответов",
+    description="Попадания, промахи, инвалидации и заполненность кэша ответов.",
+)
+def get_cache_stats() -> CacheStatsResponse:
+    """Получить статистику кэша ответов."""
+    return CacheStatsResponse(**response_cache.stats())
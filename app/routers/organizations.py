@@ -1,14 +1,35 @@
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
-from app.core import get_db, verify_api_key
-from app.services import OrganizationService
+import json
+from typing import Any, AsyncIterator, Iterator, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from app.cache import (
+    ORGANIZATIONS_TAG, activity_tag, building_tag, not_modified, organization_tag, response_cache
+)
+from app.core import SessionLocal, get_settings, verify_api_key
+from app.core.serialization import JSONFragment, with_fields
+from app.models import Organization
+from app.repositories.version_repository import ORGANIZATIONS
+from app.services import AsyncService, OrganizationService, get_async_service, get_data_etag
 from app.schemas import (
     OrganizationResponse,
+    OrganizationPage,
+    OrganizationSuggestion,
+    OrganizationWithDistanceResponse,
+    OrganizationDistancePage,
+    OrganizationClusterResponse,
     OrganizationCreate,
     OrganizationUpdate,
+    BulkImportResult,
     ErrorResponse,
 )
 
+settings = get_settings()
+
+# Сервис организаций с сессией запроса (синхронной или асинхронной, см. ASYNC_DB)
+organization_service = get_async_service(OrganizationService)
+# ETag ответов по организациям - версия счетчика организаций
+organizations_etag = get_data_etag(ORGANIZATIONS)
+
 router = APIRouter(
     prefix="/organizations",
     tags=["Organizations"],
@@ -19,59 +40,314 @@ router = APIRouter(
 )
 
 
+# Типы содержимого, которые читаются как NDJSON (по объекту на строку)
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+
+async def _import_rows(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Строки тела массового импорта: пары (номер строки, данные).
+    NDJSON читается потоком, не накапливая тело в памяти; JSON-массив
+    разбирается целиком.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_CONTENT_TYPES:
+        line = 0
+        buffer = b""
+        async for chunk in request.stream():
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            for raw in lines:
+                line += 1
+                if raw.strip():
+                    yield line, raw
+        if buffer.strip():
+            yield line + 1, buffer
+        return
+
+    try:
+        data = json.loads(await request.body())
+    except ValueError:
+        data = None
+    if not isinstance(data, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Request body must be a JSON array or NDJSON",
+        )
+    for line, item in enumerate(data, start=1):
+        yield line, item
+
+
+# Типы содержимого потоковой выгрузки
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _export_stream(export_format: str) -> Iterator[str]:
+    """
+    Поток выгрузки со своей синхронной сессией: ответ отправляется после
+    того, как сессия запроса уже закрыта. Пачки читаются в пуле потоков
+    и при ASYNC_DB.
+    """
+    with SessionLocal() as db:
+        yield from OrganizationService(db).export_organizations(export_format)
+
+
+def _with_distance(
+    rows: list[tuple[Organization | dict | JSONFragment, float]],
+) -> list[dict | JSONFragment]:
+    """
+    Преобразовать пары (организация, расстояние) в элементы ответа.
+    Словари Core-пути чтения уже собраны по схеме и не валидируются
+    повторно, к готовым фрагментам расстояние дописывается как есть.
+    """
+    return [
+        with_fields(organization, distance_km=distance_km)
+        if isinstance(organization, JSONFragment)
+        else {
+            **(
+                organization if isinstance(organization, dict)
+                else OrganizationResponse.model_validate(organization).model_dump()
+            ),
+            "distance_km": distance_km,
+        }
+        for organization, distance_km in rows
+    ]
+
+
 @router.get(
     "/",
-    response_model=list[OrganizationResponse],
+    response_model=OrganizationPage,
     summary="Получить список организаций",
-    description="Возвращает список всех организаций с информацией о здании и деятельностях.",
+    description="Возвращает страницу организаций с информацией о здании и деятельностях. "
+                "Следующая страница запрашивается с after_id из next_cursor.",
 )
-def get_all_organizations(
-    db: Session = Depends(get_db),
-) -> list[OrganizationResponse]:
-    """Получить список всех организаций."""
-    service = OrganizationService(db)
-    return service.org_repo.get_all()
+async def get_all_organizations(
+    request: Request,
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description="Размер страницы",
+    ),
+    after_id: int | None = Query(
+        None, description="ID последней организации предыдущей страницы"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
+    """Получить страницу организаций."""
+    async def compute() -> dict:
+        items, next_cursor = await service.get_organizations(limit, after_id)
+        return {"items": items, "next_cursor": next_cursor}
+
+    return await response_cache.respond(
+        request, OrganizationPage, compute, [ORGANIZATIONS_TAG], etag=etag
+    )
 
 
 @router.get(
     "/search",
-    response_model=list[OrganizationResponse],
+    response_model=OrganizationPage,
     summary="Поиск организаций по названию",
-    description="Поиск организаций по частичному совпадению названия (case-insensitive).",
+    description=(
+        "Поиск организаций по частичному совпадению названия (case-insensitive). "
+        "С ranked=true возвращает limit самых релевантных совпадений без курсора."
+    ),
     responses={
         400: {"model": ErrorResponse, "description": "Bad request"},
     },
 )
-def search_organizations(
+async def search_organizations(
+    request: Request,
     name: str = Query(..., min_length=2, description="Строка поиска (минимум 2 символа)"),
-    db: Session = Depends(get_db),
-) -> list[OrganizationResponse]:
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description="Размер страницы",
+    ),
+    after_id: int | None = Query(
+        None, description="ID последней организации предыдущей страницы"
+    ),
+    ranked: bool = Query(False, description="Сортировать по релевантности"),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
     """Поиск организаций по названию."""
-    service = OrganizationService(db)
-    return service.search_by_name(name)
+    async def compute() -> dict:
+        items, next_cursor = await service.search_by_name(name, limit, after_id, ranked)
+        return {"items": items, "next_cursor": next_cursor}
+
+    return await response_cache.respond(
+        request, OrganizationPage, compute, [ORGANIZATIONS_TAG], etag=etag
+    )
 
 
 @router.get(
-    "/by-building/{building_id}",
+    "/suggest",
+    response_model=list[OrganizationSuggestion],
+    summary="Автодополнение по названию",
+    description=(
+        "Подсказки для строки поиска: до limit пар (id, название), "
+        "одно из слов названия которых начинается с prefix."
+    ),
+)
+async def suggest_organizations(
+    request: Request,
+    prefix: str = Query(..., min_length=1, description="Начало названия или слова названия"),
+    limit: int = Query(
+        10, ge=1, le=settings.SUGGEST_MAX_LIMIT, description="Количество подсказок"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
+    """Автодополнение по названию организации."""
+    async def compute() -> list[dict]:
+        return [
+            {"id": org_id, "name": name}
+            for org_id, name in await service.suggest(prefix, limit)
+        ]
+
+    return await response_cache.respond(
+        request,
+        list[OrganizationSuggestion],
+        compute,
+        [ORGANIZATIONS_TAG],
+        etag=etag,
+    )
+
+
+@router.get(
+    "/query",
+    response_model=OrganizationPage,
+    summary="Комбинированный поиск организаций",
+    description=(
+        "Поиск по любому сочетанию фильтров: название, деятельность (с поддеревом), "
+        "здание, радиус от точки, прямоугольная область. Фильтры объединяются по И "
+        "и выполняются одним запросом."
+    ),
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad request"},
+        404: {"model": ErrorResponse, "description": "Building or activity not found"},
+    },
+)
+async def query_organizations(
+    request: Request,
+    name: str | None = Query(None, min_length=2, description="Часть названия"),
+    activity_id: int | None = Query(None, description="ID деятельности"),
+    include_children: bool = Query(
+        True, description="Включать организации с дочерними деятельностями"
+    ),
+    building_id: int | None = Query(None, description="ID здания"),
+    latitude: float | None = Query(None, ge=-90, le=90, description="Широта центра"),
+    longitude: float | None = Query(None, ge=-180, le=180, description="Долгота центра"),
+    radius_km: float | None = Query(None, gt=0, le=1000, description="Радиус в километрах"),
+    min_lat: float | None = Query(None, ge=-90, le=90, description="Минимальная широта"),
+    max_lat: float | None = Query(None, ge=-90, le=90, description="Максимальная широта"),
+    min_lon: float | None = Query(None, ge=-180, le=180, description="Минимальная долгота"),
+    max_lon: float | None = Query(None, ge=-180, le=180, description="Максимальная долгота"),
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description="Размер страницы",
+    ),
+    after_id: int | None = Query(
+        None, description="ID последней организации предыдущей страницы"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
+    """Комбинированный поиск организаций."""
+    async def compute() -> dict:
+        items, next_cursor = await service.query_organizations(
+            name=name,
+            activity_id=activity_id,
+            include_children=include_children,
+            building_id=building_id,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lon=min_lon,
+            max_lon=max_lon,
+            limit=limit,
+            after_id=after_id,
+        )
+        return {"items": items, "next_cursor": next_cursor}
+
+    return await response_cache.respond(
+        request, OrganizationPage, compute, [ORGANIZATIONS_TAG], etag=etag
+    )
+
+
+@router.get(
+    "/by-phone",
     response_model=list[OrganizationResponse],
+    summary="Организации по номеру телефона",
+    description=(
+        "Найти организации по номеру телефона. Номер можно передать в любом "
+        "формате: +7 (495) 111-11-11, 8-495-111-1111, 4951111111."
+    ),
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad request"},
+    },
+)
+async def get_organizations_by_phone(
+    request: Request,
+    phone: str = Query(..., min_length=1, max_length=50, description="Номер телефона"),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
+    """Получить организации по номеру телефона."""
+    return await response_cache.respond(
+        request,
+        list[OrganizationResponse],
+        lambda: service.get_organizations_by_phone(phone),
+        [ORGANIZATIONS_TAG],
+        etag=etag,
+    )
+
+
+@router.get(
+    "/by-building/{building_id}",
+    response_model=OrganizationPage,
     summary="Организации в здании",
     description="Получить список всех организаций в конкретном здании.",
     responses={
         404: {"model": ErrorResponse, "description": "Building not found"},
     },
 )
-def get_organizations_by_building(
+async def get_organizations_by_building(
+    request: Request,
     building_id: int,
-    db: Session = Depends(get_db),
-) -> list[OrganizationResponse]:
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description="Размер страницы",
+    ),
+    after_id: int | None = Query(
+        None, description="ID последней организации предыдущей страницы"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
     """Получить организации по ID здания."""
-    service = OrganizationService(db)
-    return service.get_organizations_by_building(building_id)
+    async def compute() -> dict:
+        items, next_cursor = await service.get_organizations_by_building(
+            building_id, limit, after_id
+        )
+        return {"items": items, "next_cursor": next_cursor}
+
+    return await response_cache.respond(
+        request, OrganizationPage, compute, [building_tag(building_id)], etag=etag
+    )
 
 
 @router.get(
     "/by-activity/{activity_id}",
-    response_model=list[OrganizationResponse],
+    response_model=OrganizationPage,
     summary="Организации по виду деятельности",
     description="Получить список организаций по виду деятельности. "
                 "При include_children=true включает организации с дочерними деятельностями.",
@@ -79,52 +355,228 @@ def get_organizations_by_building(
         404: {"model": ErrorResponse, "description": "Activity not found"},
     },
 )
-def get_organizations_by_activity(
+async def get_organizations_by_activity(
+    request: Request,
     activity_id: int,
     include_children: bool = Query(
         False,
         description="Включить организации с дочерними деятельностями",
     ),
-    db: Session = Depends(get_db),
-) -> list[OrganizationResponse]:
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description="Размер страницы",
+    ),
+    after_id: int | None = Query(
+        None, description="ID последней организации предыдущей страницы"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
     """Получить организации по виду деятельности."""
-    service = OrganizationService(db)
-    return service.get_organizations_by_activity(activity_id, include_children)
+    async def compute() -> dict:
+        items, next_cursor = await service.get_organizations_by_activity(
+            activity_id, include_children, limit, after_id
+        )
+        return {"items": items, "next_cursor": next_cursor}
+
+    # Запись организации инвалидирует и предков своих деятельностей,
+    # поэтому тега запрошенной деятельности достаточно и для поддерева
+    return await response_cache.respond(
+        request, OrganizationPage, compute, [activity_tag(activity_id)], etag=etag
+    )
 
 
 @router.get(
     "/in-radius",
-    response_model=list[OrganizationResponse],
+    response_model=OrganizationDistancePage,
     summary="Организации в радиусе от точки",
-    description="Получить список организаций в заданном радиусе от указанной точки.",
+    description="Получить организации в заданном радиусе от указанной точки, "
+                "отсортированные по расстоянию. Следующая страница запрашивается "
+                "с after_distance и after_id из next_cursor.",
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad request"},
+    },
 )
-def get_organizations_in_radius(
+async def get_organizations_in_radius(
+    request: Request,
     latitude: float = Query(..., ge=-90, le=90, description="Широта центра"),
     longitude: float = Query(..., ge=-180, le=180, description="Долгота центра"),
     radius_km: float = Query(..., gt=0, le=1000, description="Радиус в километрах"),
-    db: Session = Depends(get_db),
-) -> list[OrganizationResponse]:
-    """Получить организации в радиусе от точки."""
-    service = OrganizationService(db)
-    return service.get_organizations_in_radius(latitude, longitude, radius_km)
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description="Размер страницы",
+    ),
+    after_distance: float | None = Query(
+        None, ge=0, description="Расстояние последней организации предыдущей страницы"
+    ),
+    after_id: int | None = Query(
+        None, description="ID последней организации предыдущей страницы"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
+    """Получить страницу организаций в радиусе от точки."""
+    async def compute() -> dict:
+        rows, next_cursor = await service.get_organizations_in_radius_page(
+            latitude, longitude, radius_km, limit, after_distance, after_id
+        )
+        return {
+            "items": _with_distance(rows),
+            "next_cursor": (
+                {"after_distance": next_cursor[0], "after_id": next_cursor[1]}
+                if next_cursor else None
+            ),
+        }
+
+    return await response_cache.respond(
+        request, OrganizationDistancePage, compute, [ORGANIZATIONS_TAG], etag=etag
+    )
+
+
+@router.get(
+    "/nearest",
+    response_model=list[OrganizationWithDistanceResponse],
+    summary="Ближайшие организации",
+    description="Получить k ближайших к точке организаций, отсортированных по расстоянию. "
+                "Можно ограничить поиск видом деятельности (с учетом дочерних).",
+    responses={
+        404: {"model": ErrorResponse, "description": "Activity not found"},
+    },
+)
+async def get_nearest_organizations(
+    request: Request,
+    latitude: float = Query(..., ge=-90, le=90, description="Широта точки"),
+    longitude: float = Query(..., ge=-180, le=180, description="Долгота точки"),
+    limit: int = Query(20, ge=1, le=100, description="Количество организаций"),
+    activity_id: int | None = Query(None, description="ID вида деятельности"),
+    include_children: bool = Query(
+        False,
+        description="Включить организации с дочерними деятельностями",
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
+    """Получить ближайшие организации с расстоянием до них."""
+    async def compute() -> list[dict]:
+        nearest = await service.get_nearest_organizations(
+            latitude, longitude, limit, activity_id, include_children
+        )
+        return _with_distance(nearest)
+
+    return await response_cache.respond(
+        request,
+        list[OrganizationWithDistanceResponse],
+        compute,
+        [ORGANIZATIONS_TAG],
+        etag=etag,
+    )
 
 
 @router.get(
     "/in-box",
-    response_model=list[OrganizationResponse],
+    response_model=OrganizationPage,
     summary="Организации в прямоугольной области",
     description="Получить список организаций в прямоугольной географической области.",
 )
-def get_organizations_in_bounding_box(
+async def get_organizations_in_bounding_box(
+    request: Request,
     min_lat: float = Query(..., ge=-90, le=90, description="Минимальная широта"),
     max_lat: float = Query(..., ge=-90, le=90, description="Максимальная широта"),
     min_lon: float = Query(..., ge=-180, le=180, description="Минимальная долгота"),
     max_lon: float = Query(..., ge=-180, le=180, description="Максимальная долгота"),
-    db: Session = Depends(get_db),
-) -> list[OrganizationResponse]:
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=settings.MAX_PAGE_SIZE,
+        description="Размер страницы",
+    ),
+    after_id: int | None = Query(
+        None, description="ID последней организации предыдущей страницы"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
     """Получить организации в прямоугольной области."""
-    service = OrganizationService(db)
-    return service.get_organizations_in_box(min_lat, max_lat, min_lon, max_lon)
+    async def compute() -> dict:
+        items, next_cursor = await service.get_organizations_in_box(
+            min_lat, max_lat, min_lon, max_lon, limit, after_id
+        )
+        return {"items": items, "next_cursor": next_cursor}
+
+    return await response_cache.respond(
+        request, OrganizationPage, compute, [ORGANIZATIONS_TAG], etag=etag
+    )
+
+
+@router.get(
+    "/clusters",
+    response_model=list[OrganizationClusterResponse],
+    summary="Кластеры организаций для карты",
+    description="Сгруппировать организации прямоугольной области в ячейки сетки, "
+                "размер которой зависит от уровня масштаба карты.",
+)
+async def get_organization_clusters(
+    request: Request,
+    min_lat: float = Query(..., ge=-90, le=90, description="Минимальная широта"),
+    max_lat: float = Query(..., ge=-90, le=90, description="Максимальная широта"),
+    min_lon: float = Query(..., ge=-180, le=180, description="Минимальная долгота"),
+    max_lon: float = Query(..., ge=-180, le=180, description="Максимальная долгота"),
+    zoom: int = Query(..., ge=0, le=22, description="Уровень масштаба карты"),
+    top_activities: int = Query(
+        0, ge=0, le=10, description="Сколько самых частых деятельностей вернуть"
+    ),
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
+    """Получить кластеры организаций в прямоугольной области."""
+    return await response_cache.respond(
+        request,
+        list[OrganizationClusterResponse],
+        lambda: service.get_organization_clusters(
+            min_lat, max_lat, min_lon, max_lon, zoom, top_activities
+        ),
+        [ORGANIZATIONS_TAG],
+        etag=etag,
+    )
+
+
+@router.get(
+    "/export",
+    summary="Выгрузка всех организаций",
+    description=(
+        "Потоковая выгрузка всех организаций в формате NDJSON (по объекту "
+        "OrganizationResponse на строку) или CSV. Данные читаются из БД "
+        "пачками, поэтому память сервера не зависит от размера справочника."
+    ),
+    response_model=None,
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}, "text/csv": {}}},
+    },
+)
+def export_organizations(
+    request: Request,
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Формат выгрузки: ndjson или csv"
+    ),
+    etag: str = Depends(organizations_etag),
+) -> Response:
+    """Выгрузить все организации."""
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return StreamingResponse(
+        _export_stream(export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="organizations.{export_format}"',
+            "ETag": etag,
+        },
+    )
 
 
 @router.get(
@@ -136,13 +588,20 @@ def get_organizations_in_bounding_box(
         404: {"model": ErrorResponse, "description": "Organization not found"},
     },
 )
-def get_organization(
+async def get_organization(
+    request: Request,
     organization_id: int,
-    db: Session = Depends(get_db),
-) -> OrganizationResponse:
+    etag: str = Depends(organizations_etag),
+    service: AsyncService = Depends(organization_service),
+) -> Response:
     """Получить организацию по ID."""
-    service = OrganizationService(db)
-    return service.get_organization(organization_id)
+    return await response_cache.respond(
+        request,
+        OrganizationResponse,
+        lambda: service.get_organization(organization_id),
+        [organization_tag(organization_id)],
+        etag=etag,
+    )
 
 
 @router.post(
@@ -155,13 +614,54 @@ def get_organization(
         400: {"model": ErrorResponse, "description": "Bad request"},
     },
 )
-def create_organization(
+async def create_organization(
     org_data: OrganizationCreate,
-    db: Session = Depends(get_db),
+    service: AsyncService = Depends(organization_service),
 ) -> OrganizationResponse:
     """Создать новую организацию."""
-    service = OrganizationService(db)
-    return service.create_organization(org_data)
+    return await service.create_organization(org_data)
+
+
+@router.post(
+    "/import",
+    response_model=BulkImportResult,
+    summary="Массовый импорт организаций",
+    description=(
+        "Принимает JSON-массив организаций или NDJSON (Content-Type: "
+        "application/x-ndjson) в формате создания организации. Строки "
+        "сохраняются пачками по BULK_IMPORT_CHUNK_SIZE, каждая пачка - "
+        "отдельная транзакция. Ошибочные строки пропускаются и перечисляются "
+        "в ответе с номерами строк."
+    ),
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad request"},
+    },
+)
+async def import_organizations(
+    request: Request,
+    service: AsyncService = Depends(organization_service),
+) -> BulkImportResult:
+    """Массовый импорт организаций."""
+    result = BulkImportResult()
+
+    async def flush(rows: list[tuple[int, Any]]) -> None:
+        # Валидация pydantic - в пуле потоков, чтобы не занимать цикл событий
+        items, errors = await service.validate_import_rows(rows)
+        created, errors = await service.save_import_items(items, errors)
+        result.created += created
+        result.failed += len(errors)
+        room = settings.BULK_IMPORT_MAX_ERRORS - len(result.errors)
+        result.errors.extend(errors[:max(room, 0)])
+
+    rows = []
+    async for row in _import_rows(request):
+        rows.append(row)
+        if len(rows) >= settings.BULK_IMPORT_CHUNK_SIZE:
+            await flush(rows)
+            rows = []
+    if rows:
+        await flush(rows)
+    return result
 
 
 @router.put(
@@ -173,11 +673,10 @@ def create_organization(
         404: {"model": ErrorResponse, "description": "Organization not found"},
     },
 )
-def update_organization(
+async def update_organization(
     organization_id: int,
     org_data: OrganizationUpdate,
-    db: Session = Depends(get_db),
+    service: AsyncService = Depends(organization_service),
 ) -> OrganizationResponse:
     """Обновить существующую организацию."""
-    service = OrganizationService(db)
-    return service.update_organization(organization_id, org_data)
+    return await service.update_organization(organization_id, org_data)
@@ -2,7 +2,11 @@ from app.schemas.schemas import (
     BuildingBase, BuildingCreate, BuildingResponse,
     ActivityBase, ActivityCreate, ActivityResponse, ActivityWithChildren,
     OrganizationBase, OrganizationCreate, OrganizationUpdate,
-    OrganizationResponse, OrganizationListResponse,
+    OrganizationResponse, OrganizationPage, OrganizationSuggestion,
+    OrganizationWithDistanceResponse,
+    DistanceCursor, OrganizationDistancePage,
+    OrganizationClusterResponse, OrganizationListResponse,
+    BulkImportError, BulkImportResult, CacheStatsResponse,
     GeoRadiusQuery, GeoBoundingBoxQuery,
     ErrorResponse, ValidationErrorResponse,
 )
@@ -19,7 +23,16 @@ __all__ = [
     "OrganizationCreate",
     "OrganizationUpdate",
     "OrganizationResponse",
+    "OrganizationPage",
+    "OrganizationSuggestion",
+    "OrganizationWithDistanceResponse",
+    "DistanceCursor",
+    "OrganizationDistancePage",
+    "OrganizationClusterResponse",
     "OrganizationListResponse",
+    "BulkImportError",
+    "BulkImportResult",
+    "CacheStatsResponse",
     "GeoRadiusQuery",
     "GeoBoundingBoxQuery",
     "ErrorResponse",
@@ -93,6 +93,77 @@ class OrganizationResponse(BaseModel):
         from_attributes = True
 
 
+class OrganizationPage(BaseModel):
+    """Страница организаций с keyset-пагинацией по ID."""
+    items: list[OrganizationResponse]
+    next_cursor: int | None = Field(
+        None,
+        description="after_id для следующей страницы (null - страниц больше нет)",
+    )
+
+
+class OrganizationSuggestion(BaseModel):
+    """Подсказка автодополнения по названию организации."""
+    id: int
+    name: str
+
+
+class OrganizationWithDistanceResponse(OrganizationResponse):
+    """Схема ответа для организации с расстоянием до точки поиска."""
+    distance_km: float
+
+
+class DistanceCursor(BaseModel):
+    """Курсор страницы, отсортированной по расстоянию."""
+    after_distance: float = Field(..., description="Расстояние последней организации, км")
+    after_id: int = Field(..., description="ID последней организации")
+
+
+class OrganizationDistancePage(BaseModel):
+    """Страница организаций, отсортированных по расстоянию."""
+    items: list[OrganizationWithDistanceResponse]
+    next_cursor: DistanceCursor | None = Field(
+        None, description="Курсор следующей страницы (null - страниц больше нет)"
+    )
+
+
+class OrganizationClusterResponse(BaseModel):
+    """Схема кластера организаций на карте."""
+    latitude: float = Field(..., description="Широта центроида кластера")
+    longitude: float = Field(..., description="Долгота центроида кластера")
+    count: int = Field(..., description="Количество организаций")
+    top_activity_ids: list[int] = Field(
+        default=[], description="Самые частые виды деятельности в кластере"
+    )
+
+
+class BulkImportError(BaseModel):
+    """Ошибка строки массового импорта."""
+    line: int = Field(..., description="Номер строки NDJSON или элемента массива (с 1)")
+    errors: list[dict] = Field(..., description="Ошибки в формате ошибок валидации")
+
+
+class BulkImportResult(BaseModel):
+    """Итог массового импорта организаций."""
+    created: int = Field(0, description="Создано организаций")
+    failed: int = Field(0, description="Строк с ошибками")
+    errors: list[BulkImportError] = Field(
+        default=[], description="Ошибки строк (не больше BULK_IMPORT_MAX_ERRORS)"
+    )
+
+
+class CacheStatsResponse(BaseModel):
+    """Статистика кэша ответов."""
+    enabled: bool = Field(..., description="Кэш включен")
+    hits: int = Field(0, description="Попаданий")
+    misses: int = Field(0, description="Промахов")
+    hit_ratio: float = Field(0.0, description="Доля попаданий")
+    invalidations: int = Field(0, description="Удалено записей инвалидацией")
+    entries: int | None = Field(None, description="Записей в хранилище")
+    size_bytes: int | None = Field(None, description="Размер записей, байт")
+    evictions: int | None = Field(None, description="Вытеснено записей по лимиту памяти")
+
+
 class OrganizationListResponse(BaseModel):
     """Схема для списка организаций."""
     id: int
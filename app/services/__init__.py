@@ -1,6 +1,16 @@
 """
 Модуль инициализации сервисов.
 """
+from app.services.activity_service import ActivityService
+from app.services.async_service import AsyncService, cpu_bound, get_async_service
+from app.services.etag import get_data_etag
 from app.services.organization_service import OrganizationService
 
-__all__ = ["OrganizationService"]
+__all__ = [
+    "ActivityService",
+    "AsyncService",
+    "cpu_bound",
+    "get_async_service",
+    "get_data_etag",
+    "OrganizationService",
+]
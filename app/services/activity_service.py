@@ -0,0 +1,102 @@
+import json
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.indexes import ActivityNode, ActivityTreeCache, activity_tree, build_activity_tree
+from app.models import Activity
+from app.repositories import ActivityRepository, VersionRepository
+from app.repositories.version_repository import ACTIVITIES
+from app.schemas import ActivityCreate
+
+settings = get_settings()
+
+
+class ActivityService:
+    """
+    Сервис бизнес-логики для деятельностей.
+    Чтение обслуживается из кэша дерева в памяти, если он включен.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.activity_repo = ActivityRepository(db)
+
+    def _tree(self) -> ActivityTreeCache | None:
+        """
+        Актуальный кэш дерева или None, если кэш выключен.
+        Версия сверяется с БД не чаще ACTIVITY_CACHE_CHECK_INTERVAL.
+        """
+        if not settings.ACTIVITY_CACHE_ENABLED:
+            return None
+        if not activity_tree.is_ready:
+            self.activity_repo.load_tree_cache()
+        elif activity_tree.needs_check():
+            if VersionRepository(self.db).get(ACTIVITIES) != activity_tree.version:
+                self.activity_repo.load_tree_cache()
+            else:
+                activity_tree.mark_checked()
+        return activity_tree
+
+    def get_all(self) -> list[Activity] | list[ActivityNode]:
+        """Получить все деятельности."""
+        tree = self._tree()
+        if tree:
+            return tree.get_all()
+        return self.activity_repo.get_all()
+
+    def get_root_activities(self) -> list[Activity] | list[ActivityNode]:
+        """Получить корневые деятельности."""
+        tree = self._tree()
+        if tree:
+            return tree.get_roots()
+        return self.activity_repo.get_root_activities()
+
+    def get_tree_json(self) -> bytes:
+        """
+        Полное вложенное дерево деятельностей в виде готового JSON.
+        Без кэша дерево собирается из одной плоской выборки.
+        """
+        tree = self._tree()
+        if tree:
+            return tree.nested_json()
+        nested = build_activity_tree(self.activity_repo.get_all())
+        return json.dumps(nested, ensure_ascii=False).encode("utf-8")
+
+    def get_activity(self, activity_id: int) -> Activity | ActivityNode:
+        """Получить деятельность по ID с проверкой существования."""
+        tree = self._tree()
+        activity = tree.get(activity_id) if tree else self.activity_repo.get_by_id(activity_id)
+        if not activity:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Activity with id {activity_id} not found",
+            )
+        return activity
+
+    def get_subtree_ids(self, activity_id: int) -> list[int]:
+        """Получить ID деятельностей поддерева (включая корневую)."""
+        tree = self._tree()
+        if tree:
+            return tree.subtree_ids(activity_id)
+        return self.activity_repo.get_subtree_ids(activity_id)
+
+    def create_activity(self, activity_data: ActivityCreate) -> Activity:
+        """
+        Создать новую деятельность с валидацией.
+        Уровень вычисляется автоматически на основе родителя.
+        """
+        if activity_data.parent_id:
+            parent = self.activity_repo.get_by_id(activity_data.parent_id)
+            if not parent:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Parent activity with id {activity_data.parent_id} not found",
+                )
+            # Проверка максимальной глубины (3 уровня)
+            if parent.level >= 3:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Maximum nesting level (3) exceeded. Cannot create 4th level activity.",
+                )
+        
+        return self.activity_repo.create(activity_data)
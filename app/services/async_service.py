@@ -0,0 +1,68 @@
+from typing import Any, Awaitable, Callable, TypeVar
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core.database import get_async_db, get_db
+
+settings = get_settings()
+
+F = TypeVar("F", bound=Callable)
+
+
+def cpu_bound(method: F) -> F:
+    """
+    Пометить метод сервиса как вычислительный: AsyncService выполняет его
+    в пуле потоков и при ASYNC_DB. Такой метод не должен обращаться к сессии.
+    """
+    method.cpu_bound = True
+    return method
+
+
+class AsyncService:
+    """
+    Асинхронная обертка синхронного сервиса (или репозитория) для async-роутов.
+
+    Любой метод обертки - корутина, выполняющая одноименный метод сервиса:
+    - с AsyncSession (ASYNC_DB) - через run_sync: код сервиса работает
+      в greenlet, а ожидание драйвера asyncpg/aiosqlite отдается циклу
+      событий, поток не занимается;
+    - с обычной Session - в пуле потоков, как sync-роуты.
+    Поэтому у репозиториев и сервисов одна реализация для обоих режимов.
+
+    Ограничение ASYNC_DB: код внутри run_sync между обращениями к БД
+    выполняется в потоке цикла событий и задерживает остальные запросы.
+    Долгие вычисления без БД выносятся в методы с @cpu_bound - они всегда
+    выполняются в пуле потоков.
+    """
+
+    def __init__(self, service: Any, async_session: AsyncSession | None = None):
+        self._service = service
+        self._async_session = async_session
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        method = getattr(self._service, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            if self._async_session is not None and not getattr(method, "cpu_bound", False):
+                return await self._async_session.run_sync(
+                    lambda _: method(*args, **kwargs)
+                )
+            return await run_in_threadpool(method, *args, **kwargs)
+
+        return call
+
+
+def get_async_service(service_cls: type) -> Callable:
+    """
+    Зависимость FastAPI: AsyncService для service_cls (принимает сессию
+    в конструкторе) с сессией запроса. Режим выбирается настройкой ASYNC_DB.
+    """
+    if settings.ASYNC_DB:
+        def dependency(db: AsyncSession = Depends(get_async_db)) -> AsyncService:
+            return AsyncService(service_cls(db.sync_session), db)
+    else:
+        def dependency(db: Session = Depends(get_db)) -> AsyncService:
+            return AsyncService(service_cls(db))
+    return dependency
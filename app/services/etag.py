@@ -0,0 +1,20 @@
+from typing import Callable
+from fastapi import Depends
+from app.cache import data_etag
+from app.repositories import VersionRepository
+from app.services.async_service import AsyncService, get_async_service
+
+# Счетчики версий с сессией запроса (синхронной или асинхронной, см. ASYNC_DB)
+version_repository = get_async_service(VersionRepository)
+
+
+def get_data_etag(*names: str) -> Callable:
+    """
+    Зависимость FastAPI: ETag по текущим версиям счетчиков names.
+    Версии читаются раньше данных ответа, поэтому ETag может оказаться
+    старше ответа, но не новее: в худшем случае клиент лишний раз
+    получит полный ответ вместо 304.
+    """
+    async def dependency(versions: AsyncService = Depends(version_repository)) -> str:
+        return data_etag(await versions.get_many(names))
+    return dependency
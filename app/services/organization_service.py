@@ -1,12 +1,98 @@
+import csv
+import heapq
+import io
+import json
+from typing import Any, Callable, Iterator, NamedTuple
 from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import and_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.repositories import (
     OrganizationRepository,
+    OrganizationReadRepository,
+    OrganizationFragmentRepository,
     BuildingRepository,
     ActivityRepository,
 )
-from app.schemas import OrganizationCreate, OrganizationUpdate
-from app.models import Organization
+from app.repositories.organization_queries import (
+    activity_matches,
+    area_matches,
+    building_matches,
+    by_activity_ids,
+    by_activity_subtree,
+    by_building,
+    by_building_ids,
+    in_area,
+)
+from app.core.config import get_settings
+from app.core.geo import MAX_DISTANCE_KM
+from app.core.phones import MAX_PHONE_DIGITS, normalize_phone
+from app.core.serialization import JSONFragment
+from app.indexes import (
+    CardinalityStats,
+    building_index,
+    cardinality_stats,
+    organization_bitmaps,
+    organization_name_index,
+)
+from app.indexes.bitmap import intersection, page
+from app.schemas import BulkImportError, OrganizationCreate, OrganizationUpdate
+from app.models import Building, Organization
+from app.services.activity_service import ActivityService
+from app.services.async_service import cpu_bound
+
+settings = get_settings()
+
+# Во сколько раз расширяется радиус на каждом шаге поиска ближайших
+NEAREST_RADIUS_GROWTH = 4
+
+# Число ячеек кластеризации на ширину тайла карты (256 px -> ячейка 64 px)
+CLUSTER_CELLS_PER_TILE = 4
+# Максимум ячеек сетки по каждой оси, ограничивает размер ответа
+CLUSTER_MAX_GRID = 64
+
+# Колонки CSV-выгрузки; списки телефонов и деятельностей - через ";"
+EXPORT_CSV_COLUMNS = (
+    "id",
+    "name",
+    "phone_numbers",
+    "building_id",
+    "address",
+    "latitude",
+    "longitude",
+    "activity_ids",
+)
+
+
+def _csv_text(rows) -> str:
+    """Строки CSV одним текстом."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+# Страница организаций и курсор следующей страницы (ID последней организации).
+# Организации - ORM-объекты или словари, в зависимости от ORGANIZATION_READ_PATH,
+# либо готовые JSON-фрагменты (FRAGMENT_CACHE_ENABLED)
+Page = tuple[list[Organization] | list[dict], int | None]
+
+
+class QueryPredicate(NamedTuple):
+    """
+    Условие комбинированного поиска с оценкой числа организаций.
+    condition - форма для выбора строк (по ней идет выборка, если условие
+    самое селективное), check - форма для проверки уже выбранных строк.
+    """
+
+    condition: Any
+    check: Any
+    # None - оценки нет, условие проверяется последним
+    estimate: float | None = None
+    # Оценка - точное число (посчитано запросом), а не кэшированная статистика
+    exact: bool = False
+    # Множество ID из bitmap-индекса, если условие им обслуживается
+    bitmap: Any = None
 
 
 class OrganizationService:
@@ -15,12 +101,49 @@ class OrganizationService:
     def __init__(self, db: Session):
         self.db = db
         self.org_repo = OrganizationRepository(db)
+        # Выборки для чтения: фрагменты из кэша, Core-запросы без ORM
+        # или ORM-репозиторий
+        if settings.FRAGMENT_CACHE_ENABLED:
+            self.reader = OrganizationFragmentRepository(db)
+        elif settings.ORGANIZATION_READ_PATH == "core":
+            self.reader = OrganizationReadRepository(db)
+        else:
+            self.reader = self.org_repo
         self.building_repo = BuildingRepository(db)
         self.activity_repo = ActivityRepository(db)
+        self.activity_service = ActivityService(db)
+
+    @staticmethod
+    def _id_of(organization: Organization | dict | JSONFragment) -> int:
+        """ID организации из ORM-объекта, словаря или фрагмента."""
+        if isinstance(organization, dict):
+            return organization["id"]
+        return organization.id
+
+    def _to_page(self, organizations: list, limit: int) -> Page:
+        """
+        Сформировать страницу из выборки размером до limit + 1.
+        Лишняя запись означает, что есть следующая страница.
+        """
+        if len(organizations) <= limit:
+            return organizations, None
+        organizations = organizations[:limit]
+        return organizations, self._id_of(organizations[-1])
+
+    def _bitmap_page(self, bitmap, limit: int, after_id: int | None) -> Page:
+        """Страница организаций из множества ID bitmap-индекса."""
+        org_ids = page(bitmap, limit + 1, after_id)
+        return self._to_page(self.reader.get_by_ids(org_ids), limit)
+
+    def get_organizations(
+        self, limit: int = settings.DEFAULT_PAGE_SIZE, after_id: int | None = None
+    ) -> Page:
+        """Получить страницу всех организаций."""
+        return self._to_page(self.reader.get_all(limit + 1, after_id), limit)
 
-    def get_organization(self, org_id: int) -> Organization:
+    def get_organization(self, org_id: int) -> Organization | dict:
         """Получить организацию по ID с проверкой существования."""
-        organization = self.org_repo.get_by_id(org_id)
+        organization = self.reader.get_by_id(org_id)
         if not organization:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -28,7 +151,21 @@ class OrganizationService:
             )
         return organization
 
-    def get_organizations_by_building(self, building_id: int) -> list[Organization]:
+    def get_organizations_by_phone(self, phone: str) -> list[Organization] | list[dict]:
+        """Получить организации по номеру телефона в любом формате."""
+        if not normalize_phone(phone):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Phone number must contain 1 to {MAX_PHONE_DIGITS} digits",
+            )
+        return self.reader.get_by_phone(phone)
+
+    def get_organizations_by_building(
+        self,
+        building_id: int,
+        limit: int = settings.DEFAULT_PAGE_SIZE,
+        after_id: int | None = None,
+    ) -> Page:
         """Получить организации по ID здания с проверкой существования здания."""
         building = self.building_repo.get_by_id(building_id)
         if not building:
@@ -36,58 +173,440 @@ class OrganizationService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Building with id {building_id} not found",
             )
-        return self.org_repo.get_by_building_id(building_id)
+        if organization_bitmaps.is_ready:
+            return self._bitmap_page(
+                organization_bitmaps.by_buildings([building_id]), limit, after_id
+            )
+        return self._to_page(
+            self.reader.get_by_building_id(building_id, limit + 1, after_id), limit
+        )
 
     def get_organizations_by_activity(
-        self, activity_id: int, include_children: bool = False
-    ) -> list[Organization]:
+        self,
+        activity_id: int,
+        include_children: bool = False,
+        limit: int = settings.DEFAULT_PAGE_SIZE,
+        after_id: int | None = None,
+    ) -> Page:
         """
         Получить организации по виду деятельности.
-        
+
         Args:
             activity_id: ID деятельности
             include_children: Если True, включает организации с дочерними деятельностями
+            limit: Размер страницы
+            after_id: ID последней организации предыдущей страницы
         """
-        activity = self.activity_repo.get_by_id(activity_id)
-        if not activity:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Activity with id {activity_id} not found",
+        # Проверка существования обслуживается кэшем дерева
+        self.activity_service.get_activity(activity_id)
+
+        if organization_bitmaps.is_ready:
+            activity_ids = [activity_id]
+            if include_children:
+                activity_ids = self.activity_service.get_subtree_ids(activity_id)
+            return self._bitmap_page(
+                organization_bitmaps.by_activities(activity_ids), limit, after_id
             )
-        
         if include_children:
-            # Получаем все ID деятельностей в поддереве
-            activity_ids = self.activity_repo.get_subtree_ids(activity_id)
-            return self.org_repo.get_by_activity_ids(activity_ids)
-        
-        return self.org_repo.get_by_activity_id(activity_id)
+            # Поддерево раскрывается в том же запросе через closure table
+            organizations = self.reader.get_by_activity_subtree(activity_id, limit + 1, after_id)
+        else:
+            organizations = self.reader.get_by_activity_id(activity_id, limit + 1, after_id)
+        return self._to_page(organizations, limit)
 
     def get_organizations_in_radius(
         self, lat: float, lon: float, radius_km: float
-    ) -> list[Organization]:
-        """Получить организации в заданном радиусе от точки."""
-        buildings = self.building_repo.get_in_radius(lat, lon, radius_km)
-        building_ids = [b.id for b in buildings]
-        return self.org_repo.get_by_building_ids(building_ids)
+    ) -> list[Organization] | list[dict]:
+        """
+        Получить организации в заданном радиусе от точки.
+        Если геоиндекс построен и нашел немного зданий, в БД уходит только
+        выборка организаций; иначе поиск целиком выполняется одним SQL-запросом.
+        """
+        if building_index.is_ready:
+            building_ids = building_index.query_radius(lat, lon, radius_km)
+            if len(building_ids) <= settings.SPATIAL_INDEX_MAX_IDS:
+                return self.reader.get_by_building_ids(building_ids)
+        return self.reader.get_in_radius(lat, lon, radius_km)
+
+    def get_organizations_in_radius_page(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        limit: int,
+        after_distance: float | None = None,
+        after_id: int | None = None,
+    ) -> tuple[list[tuple[Organization | dict, float]], tuple[float, int] | None]:
+        """
+        Страница организаций в радиусе от точки, отсортированная по расстоянию.
+
+        Пагинация по курсору (расстояние, ID): каждая страница - один запрос
+        с LIMIT, поэтому стоимость и память не растут с номером страницы.
+        Если геоиндекс построен и нашел немного зданий, расстояние в запросе
+        считается только для них.
+        Возвращает организации с расстояниями и курсор следующей страницы.
+        """
+        if (after_distance is None) != (after_id is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="after_distance and after_id must be provided together",
+            )
+        after = None
+        if after_distance is not None:
+            after = (after_distance, after_id)
+
+        building_ids = None
+        if building_index.is_ready:
+            building_ids = building_index.query_radius(lat, lon, radius_km)
+            if not building_ids:
+                return [], None
+            if len(building_ids) > settings.SPATIAL_INDEX_MAX_IDS:
+                building_ids = None
+
+        rows = self.reader.get_nearest(
+            lat, lon, limit + 1, radius_km, after=after, building_ids=building_ids
+        )
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last_organization, last_distance = rows[-1]
+        return rows, (last_distance, self._id_of(last_organization))
 
     def get_organizations_in_box(
-        self, min_lat: float, max_lat: float, min_lon: float, max_lon: float
-    ) -> list[Organization]:
-        """Получить организации в прямоугольной области."""
-        buildings = self.building_repo.get_in_bounding_box(
-            min_lat, max_lat, min_lon, max_lon
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        limit: int = settings.DEFAULT_PAGE_SIZE,
+        after_id: int | None = None,
+    ) -> Page:
+        """Получить страницу организаций в прямоугольной области."""
+        if building_index.is_ready:
+            building_ids = building_index.query_box(min_lat, max_lat, min_lon, max_lon)
+            if len(building_ids) <= settings.SPATIAL_INDEX_MAX_IDS:
+                if organization_bitmaps.is_ready:
+                    return self._bitmap_page(
+                        organization_bitmaps.by_buildings(building_ids), limit, after_id
+                    )
+                return self._to_page(
+                    self.reader.get_by_building_ids(building_ids, limit + 1, after_id),
+                    limit,
+                )
+        return self._to_page(
+            self.reader.get_in_bounding_box(
+                min_lat, max_lat, min_lon, max_lon, limit + 1, after_id
+            ),
+            limit,
         )
-        building_ids = [b.id for b in buildings]
-        return self.org_repo.get_by_building_ids(building_ids)
 
-    def search_by_name(self, name: str) -> list[Organization]:
-        """Поиск организаций по названию."""
+    def query_organizations(
+        self,
+        name: str | None = None,
+        activity_id: int | None = None,
+        include_children: bool = True,
+        building_id: int | None = None,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        radius_km: float | None = None,
+        min_lat: float | None = None,
+        max_lat: float | None = None,
+        min_lon: float | None = None,
+        max_lon: float | None = None,
+        limit: int = settings.DEFAULT_PAGE_SIZE,
+        after_id: int | None = None,
+    ) -> Page:
+        """
+        Комбинированный поиск: все заданные фильтры объединяются по И.
+
+        Условия упорядочиваются по оценке числа организаций (самое селективное
+        первым). Если первое условие дает немного организаций, их ID выбираются
+        отдельным запросом, и остальные условия проверяются только по ним.
+        Условия, которые обслуживает bitmap-индекс, пересекаются в памяти.
+        Связанные сущности загружаются только для итоговой страницы.
+        """
+        radius = (latitude, longitude, radius_km)
+        if any(value is not None for value in radius) and None in radius:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="latitude, longitude and radius_km must be provided together",
+            )
+        box = (min_lat, max_lat, min_lon, max_lon)
+        if any(value is not None for value in box) and None in box:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="min_lat, max_lat, min_lon and max_lon must be provided together",
+            )
+        if box[0] is not None and (min_lat > max_lat or min_lon > max_lon):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="min_lat must be <= max_lat and min_lon must be <= max_lon",
+            )
+        if name is not None and len(name) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query must be at least 2 characters long",
+            )
+
+        predicates = []
+        if building_id is not None:
+            if not self.building_repo.get_by_id(building_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Building with id {building_id} not found",
+                )
+            condition = by_building(building_id)
+            if organization_bitmaps.is_ready:
+                predicates.append(
+                    self._with_bitmap(
+                        QueryPredicate(condition, condition),
+                        organization_bitmaps.by_buildings([building_id]),
+                    )
+                )
+            else:
+                predicates.append(
+                    QueryPredicate(condition, condition, self.org_repo.count(condition), exact=True)
+                )
+        if activity_id is not None:
+            self.activity_service.get_activity(activity_id)
+            predicate = QueryPredicate(
+                by_activity_subtree(activity_id)
+                if include_children
+                else by_activity_ids([activity_id]),
+                activity_matches(activity_id, include_children),
+            )
+            if organization_bitmaps.is_ready:
+                activity_ids = [activity_id]
+                if include_children:
+                    activity_ids = self.activity_service.get_subtree_ids(activity_id)
+                predicates.append(
+                    self._with_bitmap(predicate, organization_bitmaps.by_activities(activity_ids))
+                )
+            else:
+                predicates.append(
+                    predicate._replace(
+                        estimate=self._stats().activity_estimate(activity_id, include_children)
+                    )
+                )
+        if radius_km is not None:
+            condition, check = self.reader.radius_conditions(latitude, longitude, radius_km)
+            predicates.append(
+                self._area_predicate(
+                    building_index.query_radius(latitude, longitude, radius_km)
+                    if building_index.is_ready
+                    else None,
+                    condition,
+                    check,
+                    lambda: self._stats().radius_estimate(latitude, longitude, radius_km),
+                )
+            )
+        if min_lat is not None:
+            predicates.append(
+                self._area_predicate(
+                    building_index.query_box(min_lat, max_lat, min_lon, max_lon)
+                    if building_index.is_ready
+                    else None,
+                    in_area(min_lat, max_lat, min_lon, max_lon),
+                    area_matches(min_lat, max_lat, min_lon, max_lon),
+                    lambda: self._stats().area_estimate(min_lat, max_lat, min_lon, max_lon),
+                )
+            )
+        if name is not None:
+            condition = self.reader.name_condition(name)
+            predicates.append(QueryPredicate(condition, condition))
+
+        if not predicates:
+            return self.get_organizations(limit, after_id)
+
+        bitmaps = [predicate.bitmap for predicate in predicates if predicate.bitmap is not None]
+        if bitmaps:
+            matched = intersection(bitmaps)
+            rest = [predicate for predicate in predicates if predicate.bitmap is None]
+            if not rest or not matched:
+                return self._bitmap_page(matched, limit, after_id)
+            org_ids = page(matched, settings.QUERY_MATERIALIZE_MAX_IDS + 1, after_id)
+            if len(org_ids) <= settings.QUERY_MATERIALIZE_MAX_IDS:
+                conditions = [Organization.id.in_(org_ids)]
+                conditions += [predicate.check for predicate in rest]
+                return self._to_page(
+                    self.reader.get_page(and_(*conditions), limit + 1, after_id), limit
+                )
+            # Пересечение слишком велико для списка ID: план строится в БД,
+            # но размеры множеств из индекса служат точными оценками
+        predicates.sort(key=lambda predicate: (predicate.estimate is None, predicate.estimate or 0))
+        driving, others = predicates[0], predicates[1:]
+        if driving.exact and driving.estimate == 0:
+            return [], None
+        # Выборка идет по самому селективному условию, остальные только
+        # проверяются на найденных строках
+        conditions = [driving.condition] + [predicate.check for predicate in others]
+        if (
+            others
+            and driving.estimate is not None
+            and driving.estimate <= settings.QUERY_MATERIALIZE_MAX_IDS
+        ):
+            org_ids = self.org_repo.get_ids(
+                driving.condition, settings.QUERY_MATERIALIZE_MAX_IDS + 1, after_id
+            )
+            if not org_ids:
+                return [], None
+            # Оценка могла устареть: материализуем, только если порог соблюден
+            if len(org_ids) <= settings.QUERY_MATERIALIZE_MAX_IDS:
+                conditions[0] = Organization.id.in_(org_ids)
+        return self._to_page(self.reader.get_page(and_(*conditions), limit + 1, after_id), limit)
+
+    def _stats(self) -> CardinalityStats:
+        """Оценки числа организаций; пересчитываются раз в CARDINALITY_STATS_TTL."""
+        cardinality_stats.refresh(self.org_repo.load_cardinality_stats)
+        return cardinality_stats
+
+    @staticmethod
+    def _with_bitmap(predicate: QueryPredicate, bitmap) -> QueryPredicate:
+        """Условие, обслуживаемое bitmap-индексом: его размер - точная оценка."""
+        return predicate._replace(bitmap=bitmap, estimate=len(bitmap), exact=True)
+
+    @classmethod
+    def _area_predicate(
+        cls, building_ids: list[int] | None, condition, check, estimate: Callable[[], float]
+    ) -> QueryPredicate:
+        """
+        Географическое условие. Если геоиндекс нашел не больше
+        SPATIAL_INDEX_MAX_IDS зданий, условие строится по их ID (или по
+        bitmap-индексу), а пустой результат индекса точен; иначе - SQL-условие
+        с оценкой. Оценка вычисляется, только если ее не дает bitmap-индекс.
+        """
+        if building_ids is None or len(building_ids) > settings.SPATIAL_INDEX_MAX_IDS:
+            return QueryPredicate(condition, check, estimate())
+        if organization_bitmaps.is_ready:
+            return cls._with_bitmap(
+                QueryPredicate(condition, check),
+                organization_bitmaps.by_buildings(building_ids),
+            )
+        return QueryPredicate(
+            by_building_ids(building_ids),
+            building_matches(Building.id.in_(building_ids)),
+            estimate() if building_ids else 0,
+            exact=not building_ids,
+        )
+
+    def get_nearest_organizations(
+        self,
+        lat: float,
+        lon: float,
+        limit: int,
+        activity_id: int | None = None,
+        include_children: bool = False,
+    ) -> list[tuple[Organization | dict, float]]:
+        """
+        Получить limit ближайших к точке организаций с расстоянием до них.
+
+        Радиус поиска расширяется кольцами, пока не наберется limit организаций,
+        поэтому стоимость запроса зависит от limit, а не от плотности района.
+
+        Args:
+            activity_id: Фильтр по виду деятельности
+            include_children: Учитывать дочерние деятельности
+        """
+        activity_ids = None
+        if activity_id is not None:
+            self.activity_service.get_activity(activity_id)
+            if include_children:
+                activity_ids = self.activity_service.get_subtree_ids(activity_id)
+            else:
+                activity_ids = [activity_id]
+
+        radius_km = settings.NEAREST_INITIAL_RADIUS_KM
+        while True:
+            nearest = self.reader.get_nearest(lat, lon, limit, radius_km, activity_ids)
+            # Все организации за пределами радиуса дальше найденных
+            if len(nearest) >= limit or radius_km >= MAX_DISTANCE_KM:
+                return nearest
+            radius_km = min(radius_km * NEAREST_RADIUS_GROWTH, MAX_DISTANCE_KM)
+
+    def get_organization_clusters(
+        self,
+        min_lat: float,
+        max_lat: float,
+        min_lon: float,
+        max_lon: float,
+        zoom: int,
+        top_activities: int = 0,
+    ) -> list[dict]:
+        """
+        Сгруппировать организации области в кластеры для карты.
+
+        Размер ячейки определяется уровнем zoom, но сетка не превышает
+        CLUSTER_MAX_GRID ячеек по каждой оси, поэтому размер ответа ограничен
+        независимо от плотности района.
+
+        Args:
+            zoom: Уровень масштаба карты (0 - весь мир)
+            top_activities: Сколько самых частых деятельностей вернуть для кластера
+        """
+        cell_size = max(
+            360.0 / (2**zoom * CLUSTER_CELLS_PER_TILE),
+            (max_lat - min_lat) / CLUSTER_MAX_GRID,
+            (max_lon - min_lon) / CLUSTER_MAX_GRID,
+        )
+        clusters = self.org_repo.get_clusters_in_box(min_lat, max_lat, min_lon, max_lon, cell_size)
+
+        top_by_cell: dict[tuple[int, int], list[int]] = {}
+        if top_activities and clusters:
+            counts: dict[tuple[int, int], list[tuple[int, int]]] = {}
+            for row, col, activity_id, count in self.org_repo.get_cluster_activity_counts(
+                min_lat, max_lat, min_lon, max_lon, cell_size
+            ):
+                counts.setdefault((row, col), []).append((count, -activity_id))
+            for cell, activity_counts in counts.items():
+                top_by_cell[cell] = [
+                    -negative_id
+                    for _, negative_id in heapq.nlargest(top_activities, activity_counts)
+                ]
+
+        return [
+            {
+                "latitude": cluster["latitude"],
+                "longitude": cluster["longitude"],
+                "count": cluster["count"],
+                "top_activity_ids": top_by_cell.get((cluster["row"], cluster["col"]), []),
+            }
+            for cluster in clusters
+        ]
+
+    def search_by_name(
+        self,
+        name: str,
+        limit: int = settings.DEFAULT_PAGE_SIZE,
+        after_id: int | None = None,
+        ranked: bool = False,
+    ) -> Page:
+        """
+        Поиск организаций по названию.
+        По умолчанию - страницы в порядке ID; ranked - limit самых
+        релевантных совпадений одной страницей.
+        """
         if len(name) < 2:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Search query must be at least 2 characters long",
             )
-        return self.org_repo.search_by_name(name)
+        if ranked:
+            if after_id is not None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="after_id is not supported for ranked search",
+                )
+            return self.reader.search_ranked(name, limit), None
+        return self._to_page(self.reader.search_by_name(name, limit + 1, after_id), limit)
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[int, str]]:
+        """
+        Автодополнение: до limit пар (id, название) по префиксу.
+        Обслуживается индексом в памяти, без него - запросом к БД.
+        """
+        if organization_name_index.is_ready:
+            return organization_name_index.suggest(prefix, limit)
+        return self.org_repo.suggest_by_prefix(prefix, limit)
 
     def create_organization(self, org_data: OrganizationCreate) -> Organization:
         """Создать новую организацию с валидацией."""
@@ -98,7 +617,7 @@ class OrganizationService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Building with id {org_data.building_id} not found",
             )
-        
+
         # Проверяем существование деятельностей
         activities = []
         if org_data.activity_ids:
@@ -108,12 +627,136 @@ class OrganizationService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Some activity IDs are invalid",
                 )
-        
+
         return self.org_repo.create(org_data, activities)
 
-    def update_organization(
-        self, org_id: int, org_data: OrganizationUpdate
-    ) -> Organization:
+    def export_organizations(self, export_format: str) -> Iterator[str]:
+        """
+        Выгрузка всех организаций частями текста в формате ndjson или csv.
+        Читает БД пачками по EXPORT_CHUNK_SIZE, одна пачка - одна часть.
+        """
+        reader = OrganizationReadRepository(self.db)
+        if export_format == "csv":
+            yield _csv_text([EXPORT_CSV_COLUMNS])
+        for organizations in reader.iter_chunks(settings.EXPORT_CHUNK_SIZE):
+            if export_format == "csv":
+                yield _csv_text(
+                    (
+                        organization["id"],
+                        organization["name"],
+                        ";".join(organization["phone_numbers"]),
+                        organization["building"]["id"],
+                        organization["building"]["address"],
+                        organization["building"]["latitude"],
+                        organization["building"]["longitude"],
+                        ";".join(str(activity["id"]) for activity in organization["activities"]),
+                    )
+                    for organization in organizations
+                )
+            else:
+                yield "".join(
+                    json.dumps(organization, ensure_ascii=False) + "\n"
+                    for organization in organizations
+                )
+
+    def import_organizations(
+        self, rows: list[tuple[int, Any]]
+    ) -> tuple[int, list[BulkImportError]]:
+        """
+        Импортировать пачку организаций одной транзакцией.
+
+        Строки - пары (номер строки, данные): байты строки NDJSON или
+        уже разобранный элемент JSON-массива. Возвращает число созданных
+        организаций и ошибки строк.
+        """
+        return self.save_import_items(*self.validate_import_rows(rows))
+
+    @staticmethod
+    @cpu_bound
+    def validate_import_rows(
+        rows: list[tuple[int, Any]],
+    ) -> tuple[list[tuple[int, OrganizationCreate]], list[BulkImportError]]:
+        """
+        Разобрать и провалидировать строки импорта без обращения к БД.
+        Возвращает пары (номер строки, организация) и ошибки строк.
+        """
+        errors = []
+        items = []
+        for line, raw in rows:
+            try:
+                if isinstance(raw, bytes):
+                    item = OrganizationCreate.model_validate_json(raw)
+                else:
+                    item = OrganizationCreate.model_validate(raw)
+            except ValidationError as exc:
+                errors.append(
+                    BulkImportError(
+                        line=line,
+                        errors=exc.errors(
+                            include_url=False, include_context=False, include_input=False
+                        ),
+                    )
+                )
+                continue
+            items.append((line, item))
+        return items, errors
+
+    def save_import_items(
+        self,
+        items: list[tuple[int, OrganizationCreate]],
+        errors: list[BulkImportError],
+    ) -> tuple[int, list[BulkImportError]]:
+        """
+        Сохранить провалидированные строки импорта одной транзакцией.
+
+        Здания и деятельности всей пачки проверяются двумя запросами,
+        ошибочные строки пропускаются и добавляются к errors.
+        Возвращает число созданных организаций и ошибки строк.
+        """
+        errors = list(errors)
+        building_ids = self.building_repo.get_existing_ids({item.building_id for _, item in items})
+        activity_ids = self.activity_repo.get_existing_ids(
+            {activity_id for _, item in items for activity_id in item.activity_ids}
+        )
+        valid = []
+        for line, item in items:
+            row_errors = []
+            if item.building_id not in building_ids:
+                row_errors.append(
+                    {
+                        "type": "not_found",
+                        "loc": ["building_id"],
+                        "msg": f"Building with id {item.building_id} not found",
+                    }
+                )
+            missing = [
+                activity_id for activity_id in item.activity_ids if activity_id not in activity_ids
+            ]
+            if missing:
+                row_errors.append(
+                    {
+                        "type": "not_found",
+                        "loc": ["activity_ids"],
+                        "msg": f"Activities with ids {missing} not found",
+                    }
+                )
+            if row_errors:
+                errors.append(BulkImportError(line=line, errors=row_errors))
+            else:
+                valid.append((line, item))
+
+        try:
+            created = len(self.org_repo.bulk_create([item for _, item in valid]))
+        except IntegrityError as exc:
+            # Здание или деятельность удалили после проверки: пачка откатывается
+            self.db.rollback()
+            created = 0
+            error = {"type": "integrity_error", "loc": [], "msg": str(exc.orig)}
+            errors.extend(BulkImportError(line=line, errors=[error]) for line, _ in valid)
+        errors.sort(key=lambda error: error.line)
+        return created, errors
+
+    def update_organization(self, org_id: int, org_data: OrganizationUpdate) -> Organization:
         """Обновить организацию с валидацией."""
         # Проверяем существование организации
         existing = self.org_repo.get_by_id(org_id)
@@ -122,7 +765,7 @@ class OrganizationService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Organization with id {org_id} not found",
             )
-        
+
         # Проверяем здание если оно обновляется
         if org_data.building_id:
             building = self.building_repo.get_by_id(org_data.building_id)
@@ -131,7 +774,7 @@ class OrganizationService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Building with id {org_data.building_id} not found",
                 )
-        
+
         # Проверяем деятельности если они обновляются
         activities = None
         if org_data.activity_ids is not None:
@@ -141,5 +784,5 @@ class OrganizationService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Some activity IDs are invalid",
                 )
-        
+
         return self.org_repo.update(org_id, org_data, activities)
@@ -0,0 +1,57 @@
+"""
+Бенчмарк точной фильтрации по радиусу: поэлементный Хаверсин против NumPy.
+
+Запуск: python -m benchmarks.bench_haversine
+"""
+import random
+import time
+from app.core import geo
+
+SIZES = (1_000, 100_000, 1_000_000)
+CENTER = (55.7558, 37.6173)
+RADIUS_KM = 10.0
+
+
+def _points(count: int) -> tuple[list[float], list[float]]:
+    """Случайные точки в квадрате ~0.5 градуса вокруг центра."""
+    rnd = random.Random(count)
+    lats = [CENTER[0] + rnd.uniform(-0.25, 0.25) for _ in range(count)]
+    lons = [CENTER[1] + rnd.uniform(-0.25, 0.25) for _ in range(count)]
+    return lats, lons
+
+
+def _scalar(lats: list[float], lons: list[float]) -> list[int]:
+    return [
+        i for i, (lat, lon) in enumerate(zip(lats, lons))
+        if geo.haversine_distance(CENTER[0], CENTER[1], lat, lon) <= RADIUS_KM
+    ]
+
+
+def _timed(func, *args) -> tuple[float, list[int]]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    if geo.np is None:
+        print("NumPy is not installed, only the scalar path is measured")
+    print(f"{'buildings':>10} {'scalar, ms':>12} {'numpy, ms':>12} {'speedup':>8}")
+    for size in SIZES:
+        lats, lons = _points(size)
+        scalar_time, expected = _timed(_scalar, lats, lons)
+        if geo.np is None:
+            print(f"{size:>10} {scalar_time * 1000:>12.1f} {'-':>12} {'-':>8}")
+            continue
+        vector_time, result = _timed(
+            geo.indices_within_radius, CENTER[0], CENTER[1], RADIUS_KM, lats, lons
+        )
+        assert result == expected
+        print(
+            f"{size:>10} {scalar_time * 1000:>12.1f} {vector_time * 1000:>12.1f} "
+            f"{scalar_time / vector_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
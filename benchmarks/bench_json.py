@@ -0,0 +1,99 @@
+"""
+Бенчмарк сериализации большого ответа.
+
+Страница из 10 000 организаций (словари Core-пути чтения) отдается
+через FastAPI четырьмя способами: response_model с JSONResponse и
+с ORJSONResponse, TypeAdapter (validate + dump_json) и orjson без
+валидации (FAST_JSON). Измеряется время запроса и размер ответа.
+
+Запуск: python -m benchmarks.bench_json
+"""
+import time
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from app.cache import serialize
+from app.core.serialization import orjson
+from app.schemas import OrganizationPage
+
+ORGANIZATIONS = 10_000
+ACTIVITIES_PER_ORG = 3
+REPEATS = 20
+
+
+def _page() -> dict:
+    """Страница организаций в виде словарей Core-пути чтения."""
+    return {
+        "items": [
+            {
+                "id": i,
+                "name": f"ООО Организация {i}",
+                "phone_numbers": ["+7-495-000-0000", f"8-800-{i:07d}"],
+                "building": {
+                    "id": i % 500 + 1,
+                    "address": f"Тверская, {i % 500 + 1}",
+                    "latitude": 55.75 + i * 1e-5,
+                    "longitude": 37.61 + i * 1e-5,
+                },
+                "activities": [
+                    {"id": a, "name": f"Деятельность {a}", "parent_id": None, "level": 1}
+                    for a in range(i % 20 + 1, i % 20 + 1 + ACTIVITIES_PER_ORG)
+                ],
+            }
+            for i in range(1, ORGANIZATIONS + 1)
+        ],
+        "next_cursor": None,
+    }
+
+
+def _app(page: dict) -> FastAPI:
+    """Приложение с одним и тем же ответом, сериализуемым по-разному."""
+    app = FastAPI()
+
+    @app.get("/response-model", response_model=OrganizationPage)
+    def response_model() -> dict:
+        return page
+
+    @app.get(
+        "/response-model-orjson",
+        response_model=OrganizationPage,
+        response_class=ORJSONResponse,
+    )
+    def response_model_orjson() -> dict:
+        return page
+
+    @app.get("/type-adapter")
+    def type_adapter() -> Response:
+        body = serialize(OrganizationPage, page, fast_json=False)
+        return Response(body, media_type="application/json")
+
+    @app.get("/fast-json")
+    def fast_json() -> Response:
+        body = serialize(OrganizationPage, page, fast_json=True)
+        return Response(body, media_type="application/json")
+
+    return app
+
+
+def main() -> None:
+    if orjson is None:
+        print("orjson не установлен: poetry install --extras fast")
+        return
+    page = _page()
+    client = TestClient(_app(page))
+    routes = ["/response-model", "/response-model-orjson", "/type-adapter", "/fast-json"]
+    expected = client.get(routes[0]).json()
+    print(f"response: {ORGANIZATIONS} organizations")
+    print(f"{'route':>24} {'ms/request':>11} {'bytes':>10}")
+    for route in routes:
+        response = client.get(route)
+        assert response.json() == expected, route
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            client.get(route)
+        elapsed = (time.perf_counter() - start) / REPEATS * 1000
+        print(f"{route:>24} {elapsed:>11.2f} {len(response.content):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Бенчмарк стратегий загрузки деятельностей организаций.
+
+Для организаций с 1, 5 и 20 деятельностями измеряет число строк,
+полученных из БД, и время на запрос страницы организаций.
+
+Запуск: python -m benchmarks.bench_org_loading
+"""
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models import Activity, Building, Organization, organization_activities
+from app.repositories import OrganizationRepository
+from app.repositories.organization_repository import LOAD_STRATEGIES
+
+STRATEGIES = (*LOAD_STRATEGIES, "batched")
+ACTIVITY_COUNTS = (1, 5, 20)
+ORGANIZATIONS = 5_000
+PAGE_SIZE = 100
+REPEATS = 50
+
+
+def _seed(engine, activities_per_org: int) -> None:
+    """Заполнить БД организациями с заданным числом деятельностей."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            Building.__table__.insert(),
+            [{"id": 1, "address": "Тверская, 1", "latitude": 55.75, "longitude": 37.61, "geohash": "ucfv0n014"}],
+        )
+        conn.execute(
+            Activity.__table__.insert(),
+            [{"id": i, "name": f"Activity {i}", "parent_id": None, "level": 1} for i in range(1, 21)],
+        )
+        conn.execute(
+            Organization.__table__.insert(),
+            [
+                {"id": i, "name": f"Organization {i}", "phone_numbers": '["+7-495-000-0000"]', "building_id": 1}
+                for i in range(1, ORGANIZATIONS + 1)
+            ],
+        )
+        conn.execute(
+            organization_activities.insert(),
+            [
+                {"organization_id": org_id, "activity_id": activity_id}
+                for org_id in range(1, ORGANIZATIONS + 1)
+                for activity_id in range(1, activities_per_org + 1)
+            ],
+        )
+
+
+def _count_rows(engine, session_factory, strategy: str) -> tuple[int, int]:
+    """Число SQL-запросов и строк, полученных при чтении одной страницы."""
+    statements = []
+
+    def collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "after_cursor_execute", collect)
+    try:
+        with session_factory() as db:
+            OrganizationRepository(db, strategy).get_all(limit=PAGE_SIZE)
+    finally:
+        event.remove(engine, "after_cursor_execute", collect)
+
+    rows = 0
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows += conn.exec_driver_sql(
+                f"SELECT COUNT(*) FROM ({statement})", parameters
+            ).scalar()
+    return len(statements), rows
+
+
+def _time_per_request(session_factory, strategy: str) -> float:
+    """Среднее время чтения страницы организаций, мс."""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        with session_factory() as db:
+            organizations = OrganizationRepository(db, strategy).get_all(limit=PAGE_SIZE)
+            for organization in organizations:
+                organization.activities
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main() -> None:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_factory = sessionmaker(bind=engine)
+    print(f"page size: {PAGE_SIZE} organizations")
+    print(f"{'activities':>10} {'strategy':>10} {'queries':>8} {'rows':>8} {'ms/request':>11}")
+    for activities_per_org in ACTIVITY_COUNTS:
+        _seed(engine, activities_per_org)
+        for strategy in STRATEGIES:
+            queries, rows = _count_rows(engine, session_factory, strategy)
+            elapsed = _time_per_request(session_factory, strategy)
+            print(
+                f"{activities_per_org:>10} {strategy:>10} {queries:>8} {rows:>8} {elapsed:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
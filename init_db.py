@@ -2,7 +2,9 @@
 Скрипт для инициализации базы данных тестовыми данными.
 """
 from app.core.database import engine, SessionLocal, Base
+from app.core.geo import geohash_encode
 from app.models.models import Building, Activity, Organization
+from app.repositories import ActivityRepository, OrganizationRepository
 
 
 def init_db():
@@ -26,6 +28,8 @@ def init_db():
             Building(id=4, address="г. Москва, ул. Новый Арбат, д. 15", latitude=55.7530, longitude=37.5850),
             Building(id=5, address="г. Москва, Кутузовский проспект, д. 32", latitude=55.7400, longitude=37.5500),
         ]
+        for building in buildings:
+            building.geohash = geohash_encode(building.latitude, building.longitude)
         db.add_all(buildings)
         db.commit()
         
@@ -67,6 +71,7 @@ def init_db():
         ]
         db.add_all(activities_l3)
         db.commit()
+        ActivityRepository(db).rebuild_closure()
         
         # ==================== Организации ====================
         organizations_data = [
@@ -97,6 +102,7 @@ def init_db():
             db.add(org)
         
         db.commit()
+        OrganizationRepository(db).rebuild_phone_index()
         print("Database initialized with test data!")
         
     except Exception as e:
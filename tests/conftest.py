@@ -0,0 +1,137 @@
+"""
+Общие фикстуры: приложение на временной базе SQLite с тестовыми данными.
+"""
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+import pytest
+
+# Настройки и движки создаются при импорте app, поэтому база задается до него
+DB_DIR = Path(tempfile.mkdtemp(prefix="directory-tests-"))
+DATABASE_PATH = DB_DIR / "directory.db"
+atexit.register(shutil.rmtree, DB_DIR, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.core import SessionLocal, get_settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.repositories import OrganizationRepository  # noqa: E402
+from init_db import init_db  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+API_HEADERS = {get_settings().API_KEY_HEADER: get_settings().API_KEY}
+
+init_db()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Клиент приложения; индексы строятся при старте, как в работе."""
+    with TestClient(app, base_url="http://testserver/api/v1", headers=API_HEADERS) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    """Сессия временной базы."""
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def create_building(client):
+    """Фабрика зданий через API. Здания без организаций не влияют на выдачу."""
+
+    def create(latitude: float, longitude: float, address: str = "Тестовый адрес") -> int:
+        response = client.post(
+            "/buildings/",
+            json={"address": address, "latitude": latitude, "longitude": longitude},
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+    return create
+
+
+@pytest.fixture
+def create_organization(client, db):
+    """
+    Фабрика организаций через API; созданные организации удаляются
+    после теста, чтобы тесты не зависели от порядка.
+    """
+    created = []
+
+    def create(name: str, building_id: int = 1, activity_ids=(1,), phones=("+7-495-100-0000",)):
+        response = client.post(
+            "/organizations/",
+            json={
+                "name": name,
+                "phone_numbers": list(phones),
+                "building_id": building_id,
+                "activity_ids": list(activity_ids),
+            },
+        )
+        assert response.status_code == 201, response.text
+        created.append(response.json()["id"])
+        return response.json()
+
+    yield create
+    repository = OrganizationRepository(db)
+    for org_id in created:
+        repository.delete(org_id)
+
+
+@pytest.fixture
+def pages(client):
+    """Все страницы keyset-выдачи: переход по next_cursor до конца."""
+
+    def collect(path: str, **params) -> list[list[dict]]:
+        result = []
+        cursor = {}
+        while True:
+            response = client.get(path, params={**params, **cursor})
+            assert response.status_code == 200, response.text
+            page = response.json()
+            result.append(page["items"])
+            if page["next_cursor"] is None:
+                return result
+            cursor = page["next_cursor"]
+            if not isinstance(cursor, dict):
+                cursor = {"after_id": cursor}
+
+    return collect
+
+
+@pytest.fixture
+def run_app():
+    """
+    Выполнить script в отдельном процессе с переменными окружения env
+    и вернуть его вывод. Нужен для настроек, которые читаются при импорте
+    приложения (ASYNC_DB). В script доступен client на копии временной базы.
+    """
+
+    def run(script: str, **env: str) -> str:
+        database = DB_DIR / f"copy-{len(list(DB_DIR.iterdir()))}.db"
+        database.write_bytes(DATABASE_PATH.read_bytes())
+        prelude = (
+            "from fastapi.testclient import TestClient\n"
+            "from app.main import app\n"
+            f"with TestClient(app, base_url='http://testserver/api/v1', headers={API_HEADERS!r})"
+            " as client:\n"
+        )
+        body = "".join(f"    {line}\n" for line in script.strip().splitlines())
+        result = subprocess.run(
+            [sys.executable, "-c", prelude + body],
+            cwd=ROOT,
+            env={**os.environ, **env, "DATABASE_URL": f"sqlite:///{database}"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout
+
+    return run
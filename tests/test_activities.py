@@ -0,0 +1,96 @@
+"""
+Тесты дерева деятельностей: closure table и кэш дерева в памяти.
+"""
+import pytest
+from sqlalchemy import select
+from app.indexes import activity_tree
+from app.models import activity_closure
+from app.repositories import ActivityRepository
+from app.schemas import ActivityCreate
+
+
+def descendants(activities: list[dict], activity_id: int) -> set[int]:
+    """Поддерево по parent_id, без closure table."""
+    result = {activity_id}
+    changed = True
+    while changed:
+        changed = False
+        for activity in activities:
+            if activity["parent_id"] in result and activity["id"] not in result:
+                result.add(activity["id"])
+                changed = True
+    return result
+
+
+def closure_rows(db) -> set[tuple[int, int, int]]:
+    return set(db.execute(select(activity_closure)).tuples())
+
+
+@pytest.fixture
+def create_activity(client):
+    def create(name: str, parent_id: int | None = None) -> dict:
+        response = client.post("/activities/", json={"name": name, "parent_id": parent_id})
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return create
+
+
+def test_subtree_lookups_match_parent_ids(client, db):
+    activities = client.get("/activities/").json()
+    repository = ActivityRepository(db)
+    assert activity_tree.is_ready
+    for activity in activities:
+        expected = descendants(activities, activity["id"])
+        assert set(repository.get_subtree_ids(activity["id"])) == expected
+        assert set(activity_tree.subtree_ids(activity["id"])) == expected
+    assert set(repository.get_subtree_ids(2)) == {2, 8, 9, 14, 15, 16}
+
+
+def test_new_activity_joins_ancestor_subtrees(client, db, create_activity, create_organization):
+    version = activity_tree.version
+    activity = create_activity("Шины", parent_id=9)
+    assert activity["level"] == 3
+    assert activity_tree.version == version + 1
+
+    for ancestor_id in (2, 9):
+        assert activity["id"] in ActivityRepository(db).get_subtree_ids(ancestor_id)
+        assert activity["id"] in activity_tree.subtree_ids(ancestor_id)
+
+    organization = create_organization("Шинный центр", activity_ids=[activity["id"]])
+    response = client.get("/organizations/by-activity/2", params={"include_children": True})
+    assert organization["id"] in [item["id"] for item in response.json()["items"]]
+
+    # Пересчет closure table с нуля дает те же связи, что пошаговое добавление
+    incremental = closure_rows(db)
+    ActivityRepository(db).rebuild_closure()
+    assert closure_rows(db) == incremental
+
+
+def test_cache_reloads_after_write_of_another_worker(client, db, monkeypatch):
+    # Другой воркер: запись и счетчик версии в БД, но не кэш этого процесса
+    monkeypatch.setattr(activity_tree, "add", lambda activity, version: None)
+    activity = ActivityRepository(db).create(ActivityCreate(name="Эвакуаторы", parent_id=8))
+    monkeypatch.setattr(activity_tree, "check_interval", 3600.0)
+    activity_tree.mark_checked()
+    assert client.get(f"/activities/{activity.id}").status_code == 404
+
+    monkeypatch.setattr(activity_tree, "check_interval", 0.0)
+    response = client.get(f"/activities/{activity.id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Эвакуаторы"
+    assert activity.id in activity_tree.subtree_ids(2)
+
+
+def test_full_tree_matches_flat_list(client):
+    activities = client.get("/activities/").json()
+    tree = client.get("/activities/tree/full").json()
+
+    def flatten(nodes, parent_id=None):
+        for node in nodes:
+            yield node["id"], parent_id
+            yield from flatten(node["children"], node["id"])
+
+    assert sorted(flatten(tree)) == sorted(
+        (activity["id"], activity["parent_id"]) for activity in activities
+    )
@@ -0,0 +1,89 @@
+"""
+Тесты асинхронного режима доступа к БД (ASYNC_DB).
+"""
+import asyncio
+import json
+import threading
+import pytest
+from app.services import AsyncService, cpu_bound
+
+pytest.importorskip("aiosqlite")
+
+# Выполняется в отдельном процессе: ASYNC_DB читается при импорте приложения
+SCENARIO = """
+import json
+results = []
+for path, params in [
+    ("/organizations/", {"limit": 4}),
+    ("/organizations/", {"limit": 4, "after_id": 4}),
+    ("/organizations/search", {"name": "Здоров"}),
+    ("/organizations/suggest", {"prefix": "ооо"}),
+    ("/organizations/by-phone", {"phone": "8 495 555 55 56"}),
+    ("/organizations/by-building/3", {}),
+    ("/organizations/by-activity/2", {"include_children": True}),
+    ("/organizations/in-radius", {"latitude": 55.75, "longitude": 37.6, "radius_km": 5}),
+    ("/organizations/nearest", {"latitude": 55.75, "longitude": 37.6, "limit": 3}),
+    ("/organizations/in-box", {"min_lat": 55.7, "max_lat": 55.8, "min_lon": 37.5, "max_lon": 37.7}),
+    ("/organizations/clusters", {"min_lat": 55, "max_lat": 56, "min_lon": 37, "max_lon": 38,
+                                 "zoom": 10, "top_activities": 1}),
+    ("/organizations/query", {"activity_id": 1, "include_children": True, "name": "хлеб"}),
+    ("/organizations/7", {}),
+    ("/organizations/999999", {}),
+    ("/activities/tree", {}),
+    ("/buildings/2", {}),
+]:
+    response = client.get(path, params=params)
+    results.append([response.status_code, response.json()])
+response = client.post(
+    "/organizations/import",
+    content=b'{"name": "Async", "phone_numbers": ["1"], "building_id": 1, "activity_ids": [1]}\\n'
+            b'{"name": "Async", "phone_numbers": [], "building_id": 1, "activity_ids": [1]}\\n',
+    headers={"Content-Type": "application/x-ndjson"},
+)
+results.append([response.status_code, response.json()])
+created = client.post(
+    "/organizations/",
+    json={"name": "Async 2", "phone_numbers": ["2"], "building_id": 2, "activity_ids": [2]},
+).json()
+response = client.put(f"/organizations/{created['id']}", json={"name": "Async 3"})
+results.append([response.status_code, response.json()])
+results.append(client.get("/organizations/by-building/2").json())
+print(json.dumps(results))
+"""
+
+
+def test_async_db_matches_sync(run_app):
+    sync = json.loads(run_app(SCENARIO, ASYNC_DB="false"))
+    async_ = json.loads(run_app(SCENARIO, ASYNC_DB="true"))
+    assert async_ == sync
+    assert [status for status, _ in sync[:16]] == [200] * 13 + [404, 200, 200]
+    assert sync[16][1]["created"] == 1 and sync[16][1]["failed"] == 1
+
+
+class Service:
+    """Сервис, записывающий поток, в котором выполнялся метод."""
+
+    def read(self) -> str:
+        return threading.current_thread().name
+
+    @cpu_bound
+    def compute(self) -> str:
+        return threading.current_thread().name
+
+
+class FakeAsyncSession:
+    """AsyncSession, выполняющая run_sync в потоке цикла событий."""
+
+    async def run_sync(self, function):
+        return function(None)
+
+
+def test_cpu_bound_methods_leave_event_loop_thread():
+    async def scenario():
+        loop_thread = threading.current_thread().name
+        service = AsyncService(Service(), FakeAsyncSession())
+        return loop_thread, await service.read(), await service.compute()
+
+    loop_thread, read_thread, compute_thread = asyncio.run(scenario())
+    assert read_thread == loop_thread
+    assert compute_thread != loop_thread
@@ -0,0 +1,79 @@
+"""
+Тесты bitmap-индекса организаций (app.indexes.bitmap).
+"""
+import pytest
+from app.core import get_settings
+from app.indexes import bitmap, organization_bitmaps
+from app.repositories import OrganizationRepository
+
+settings = get_settings()
+
+BOX = {"min_lat": 55.7, "max_lat": 55.76, "min_lon": 37.5, "max_lon": 37.6}
+RADIUS = {"latitude": 55.75, "longitude": 37.6, "radius_km": 3}
+PAGED = [
+    ("/organizations/by-activity/1", {"include_children": True}),
+    ("/organizations/by-activity/2", {}),
+    ("/organizations/by-building/4", {}),
+    ("/organizations/in-box", BOX),
+    ("/organizations/query", {"activity_id": 1, "include_children": True, **BOX}),
+    ("/organizations/query", {"activity_id": 2, "include_children": True, **RADIUS}),
+    ("/organizations/query", {"activity_id": 4, "building_id": 5}),
+    ("/organizations/query", {"activity_id": 1, "name": "хлеб"}),
+]
+
+
+@pytest.fixture(params=["pyroaring", "set"])
+def bitmaps(request, db, monkeypatch):
+    """Включить bitmap-индекс (BITMAP_INDEX_ENABLED) на время теста."""
+    if request.param == "set":
+        monkeypatch.setattr(bitmap, "BitMap", None)
+    elif bitmap.BitMap is None:
+        pytest.skip("pyroaring is not installed")
+
+    def enable():
+        OrganizationRepository(db).rebuild_bitmap_index()
+
+    yield enable
+    organization_bitmaps.clear()
+
+
+def cars(pages) -> list[int]:
+    """ID организаций поддерева "Автомобили"."""
+    return [
+        item["id"]
+        for page in pages("/organizations/by-activity/2", include_children=True, limit=3)
+        for item in page
+    ]
+
+
+def read_all(pages) -> list:
+    return [pages(path, limit=2, **params) for path, params in PAGED]
+
+
+def test_bitmap_on_and_off_give_same_pages(pages, bitmaps, create_organization):
+    create_organization("Хлебный киоск", building_id=4, activity_ids=[19])
+    assert not organization_bitmaps.is_ready
+    without_index = read_all(pages)
+
+    bitmaps()
+    assert organization_bitmaps.is_ready
+    assert read_all(pages) == without_index
+    assert any(page for pages_of_query in without_index for page in pages_of_query)
+
+
+def test_bitmap_follows_writes(client, pages, bitmaps, create_organization):
+    bitmaps()
+    created = create_organization("Шиномонтаж у дома", building_id=5, activity_ids=[16])
+    assert created["id"] in cars(pages)
+
+    response = client.put(f"/organizations/{created['id']}", json={"activity_ids": [12]})
+    assert response.status_code == 200
+    assert created["id"] not in cars(pages)
+
+
+def test_bitmap_respects_spatial_id_cap(pages, bitmaps, monkeypatch):
+    bitmaps()
+    uncapped = read_all(pages)
+    # Больше SPATIAL_INDEX_MAX_IDS зданий - область проверяется в БД
+    monkeypatch.setattr(settings, "SPATIAL_INDEX_MAX_IDS", 1)
+    assert read_all(pages) == uncapped
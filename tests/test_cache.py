@@ -0,0 +1,218 @@
+"""
+Тесты хранилища и кэша ответов (app.cache).
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from starlette.requests import Request
+from app.cache import CacheBackend, MemoryCacheBackend, ResponseCache
+from app.cache import backends
+
+
+def make_request(path: str, query: str = "", headers: dict[str, str] | None = None) -> Request:
+    """GET-запрос Starlette без приложения."""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [
+            (name.lower().encode(), value.encode())
+            for name, value in (headers or {}).items()
+        ],
+    })
+
+
+def respond(cache: ResponseCache, request: Request, value, tags=(), etag=None, on_compute=None):
+    """Ответ cache.respond(); возвращает (ответ, число вызовов compute)."""
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        if on_compute is not None:
+            on_compute()
+        return value
+
+    response = asyncio.run(
+        cache.respond(request, dict[str, int], compute, tags, etag=etag)
+    )
+    return response, len(calls)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемое время для TTL записей MemoryCacheBackend."""
+    now = [1000.0]
+    monkeypatch.setattr(backends, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_memory_backend_get_set():
+    backend = MemoryCacheBackend(max_bytes=1024)
+    backend.set("a", b"1", ["t"], ttl=60)
+    assert backend.get("a") == b"1"
+    assert backend.get("missing") is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    # Каждая запись занимает 1 + 9 = 10 байт
+    backend = MemoryCacheBackend(max_bytes=30)
+    for key in "abc":
+        backend.set(key, b"x" * 9, [], ttl=60)
+    backend.get("a")
+    backend.set("d", b"x" * 9, [], ttl=60)
+
+    assert backend.get("b") is None
+    assert backend.get("a") is not None
+    assert backend.get("c") is not None
+    assert backend.get("d") is not None
+    assert backend.stats() == {"entries": 3, "size_bytes": 30, "evictions": 1}
+
+
+def test_memory_backend_skips_value_larger_than_limit():
+    backend = MemoryCacheBackend(max_bytes=10)
+    backend.set("a", b"x" * 10, [], ttl=60)
+    assert backend.get("a") is None
+    assert backend.stats()["entries"] == 0
+
+
+def test_memory_backend_expires_by_ttl(clock):
+    backend = MemoryCacheBackend(max_bytes=1024)
+    backend.set("a", b"1", ["t"], ttl=10)
+    clock[0] += 9
+    assert backend.get("a") == b"1"
+    clock[0] += 1
+    assert backend.get("a") is None
+    assert backend.stats() == {"entries": 0, "size_bytes": 0, "evictions": 0}
+
+
+def test_memory_backend_invalidates_by_tag():
+    backend = MemoryCacheBackend(max_bytes=1024)
+    backend.set("a", b"1", ["building:1", "organizations"], ttl=60)
+    backend.set("b", b"2", ["building:2", "organizations"], ttl=60)
+    backend.set("c", b"3", ["activity:1"], ttl=60)
+
+    assert backend.invalidate(["building:1"]) == 1
+    assert backend.get("a") is None
+    assert backend.get("b") == b"2"
+
+    assert backend.invalidate(["organizations", "unknown"]) == 1
+    assert backend.get("b") is None
+    assert backend.get("c") == b"3"
+    assert backend.stats()["entries"] == 1
+
+
+def test_memory_backend_overwrite_replaces_tags():
+    backend = MemoryCacheBackend(max_bytes=1024)
+    backend.set("a", b"1", ["old"], ttl=60)
+    backend.set("a", b"22", ["new"], ttl=60)
+    assert backend.invalidate(["old"]) == 0
+    assert backend.get("a") == b"22"
+    assert backend.stats()["size_bytes"] == len("a") + 2
+
+
+def test_respond_caches_by_path_and_sorted_query():
+    cache = ResponseCache(MemoryCacheBackend(max_bytes=1024), ttl=60)
+
+    response, calls = respond(cache, make_request("/items", "b=2&a=1"), {"value": 1})
+    assert calls == 1
+    assert json.loads(response.body) == {"value": 1}
+
+    response, calls = respond(cache, make_request("/items", "a=1&b=2"), {"value": 2})
+    assert calls == 0
+    assert json.loads(response.body) == {"value": 1}
+
+    _, calls = respond(cache, make_request("/items", "a=1&b=3"), {"value": 3})
+    assert calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_respond_recomputes_after_tag_invalidation():
+    cache = ResponseCache(MemoryCacheBackend(max_bytes=1024), ttl=60)
+    request = make_request("/items")
+    respond(cache, request, {"value": 1}, tags=["building:1"])
+
+    cache.invalidate(["building:2"])
+    response, calls = respond(cache, request, {"value": 2}, tags=["building:1"])
+    assert calls == 0
+
+    cache.invalidate(["building:1"])
+    response, calls = respond(cache, request, {"value": 2}, tags=["building:1"])
+    assert calls == 1
+    assert json.loads(response.body) == {"value": 2}
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_respond_does_not_store_response_computed_during_invalidation():
+    cache = ResponseCache(MemoryCacheBackend(max_bytes=1024), ttl=60)
+    request = make_request("/items")
+
+    # Запись в БД и инвалидация происходят, пока ответ вычисляется
+    response, calls = respond(
+        cache, request, {"value": 1}, tags=["building:1"],
+        on_compute=lambda: cache.invalidate(["building:1"]),
+    )
+    assert calls == 1
+    assert json.loads(response.body) == {"value": 1}
+    assert cache.stats()["entries"] == 0
+
+    _, calls = respond(cache, request, {"value": 2}, tags=["building:1"])
+    assert calls == 1
+    assert cache.stats()["entries"] == 1
+
+
+def test_respond_without_backend_always_computes():
+    cache = ResponseCache(None, ttl=60)
+    request = make_request("/items")
+    for value in (1, 2):
+        response, calls = respond(cache, request, {"value": value})
+        assert calls == 1
+        assert json.loads(response.body) == {"value": value}
+
+
+def test_respond_keeps_hit_after_unrelated_write():
+    cache = ResponseCache(MemoryCacheBackend(max_bytes=1024), ttl=60)
+    request = make_request("/organizations/by-building/1")
+    respond(cache, request, {"value": 1}, tags=["building:1"], etag='W/"organizations.1"')
+
+    # Запись организации в другом здании: версия и ETag растут
+    cache.invalidate(["building:2"])
+    response, calls = respond(
+        cache, request, {"value": 2}, tags=["building:1"], etag='W/"organizations.2"'
+    )
+    assert calls == 0
+    assert json.loads(response.body) == {"value": 1}
+    assert response.headers["ETag"] == 'W/"organizations.1"'
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["invalidations"] == 0
+
+    # Клиент с ETag сохраненного ответа получает 304
+    revalidation = make_request(
+        "/organizations/by-building/1", headers={"If-None-Match": 'W/"organizations.1"'}
+    )
+    response, calls = respond(
+        cache, revalidation, {"value": 2}, tags=["building:1"], etag='W/"organizations.2"'
+    )
+    assert calls == 0
+    assert response.status_code == 304
+
+
+def test_respond_recomputes_with_new_etag_after_own_write():
+    cache = ResponseCache(MemoryCacheBackend(max_bytes=1024), ttl=60)
+    request = make_request("/organizations/by-building/1")
+    respond(cache, request, {"value": 1}, tags=["building:1"], etag='W/"organizations.1"')
+
+    cache.invalidate(["building:1"])
+    response, calls = respond(
+        cache, request, {"value": 2}, tags=["building:1"], etag='W/"organizations.2"'
+    )
+    assert calls == 1
+    assert json.loads(response.body) == {"value": 2}
+    assert response.headers["ETag"] == 'W/"organizations.2"'
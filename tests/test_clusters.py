@@ -0,0 +1,45 @@
+"""
+Тесты кластеризации организаций для карты /organizations/clusters.
+"""
+from app.services.organization_service import CLUSTER_MAX_GRID
+
+MOSCOW = {"min_lat": 55.7, "max_lat": 55.76, "min_lon": 37.5, "max_lon": 37.62}
+WORLD = {"min_lat": -90, "max_lat": 90, "min_lon": -180, "max_lon": 180}
+
+
+def clusters(client, **params) -> list[dict]:
+    response = client.get("/organizations/clusters", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_clusters_split_buildings_at_high_zoom(client):
+    buildings = {
+        (building["latitude"], building["longitude"])
+        for building in client.get("/buildings/").json()
+        if MOSCOW["min_lat"] <= building["latitude"] <= MOSCOW["max_lat"]
+        and MOSCOW["min_lon"] <= building["longitude"] <= MOSCOW["max_lon"]
+    }
+    result = clusters(client, zoom=18, **MOSCOW)
+    assert len(result) == len(buildings) == 5
+    assert {
+        (round(cluster["latitude"], 6), round(cluster["longitude"], 6)) for cluster in result
+    } == buildings
+    assert all(cluster["count"] == 2 for cluster in result)
+    assert all(cluster["top_activity_ids"] == [] for cluster in result)
+
+
+def test_clusters_merge_at_low_zoom(client):
+    (cluster,) = clusters(client, zoom=0, top_activities=2, **MOSCOW)
+    assert cluster["count"] == 10
+    assert MOSCOW["min_lat"] <= cluster["latitude"] <= MOSCOW["max_lat"]
+    assert MOSCOW["min_lon"] <= cluster["longitude"] <= MOSCOW["max_lon"]
+    # "Еда" и "Автомобили" - по 3 организации, при равенстве выше меньший id
+    assert cluster["top_activity_ids"] == [1, 2]
+
+
+def test_clusters_grid_is_bounded(client, pages):
+    total = sum(len(page) for page in pages("/organizations/", limit=100))
+    result = clusters(client, zoom=22, **WORLD)
+    assert len(result) <= CLUSTER_MAX_GRID ** 2
+    assert sum(cluster["count"] for cluster in result) == total
@@ -0,0 +1,76 @@
+"""
+Тесты потоковой выгрузки организаций /organizations/export.
+"""
+import csv
+import io
+import json
+import pytest
+from app.core import get_settings
+from app.services.organization_service import EXPORT_CSV_COLUMNS
+
+settings = get_settings()
+
+
+@pytest.fixture
+def all_organizations(pages) -> list[dict]:
+    return [item for page in pages("/organizations/", limit=100) for item in page]
+
+
+@pytest.fixture(params=[1000, 3])
+def chunk_size(request, monkeypatch):
+    """Выгрузка одной пачкой и несколькими (EXPORT_CHUNK_SIZE)."""
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", request.param)
+    return request.param
+
+
+def export(client, export_format: str):
+    response = client.get("/organizations/export", params={"format": export_format})
+    assert response.status_code == 200
+    return response
+
+
+def test_ndjson_export_matches_list(client, all_organizations, chunk_size):
+    response = export(client, "ndjson")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="organizations.ndjson"' in response.headers["content-disposition"]
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == all_organizations
+
+
+def test_csv_export_matches_list(client, all_organizations, chunk_size):
+    response = export(client, "csv")
+    assert response.headers["content-type"].startswith("text/csv")
+    header, *rows = csv.reader(io.StringIO(response.text))
+    assert tuple(header) == EXPORT_CSV_COLUMNS
+    assert rows == [
+        [
+            str(organization["id"]),
+            organization["name"],
+            ";".join(organization["phone_numbers"]),
+            str(organization["building"]["id"]),
+            organization["building"]["address"],
+            str(organization["building"]["latitude"]),
+            str(organization["building"]["longitude"]),
+            ";".join(str(activity["id"]) for activity in organization["activities"]),
+        ]
+        for organization in all_organizations
+    ]
+
+
+def test_export_revalidates_by_etag(client, create_organization):
+    etag = export(client, "ndjson").headers["ETag"]
+    response = client.get(
+        "/organizations/export", params={"format": "ndjson"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    created = create_organization("Новая для выгрузки")
+    response = client.get(
+        "/organizations/export", params={"format": "ndjson"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[-1])["id"] == created["id"]
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get("/organizations/export", params={"format": "xml"}).status_code == 422
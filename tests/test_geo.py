@@ -0,0 +1,48 @@
+"""
+Тесты геометрических утилит (app.core.geo).
+"""
+import random
+import pytest
+from app.core import geo
+from app.core.geo import haversine_distance, indices_within_radius
+
+np = pytest.importorskip("numpy")
+
+
+def random_coordinates(count: int, seed: int = 2) -> tuple[list[float], list[float]]:
+    rng = random.Random(seed)
+    return (
+        [rng.uniform(-90.0, 90.0) for _ in range(count)],
+        [rng.uniform(-180.0, 180.0) for _ in range(count)],
+    )
+
+
+def test_haversine_distances_match_scalar():
+    lats, lons = random_coordinates(1000)
+    distances = geo.haversine_distances(55.75, 37.6, lats, lons)
+    expected = [haversine_distance(55.75, 37.6, lat, lon) for lat, lon in zip(lats, lons)]
+    assert np.allclose(distances, expected, rtol=1e-12, atol=1e-9)
+
+
+def test_haversine_distances_of_antipode_and_same_point():
+    distances = geo.haversine_distances(10.0, 20.0, [10.0, -10.0], [20.0, -160.0])
+    assert distances[0] == 0.0
+    assert distances[1] == pytest.approx(geo.MAX_DISTANCE_KM)
+
+
+@pytest.mark.parametrize("radius_km", [10.0, 1000.0, 5000.0])
+def test_indices_within_radius_numpy_matches_pure_python(monkeypatch, radius_km):
+    lats, lons = random_coordinates(2000)
+    vectorized = indices_within_radius(55.75, 37.6, radius_km, lats, lons)
+    monkeypatch.setattr(geo, "np", None)
+    assert indices_within_radius(55.75, 37.6, radius_km, lats, lons) == vectorized
+
+
+def test_radius_search_without_numpy(client, monkeypatch):
+    params = {"latitude": 55.75, "longitude": 37.6, "radius_km": 20, "limit": 100}
+    # Ниже VECTORIZE_MIN_POINTS расстояния считаются поэлементно
+    monkeypatch.setattr(geo, "VECTORIZE_MIN_POINTS", 0)
+    vectorized = client.get("/organizations/in-radius", params=params).json()
+    monkeypatch.setattr(geo, "np", None)
+    assert client.get("/organizations/in-radius", params=params).json() == vectorized
+    assert len(vectorized["items"]) == 10
@@ -0,0 +1,103 @@
+"""
+Тесты массового импорта организаций /organizations/import.
+"""
+import json
+import pytest
+from sqlalchemy import func, select
+from app.core import get_settings
+from app.models import Organization
+from app.repositories import OrganizationRepository
+
+settings = get_settings()
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def organization(name: str, building_id: int = 1, activity_ids=(1,)) -> dict:
+    return {
+        "name": name,
+        "phone_numbers": ["+7 (495) 900-00-00"],
+        "building_id": building_id,
+        "activity_ids": list(activity_ids),
+    }
+
+
+@pytest.fixture
+def imported(db):
+    """ID организаций, созданных импортом за время теста; удаляются после него."""
+    last_id = db.scalar(select(func.max(Organization.id)))
+    created = []
+
+    def collect() -> list[int]:
+        created[:] = db.scalars(
+            select(Organization.id).where(Organization.id > last_id).order_by(Organization.id)
+        )
+        return list(created)
+
+    yield collect
+    collect()
+    repository = OrganizationRepository(db)
+    for org_id in created:
+        repository.delete(org_id)
+
+
+def test_ndjson_import_reports_line_numbers(client, imported):
+    lines = [
+        json.dumps(organization("Импорт 1"), ensure_ascii=False),
+        "",
+        "not json",
+        json.dumps({**organization("Импорт 2"), "phone_numbers": []}),
+        json.dumps(organization("Импорт 3", building_id=999999)),
+        json.dumps(organization("Импорт 4", activity_ids=[1, 999998, 999999])),
+        json.dumps(organization("Импорт 5", building_id=2, activity_ids=[2, 9])),
+    ]
+    response = client.post(
+        "/organizations/import", content="\n".join(lines).encode(), headers=NDJSON
+    )
+    assert response.status_code == 200
+    result = response.json()
+
+    assert result["created"] == 2
+    assert result["failed"] == 4
+    assert [error["line"] for error in result["errors"]] == [3, 4, 5, 6]
+    assert result["errors"][0]["errors"][0]["type"] == "json_invalid"
+    assert result["errors"][1]["errors"][0]["loc"] == ["phone_numbers"]
+    assert result["errors"][2]["errors"] == [
+        {"type": "not_found", "loc": ["building_id"], "msg": "Building with id 999999 not found"}
+    ]
+    assert result["errors"][3]["errors"][0]["msg"] == (
+        "Activities with ids [999998, 999999] not found"
+    )
+
+    created = imported()
+    names = [client.get(f"/organizations/{org_id}").json()["name"] for org_id in created]
+    assert names == ["Импорт 1", "Импорт 5"]
+    # Импортированные организации попадают в индекс телефонов
+    found = client.get("/organizations/by-phone", params={"phone": "84959000000"}).json()
+    assert [item["id"] for item in found] == created
+
+
+def test_json_array_import_in_chunks(client, imported, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_ERRORS", 2)
+    rows = [
+        organization(f"Пачка {number}", building_id=999999 if number % 2 else 1)
+        for number in range(7)
+    ]
+    response = client.post("/organizations/import", json=rows)
+    assert response.status_code == 200
+    result = response.json()
+
+    assert result["created"] == 4
+    # Ошибок три, в ответ попадают первые BULK_IMPORT_MAX_ERRORS
+    assert result["failed"] == 3
+    assert [error["line"] for error in result["errors"]] == [2, 4]
+    assert len(imported()) == 4
+
+
+@pytest.mark.parametrize("body", [b"{}", b"not json", b'"text"'])
+def test_import_rejects_body_that_is_not_array(client, body):
+    response = client.post(
+        "/organizations/import", content=body, headers={"Content-Type": "application/json"}
+    )
+    assert response.status_code == 400
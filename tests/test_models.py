@@ -0,0 +1,16 @@
+"""
+Тесты моделей (app.models).
+"""
+from sqlalchemy import select
+from app.models import Organization
+
+
+def test_organization_phone_numbers_roundtrip():
+    organization = Organization(name="ООО Тест", phone_numbers=["8-800-000-00-00"], building_id=1)
+    assert organization.phone_numbers == ["8-800-000-00-00"]
+    assert organization._phone_numbers == '["8-800-000-00-00"]'
+
+
+def test_organization_phone_numbers_expression_is_column():
+    statement = select(Organization.phone_numbers)
+    assert "organizations.phone_numbers" in str(statement)
@@ -0,0 +1,60 @@
+"""
+Тесты поиска ближайших организаций /organizations/nearest.
+"""
+import pytest
+from app.core.geo import haversine_distance
+
+
+def brute_force(pages, lat: float, lon: float, activity_ids=None) -> list[tuple[float, int]]:
+    """Пары (расстояние, id) всех организаций по возрастанию расстояния."""
+    result = []
+    for page in pages("/organizations/", limit=100):
+        for organization in page:
+            activities = {activity["id"] for activity in organization["activities"]}
+            if activity_ids is not None and not activities & activity_ids:
+                continue
+            building = organization["building"]
+            distance = haversine_distance(lat, lon, building["latitude"], building["longitude"])
+            result.append((distance, organization["id"]))
+    return sorted(result)
+
+
+@pytest.mark.parametrize(
+    "lat, lon, limit",
+    [(55.75, 37.6, 3), (55.75, 37.6, 100), (55.71, 37.58, 1), (0.0, 0.0, 4)],
+)
+def test_nearest_matches_brute_force(client, pages, lat, lon, limit):
+    response = client.get(
+        "/organizations/nearest", params={"latitude": lat, "longitude": lon, "limit": limit}
+    )
+    assert response.status_code == 200
+    expected = brute_force(pages, lat, lon)[:limit]
+    items = response.json()
+    assert [item["distance_km"] for item in items] == pytest.approx(
+        [distance for distance, _ in expected]
+    )
+    # Организации одного здания равноудалены, при равенстве первой идет меньший id
+    assert [item["id"] for item in items] == [org_id for _, org_id in expected]
+
+
+def test_nearest_by_activity_subtree(client, pages):
+    params = {"latitude": 55.75, "longitude": 37.6, "limit": 10, "activity_id": 2}
+    direct = client.get("/organizations/nearest", params=params).json()
+    subtree = client.get("/organizations/nearest", params={**params, "include_children": True})
+
+    assert [item["id"] for item in direct] == [
+        org_id for _, org_id in brute_force(pages, 55.75, 37.6, {2})
+    ]
+    # Поддерево "Автомобили": грузовые, легковые, запчасти, аксессуары, шиномонтаж
+    subtree_ids = {2, 8, 9, 14, 15, 16}
+    assert [item["id"] for item in subtree.json()] == [
+        org_id for _, org_id in brute_force(pages, 55.75, 37.6, subtree_ids)
+    ]
+
+
+def test_nearest_unknown_activity(client):
+    response = client.get(
+        "/organizations/nearest",
+        params={"latitude": 55.75, "longitude": 37.6, "activity_id": 999999},
+    )
+    assert response.status_code == 404
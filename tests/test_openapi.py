@@ -0,0 +1,28 @@
+"""
+Тесты схемы OpenAPI.
+"""
+import inspect
+from fastapi.routing import APIRoute
+from starlette.responses import Response, StreamingResponse
+from app.main import app
+
+
+def test_raw_response_routes_declare_response_model():
+    # Маршруты, отдающие готовое JSON-тело, не получают схему из аннотации
+    routes = [
+        route for route in app.routes
+        if isinstance(route, APIRoute)
+        and inspect.signature(route.endpoint).return_annotation is Response
+        and route.response_class is not StreamingResponse
+    ]
+    assert routes
+    for route in routes:
+        assert route.response_model is not None, route.path
+
+
+def test_openapi_documents_json_responses():
+    paths = app.openapi()["paths"]
+    response = paths["/api/v1/organizations/"]["get"]["responses"]["200"]
+    assert response["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/OrganizationPage"
+    }
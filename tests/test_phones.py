@@ -0,0 +1,77 @@
+"""
+Тесты нормализации телефонов (app.core.phones) и поиска по номеру.
+"""
+import importlib.util
+from pathlib import Path
+import pytest
+from app.core.phones import normalize_phone
+
+SAME_NUMBER = ["+7 (495) 111-11-11", "8-495-111-1111", "495 111 1111", "74951111111"]
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        *((phone, "74951111111") for phone in SAME_NUMBER),
+        ("+1 212 555 0100", "12125550100"),
+        ("112", "112"),
+        ("+44 20 7946 0958", "442079460958"),
+        ("123456789012345", "123456789012345"),
+        ("1234567890123456", ""),
+        ("нет номера", ""),
+        ("", ""),
+    ],
+)
+def test_normalize_phone(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+def test_migration_normalizes_like_application():
+    # Миграция хранит свою копию нормализации, она не должна разойтись с приложением
+    path = Path(__file__).parent.parent / "alembic" / "versions" / "007_organization_phones.py"
+    spec = importlib.util.spec_from_file_location("migration_007", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    for phone in [*SAME_NUMBER, "+1 212 555 0100", "112", "123456789012345", "нет номера"]:
+        assert migration.normalize_phone(phone) == normalize_phone(phone)
+
+
+def by_phone(client, phone: str):
+    return client.get("/organizations/by-phone", params={"phone": phone})
+
+
+@pytest.mark.parametrize("phone", SAME_NUMBER)
+def test_search_by_phone_in_any_format(client, phone):
+    response = by_phone(client, phone)
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [1]
+
+
+def test_search_by_phone_finds_every_number_of_organization(client):
+    assert [item["id"] for item in by_phone(client, "+7-495-111-1112").json()] == [1]
+    assert by_phone(client, "+7-495-123-4567").json() == []
+
+
+@pytest.mark.parametrize("phone", ["нет номера", "+7 495 111 11 11 11 11 11"])
+def test_search_by_invalid_phone(client, phone):
+    assert by_phone(client, phone).status_code == 400
+
+
+def test_phone_index_follows_writes(client, create_organization):
+    organization = create_organization(
+        "Телефонная станция", phones=["8 (812) 300-00-01", "+1234567890123456789"]
+    )
+    # Номер длиннее 15 цифр принимается, но в индекс не попадает
+    assert organization["phone_numbers"] == ["8 (812) 300-00-01", "+1234567890123456789"]
+    assert [item["id"] for item in by_phone(client, "+7 812 300 00 01").json()] == [
+        organization["id"]
+    ]
+
+    response = client.put(
+        f"/organizations/{organization['id']}", json={"phone_numbers": ["+7 812 300-00-02"]}
+    )
+    assert response.status_code == 200
+    assert by_phone(client, "+7 812 300 00 01").json() == []
+    assert [item["id"] for item in by_phone(client, "88123000002").json()] == [
+        organization["id"]
+    ]
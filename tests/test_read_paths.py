@@ -0,0 +1,114 @@
+"""
+Тесты путей чтения организаций (ORM и Core) и keyset-пагинации.
+"""
+import pytest
+from app.core import SessionLocal, get_settings
+from app.repositories import OrganizationRepository
+
+settings = get_settings()
+
+PAGED = [
+    ("/organizations/", {}),
+    ("/organizations/search", {"name": "ОО"}),
+    ("/organizations/by-building/2", {}),
+    ("/organizations/by-activity/1", {"include_children": True}),
+    ("/organizations/in-box", {"min_lat": 55.7, "max_lat": 55.8, "min_lon": 37.5, "max_lon": 37.7}),
+    ("/organizations/in-radius", {"latitude": 55.75, "longitude": 37.6, "radius_km": 10}),
+    (
+        "/organizations/query",
+        {"activity_id": 2, "include_children": True, "latitude": 55.75, "longitude": 37.6,
+         "radius_km": 50},
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def many_organizations(client):
+    """Еще 24 организации в пяти зданиях, чтобы страниц было много."""
+    created = []
+    for number in range(24):
+        response = client.post(
+            "/organizations/",
+            json={
+                "name": f"Филиал {number}",
+                "phone_numbers": [f"+7-495-200-00{number:02d}"],
+                "building_id": number % 5 + 1,
+                "activity_ids": [number % 4 + 1],
+            },
+        )
+        created.append(response.json()["id"])
+    yield created
+    with SessionLocal() as db:
+        repository = OrganizationRepository(db)
+        for org_id in created:
+            repository.delete(org_id)
+
+
+def read_all(client, pages) -> dict:
+    """Ответы всех эндпоинтов чтения: страницы по 3 и одиночные запросы."""
+    result = {path: pages(path, limit=3, **params) for path, params in PAGED}
+    result["by-phone"] = client.get(
+        "/organizations/by-phone", params={"phone": "8 495 111-11-11"}
+    ).json()
+    result["nearest"] = client.get(
+        "/organizations/nearest", params={"latitude": 55.75, "longitude": 37.6, "limit": 7}
+    ).json()
+    result["one"] = client.get("/organizations/5").json()
+    return result
+
+
+@pytest.mark.parametrize("load_strategy", ["joined", "selectin", "subquery", "batched"])
+def test_orm_and_core_read_paths_match(
+    client, pages, monkeypatch, many_organizations, load_strategy
+):
+    monkeypatch.setattr(settings, "ORGANIZATION_READ_PATH", "core")
+    core = read_all(client, pages)
+    monkeypatch.setattr(settings, "ORGANIZATION_READ_PATH", "orm")
+    monkeypatch.setattr(settings, "ORGANIZATION_LOAD_STRATEGY", load_strategy)
+    assert read_all(client, pages) == core
+
+
+@pytest.mark.parametrize("path, params", PAGED)
+@pytest.mark.parametrize("limit", [1, 4, 7])
+def test_keyset_pages_have_no_duplicates_or_gaps(
+    pages, many_organizations, path, params, limit
+):
+    (everything,) = pages(path, limit=100, **params)
+    paged = pages(path, limit=limit, **params)
+
+    assert all(len(page) == limit for page in paged[:-1])
+    assert 0 < len(paged[-1]) <= limit
+    assert [item for page in paged for item in page] == everything
+    assert len({item["id"] for item in everything}) == len(everything)
+
+
+def test_keyset_pages_survive_writes_between_requests(
+    client, create_organization, many_organizations
+):
+    first = client.get("/organizations/", params={"limit": 5}).json()
+    # Организация, созданная между запросами страниц, попадает в конец выдачи,
+    # а сдвиг данных не повторяет и не пропускает уже выданные строки
+    created = create_organization("Новая между страницами")["id"]
+    seen = [item["id"] for item in first["items"]]
+    cursor = first["next_cursor"]
+    while cursor is not None:
+        page = client.get("/organizations/", params={"limit": 5, "after_id": cursor}).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+
+    assert seen == sorted(set(seen))
+    assert seen[-1] == created
+    assert set(many_organizations) <= set(seen)
+
+
+def test_distance_cursor_orders_by_distance_then_id(pages, many_organizations):
+    items = [
+        item
+        for page in pages(
+            "/organizations/in-radius", latitude=55.75, longitude=37.6, radius_km=10, limit=4
+        )
+        for item in page
+    ]
+    keys = [(item["distance_km"], item["id"]) for item in items]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys) == 34
@@ -0,0 +1,136 @@
+"""
+Тесты геоиндекса зданий (app.indexes.spatial) и геопоиска организаций.
+"""
+import random
+import pytest
+from app.core.geo import bounding_boxes, haversine_distance
+from app.indexes import BuildingSpatialIndex, building_index
+from app.repositories import BuildingRepository
+
+# Точка у антимеридиана (Фиджи) и здания по обе его стороны
+ANTIMERIDIAN = (-16.5, 179.95)
+
+
+def random_points(count: int, seed: int = 1) -> list[tuple[int, float, float]]:
+    """Здания вокруг Москвы и у антимеридиана."""
+    rng = random.Random(seed)
+    points = []
+    for building_id in range(count):
+        if building_id % 2:
+            lat, lon = 55.75 + rng.uniform(-0.2, 0.2), 37.6 + rng.uniform(-0.3, 0.3)
+        else:
+            lat = ANTIMERIDIAN[0] + rng.uniform(-0.5, 0.5)
+            lon = (ANTIMERIDIAN[1] + rng.uniform(-0.5, 0.5) + 180.0) % 360.0 - 180.0
+        points.append((building_id, lat, lon))
+    return points
+
+
+@pytest.mark.parametrize("cell_size", [0.01, 0.1, 1.0])
+def test_index_radius_matches_brute_force(cell_size):
+    points = random_points(500)
+    index = BuildingSpatialIndex(cell_size=cell_size)
+    index.build(points)
+
+    for lat, lon, radius_km in [(55.75, 37.6, 5.0), (*ANTIMERIDIAN, 20.0), (-16.5, -179.99, 30.0)]:
+        expected = {
+            building_id for building_id, p_lat, p_lon in points
+            if haversine_distance(lat, lon, p_lat, p_lon) <= radius_km
+        }
+        assert set(index.query_radius(lat, lon, radius_km)) == expected
+
+
+def test_index_box_matches_brute_force():
+    points = random_points(500)
+    index = BuildingSpatialIndex(cell_size=0.05)
+    index.build(points)
+
+    box = (55.7, 55.8, 37.5, 37.7)
+    expected = {
+        building_id for building_id, lat, lon in points
+        if box[0] <= lat <= box[1] and box[2] <= lon <= box[3]
+    }
+    assert set(index.query_box(*box)) == expected
+
+
+def test_bounding_boxes_split_at_antimeridian():
+    boxes = bounding_boxes(*ANTIMERIDIAN, 20.0)
+    assert len(boxes) == 2
+    (_, _, east_min, east_max), (_, _, west_min, west_max) = boxes
+    assert east_max == 180.0 and 179.7 < east_min < 179.95
+    assert west_min == -180.0 and -180.0 < west_max < -179.8
+    # Круг, накрывающий полюс, занимает все долготы
+    assert bounding_boxes(89.9, 0.0, 50.0) == [(89.9 - 50.0 / 111.0, 90.0, -180.0, 180.0)]
+
+
+@pytest.fixture
+def antimeridian_organizations(create_building, create_organization):
+    """Организации в зданиях по обе стороны антимеридиана."""
+    east = create_building(-16.5, 179.99, "Восточнее антимеридиана")
+    west = create_building(-16.5, -179.99, "Западнее антимеридиана")
+    far = create_building(-16.5, 178.0, "Дальше радиуса")
+    return {
+        create_organization("Восток", building_id=east)["id"],
+        create_organization("Запад", building_id=west)["id"],
+    }, create_organization("Далеко", building_id=far)["id"]
+
+
+@pytest.fixture
+def without_spatial_index(db):
+    """Геопоиск напрямую через БД (SPATIAL_INDEX_ENABLED=false)."""
+
+    def disable():
+        building_index.clear()
+
+    yield disable
+    BuildingRepository(db).rebuild_spatial_index()
+
+
+def geo_responses(client, pages) -> dict[str, list]:
+    lat, lon = ANTIMERIDIAN
+    return {
+        "radius": pages(
+            "/organizations/in-radius", latitude=lat, longitude=lon, radius_km=20, limit=1
+        ),
+        "query": pages(
+            "/organizations/query", latitude=lat, longitude=lon, radius_km=20, limit=1
+        ),
+        "box": pages(
+            "/organizations/in-box",
+            min_lat=55.7, max_lat=55.76, min_lon=37.5, max_lon=37.6, limit=2,
+        ),
+        "nearest": client.get(
+            "/organizations/nearest", params={"latitude": lat, "longitude": lon, "limit": 2}
+        ).json(),
+    }
+
+
+def test_radius_across_antimeridian(client, pages, antimeridian_organizations):
+    inside, outside = antimeridian_organizations
+    lat, lon = ANTIMERIDIAN
+    items = [
+        item
+        for page in pages(
+            "/organizations/in-radius", latitude=lat, longitude=lon, radius_km=20, limit=1
+        )
+        for item in page
+    ]
+    assert {item["id"] for item in items} == inside
+    assert outside not in {item["id"] for item in items}
+    assert [item["distance_km"] for item in items] == sorted(
+        item["distance_km"] for item in items
+    )
+
+    nearest = client.get(
+        "/organizations/nearest", params={"latitude": lat, "longitude": -179.95, "limit": 2}
+    ).json()
+    assert {item["id"] for item in nearest} == inside
+
+
+def test_spatial_index_matches_database(
+    client, pages, antimeridian_organizations, without_spatial_index
+):
+    assert building_index.is_ready
+    with_index = geo_responses(client, pages)
+    without_spatial_index()
+    assert geo_responses(client, pages) == with_index
+    assert [item["id"] for page in with_index["box"] for item in page] == list(range(3, 11))
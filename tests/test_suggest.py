@@ -0,0 +1,46 @@
+"""
+Тесты автодополнения /organizations/suggest.
+"""
+import pytest
+from app.indexes import organization_name_index
+from app.repositories import OrganizationRepository
+
+PREFIXES = ["ооо", "ООО м", "мяс", "ЗДОР", "здоровье", "елк", "Ёлка", "авто", "е", "нет такого"]
+
+
+@pytest.fixture
+def names(create_organization):
+    """Организации с кириллицей разного регистра, ё и знаками препинания."""
+    return [
+        create_organization(name)["id"]
+        for name in ('ООО "Ёлки-Палки"', "елки и палки", "ЁЛКА (маркет)", "АвтоЁж")
+    ]
+
+
+def suggest(client, prefix: str) -> list[dict]:
+    response = client.get("/organizations/suggest", params={"prefix": prefix, "limit": 50})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_suggest_fallback_matches_index(client, db, names):
+    assert organization_name_index.is_ready
+    with_index = {prefix: suggest(client, prefix) for prefix in PREFIXES}
+
+    # Без индекса (NAME_INDEX_ENABLED=false) подсказки читаются из БД
+    organization_name_index.clear()
+    try:
+        without_index = {prefix: suggest(client, prefix) for prefix in PREFIXES}
+    finally:
+        OrganizationRepository(db).rebuild_name_index()
+
+    assert without_index == with_index
+    assert [item["name"] for item in with_index["ООО м"]] == ['ООО "Мясной Дом"']
+    assert {item["id"] for item in with_index["елк"]} == set(names[:3])
+    assert with_index["нет такого"] == []
+
+
+def test_suggest_limit(client, names):
+    full = suggest(client, "е")
+    response = client.get("/organizations/suggest", params={"prefix": "е", "limit": 2})
+    assert response.json() == full[:2]